@@ -1,29 +1,153 @@
+from __future__ import annotations
+
+import time
+
+# Measured by --profile-startup; taken before any other import
+process_started = time.perf_counter()
+
+import argparse
+import json
 import logging
 import os
+from contextlib import ExitStack, nullcontext
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
 from dotenv import load_dotenv
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
-
-from src.patterns.automation import Automation
-from src.patterns.facade import SeleniumFacade
-from src.patterns.login_strategy import StandardLogin 
-from src.patterns.cards_strategy import StandardCardCollection
-
-# Load environment variables from .env
-load_dotenv()
-
-# Get variables from environment
-login_url = os.getenv('LOGIN_URL')
-cards_url = os.getenv('CARDS_URL')
-members_url = os.getenv('MEMBERS_URL')
-username = os.getenv('USERNAME')
-password = os.getenv('PASSWORD')
-message = os.getenv('MESSAGE')
-min_age = int(os.getenv("MIN_AGE"))
-max_age = int(os.getenv("MAX_AGE"))
+from src.patterns.campaign import CampaignJob, make_job
+from src.patterns.ledger import OUTCOME_SENT, OUTCOME_FAILED, OUTCOME_UNKNOWN
+from src.patterns.metrics import LatencyRecorder
+from src.patterns.startup import StartupProfiler, find_chromedriver, preload
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from src.patterns.automation import Automation
+    from src.patterns.browser_profile import BrowserProfile
+    from src.patterns.driver_service import PrestartedService
+    from src.patterns.trace import TraceRecorder
+
+# Selenium and the strategies are imported on first use; a single run imports them while chromedriver boots
+RUN_MODULES = (
+    "selenium.webdriver",
+    "src.patterns.automation",
+    "src.patterns.facade",
+    "src.patterns.browser_profile",
+    "src.patterns.login_strategy",
+    "src.patterns.cards_strategy",
+    "src.patterns.worker_pool",
+    "src.patterns.session_cache",
+)
+
+@dataclass
+class AppConfig:
+    """The settings read from the environment variables (and .env)."""
+
+    login_url: str = None
+    cards_url: str = None
+    members_url: str = None
+    username: str = None
+    password: str = None
+    message: str = None
+    min_age: int = None
+    max_age: int = None
+    target_cards: int = None
+    max_scroll_time: float = None
+    card_strategy: str = "standard"
+    workers: int = 0
+    shards: int = None
+    shard_stats_path: str = None
+    session_cache_path: str = None
+    ledger_path: str = None
+    cache_elements: bool = False
+    reuse_detail_tab: bool = False
+    send_rate: float = 20
+    send_burst: int = 3
+    export_path: str = None
+    export_batch_size: int = 500
+    detail_cache_path: str = None
+    detail_cache_ttl_hours: float = 24
+    detail_cache_max_mb: float = 100
+    snapshot_parser: str = "script"
+    prune_dom: bool = False
+    trace_path: str = None
+    checkpoint_path: str = None
+    max_failures: int = 5
+    wait_mode: str = "observer"
+    poll_interval: float = 0.5
+    browser_profile: BrowserProfile = None
+    metrics_dir: str = None
+    metrics_interval: float = 60
+    campaign_concurrency: int = 2
+    campaign_per_account: int = 1
+    daemon_port: int = 8765
+    daemon_sessions: int = 2
+    daemon_max_jobs: int = 25
+    daemon_max_memory_mb: float = None
+    daemon_token: str = None
+    chromedriver_path: str = None
+
+def load_config(chromedriver_path: str = None) -> AppConfig:
+    """
+    Reads the settings from the environment variables; call load_dotenv() first to include .env.
+
+    Args:
+        chromedriver_path (str, optional): The chromedriver already located. Defaults to None (located now).
+
+    Returns:
+        AppConfig: The settings.
+
+    Raises:
+        ValueError: If a numeric setting is malformed or CHROMEDRIVER_PATH does not exist.
+    """
+    from src.patterns.browser_profile import get_profile
+
+    return AppConfig(login_url=os.getenv('LOGIN_URL'),
+                     cards_url=os.getenv('CARDS_URL'),
+                     members_url=os.getenv('MEMBERS_URL'),
+                     username=os.getenv('USERNAME'),
+                     password=os.getenv('PASSWORD'),
+                     message=os.getenv('MESSAGE'),
+                     min_age=int(os.getenv("MIN_AGE")) if os.getenv("MIN_AGE") else None,
+                     max_age=int(os.getenv("MAX_AGE")) if os.getenv("MAX_AGE") else None,
+                     target_cards=int(os.getenv("TARGET_CARDS")) if os.getenv("TARGET_CARDS") else None,
+                     max_scroll_time=float(os.getenv("MAX_SCROLL_TIME")) if os.getenv("MAX_SCROLL_TIME") else None,
+                     card_strategy=os.getenv("CARD_STRATEGY", "standard"),
+                     workers=int(os.getenv("WORKERS", "0")),
+                     shards=int(os.getenv("SHARDS")) if os.getenv("SHARDS") else None,
+                     shard_stats_path=os.getenv("SHARD_STATS_PATH"),
+                     session_cache_path=os.getenv("SESSION_CACHE_PATH"),
+                     ledger_path=os.getenv("LEDGER_PATH"),
+                     cache_elements=os.getenv("CACHE_ELEMENTS", "false").lower() == "true",
+                     reuse_detail_tab=os.getenv("REUSE_DETAIL_TAB", "false").lower() == "true",
+                     send_rate=float(os.getenv("SEND_RATE", "20")),
+                     send_burst=int(os.getenv("SEND_BURST", "3")),
+                     export_path=os.getenv("EXPORT_PATH"),
+                     export_batch_size=int(os.getenv("EXPORT_BATCH_SIZE", "500")),
+                     detail_cache_path=os.getenv("DETAIL_CACHE_PATH"),
+                     detail_cache_ttl_hours=float(os.getenv("DETAIL_CACHE_TTL_HOURS", "24")),
+                     detail_cache_max_mb=float(os.getenv("DETAIL_CACHE_MAX_MB", "100")),
+                     snapshot_parser=os.getenv("SNAPSHOT_PARSER", "script"),
+                     prune_dom=os.getenv("PRUNE_DOM", "false").lower() == "true",
+                     trace_path=os.getenv("TRACE_PATH"),
+                     checkpoint_path=os.getenv("CHECKPOINT_PATH"),
+                     max_failures=int(os.getenv("MAX_FAILURES", "5")),
+                     wait_mode=os.getenv("WAIT_MODE", "observer"),
+                     poll_interval=float(os.getenv("POLL_INTERVAL", "0.5")),
+                     browser_profile=get_profile(os.getenv("BROWSER_PROFILE", "default")),
+                     metrics_dir=os.getenv("METRICS_DIR"),
+                     metrics_interval=float(os.getenv("METRICS_INTERVAL", "60")),
+                     campaign_concurrency=int(os.getenv("CAMPAIGN_CONCURRENCY", "2")),
+                     campaign_per_account=int(os.getenv("CAMPAIGN_PER_ACCOUNT", "1")),
+                     daemon_port=int(os.getenv("DAEMON_PORT", "8765")),
+                     daemon_sessions=int(os.getenv("DAEMON_SESSIONS", "2")),
+                     daemon_max_jobs=int(os.getenv("DAEMON_MAX_JOBS", "25")),
+                     daemon_max_memory_mb=float(os.getenv("DAEMON_MAX_MEMORY_MB")) if os.getenv("DAEMON_MAX_MEMORY_MB") else None,
+                     daemon_token=os.getenv("DAEMON_TOKEN"),
+                     chromedriver_path=chromedriver_path or find_chromedriver(os.getenv("CHROMEDRIVER_PATH")))
+
+# Set by the entry point once the environment is loaded
+config: AppConfig = None
 
 # Set up logging
 def setup_logging() -> logging.Logger:
@@ -39,67 +163,468 @@ def setup_logging() -> logging.Logger:
     return logger
 
 # Set up WebDriver 
-def setup_webdriver(chromedriver_path: str) -> webdriver.Chrome:
+def setup_webdriver(chromedriver_path: str, profile: BrowserProfile, service: PrestartedService = None) -> webdriver.Chrome:
     """
     Sets up the Selenium WebDriver with the specified ChromeDriver path.
 
     Args:
-        chromedriver_path (str): Path to the ChromeDriver executable.
+        chromedriver_path (str): Path to the ChromeDriver executable, or None to let Selenium Manager resolve it.
+        profile (BrowserProfile): The browser profile (headless mode, blocked requests, page load strategy).
+        service (PrestartedService, optional): A chromedriver service already booting, used instead of starting one. Defaults to None.
 
     Returns:
         webdriver.Chrome: Configured WebDriver instance.
     """
-    chrome_options = Options()
-    # chrome_options.add_argument("--headless")  # Uncomment for headless mode
-    chrome_options.add_argument("--verbose")
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from selenium.common.exceptions import WebDriverException
+
+    chrome_options = profile.apply_options(Options())
 
     try:
-        service = Service(executable_path=chromedriver_path)
+        service = service or Service(executable_path=chromedriver_path)
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        profile.apply(driver)
         return driver
     except WebDriverException as e:
-        logger.error(f"Failed to initialize WebDriver: {e}")
+        logging.getLogger(__name__).error(f"Failed to initialize WebDriver: {e}")
         raise
 
-if __name__ == "__main__":
-    logger = setup_logging()
+def env_job() -> CampaignJob:
+    """
+    Builds the job configured by the environment variables.
+
+    Returns:
+        CampaignJob: The job of a single run, also used as the defaults of campaign jobs.
+    """
+    return CampaignJob(name="default",
+                       username=config.username,
+                       password=config.password,
+                       message=config.message,
+                       min_age=config.min_age,
+                       max_age=config.max_age,
+                       login_url=config.login_url,
+                       cards_url=config.cards_url,
+                       members_url=config.members_url,
+                       card_strategy=config.card_strategy,
+                       target_cards=config.target_cards,
+                       max_scroll_time=config.max_scroll_time,
+                       workers=config.workers,
+                       shards=config.shards,
+                       shard_stats_path=config.shard_stats_path,
+                       session_cache_path=config.session_cache_path,
+                       ledger_path=config.ledger_path,
+                       cache_elements=config.cache_elements,
+                       reuse_detail_tab=config.reuse_detail_tab,
+                       send_rate=config.send_rate,
+                       send_burst=config.send_burst,
+                       export_path=config.export_path,
+                       detail_cache_path=config.detail_cache_path,
+                       snapshot_parser=config.snapshot_parser,
+                       prune_dom=config.prune_dom,
+                       checkpoint_path=config.checkpoint_path,
+                       max_failures=config.max_failures,
+                       wait_mode=config.wait_mode,
+                       poll_interval=config.poll_interval)
+
+def build_automation(driver: webdriver.Chrome, 
+                     logger: logging.Logger, 
+                     job: CampaignJob, 
+                     stack: ExitStack, 
+                     instrumentation: LatencyRecorder = None,
+                     trace: TraceRecorder = None) -> Automation:
+    """
+    Creates the facade, the strategies and the automation of a job.
+    The worker pool, the ledger, the profile export and the detail cache are registered on `stack` to be closed when it exits.
+
+    Args:
+        driver (webdriver.Chrome): The job's WebDriver instance.
+        logger (logging.Logger): The logger for output messages.
+        job (CampaignJob): The job's configuration.
+        stack (ExitStack): Collects the clean-up of the job's resources.
+        instrumentation (LatencyRecorder, optional): Records the latency of every operation. Defaults to None.
+        trace (TraceRecorder, optional): Records the driver commands of the job. Defaults to None.
+
+    Returns:
+        Automation: The job's automation, ready to run.
+    """
+    from src.patterns.automation import Automation
+    from src.patterns.facade import SeleniumFacade
+    from src.patterns.login_strategy import StandardLogin
+    from src.patterns.cards_strategy import StandardCardCollection, BulkCardCollection, PooledCardCollection, HttpCardCollection, StreamingCardCollection, ShardedCardCollection
+    from src.patterns.http_engine import HttpEngine
+    from src.patterns.session_cache import SessionCache
+    from src.patterns.checkpoint import RunCheckpoint
+    from src.patterns.ledger import CardLedger
+    from src.patterns.rate_limiter import SendRateLimiter
+    from src.patterns.export import open_profile_writer
+    from src.patterns.detail_cache import DetailCache
+    from src.pages.xpaths import PROFILE_FIELDS
+    from src.patterns.worker_pool import CardWorkerPool
+
+    # Create the SeleniumFacade
+    selenium_facade = SeleniumFacade(driver, 
+                                     cache_elements=job.cache_elements, 
+                                     instrumentation=instrumentation, 
+                                     wait_mode=job.wait_mode, 
+                                     poll_interval=job.poll_interval,
+                                     trace=trace)
+
+    # Create Strategy objects
+    login_strategy = StandardLogin(selenium_facade)
+    ledger = CardLedger(job.ledger_path) if job.ledger_path else None
+    if ledger:
+        stack.callback(ledger.close)
+    profile_writer = open_profile_writer(job.export_path, tuple(PROFILE_FIELDS), config.export_batch_size) if job.export_path else None
+    if profile_writer:
+        stack.callback(profile_writer.close)
+    detail_cache = None
+    if job.detail_cache_path:
+        detail_cache = DetailCache(job.detail_cache_path, config.detail_cache_ttl_hours * 3600, int(config.detail_cache_max_mb * 1024 * 1024))
+        stack.callback(detail_cache.close)
+    # One send budget for the job, shared by the main session and every worker
+    rate_limiter = SendRateLimiter(job.send_rate, logger, job.send_burst) if job.send_rate > 0 else None
+    strategy_options = dict(target_count=job.target_cards, max_scroll_time=job.max_scroll_time, ledger=ledger,
+                            reuse_detail_tab=job.reuse_detail_tab, rate_limiter=rate_limiter, profile_writer=profile_writer,
+                            detail_cache=detail_cache, snapshot_parser=job.snapshot_parser,
+                            prune_dom=job.prune_dom)
+    worker_pool = None
+    if job.workers > 0:
+        worker_pool = CardWorkerPool(lambda: setup_webdriver(config.chromedriver_path, config.browser_profile), logger, job.workers, instrumentation,
+                                     rate_limiter, profile_writer, detail_cache)
+        # Queued cards are dropped when the run is interrupted
+        stack.push(lambda exc_type, exc, traceback: worker_pool.shutdown(cancel_pending=exc_type is KeyboardInterrupt))
+    if job.card_strategy == "shard":
+        if not worker_pool:
+            raise ValueError("CARD_STRATEGY=shard collects the shards on worker sessions and needs WORKERS > 0.")
+        card_collection_strategy = ShardedCardCollection(selenium_facade, logger, worker_pool, job.min_age, job.max_age,
+                                                         job.shards, job.shard_stats_path, **strategy_options)
+    elif job.card_strategy == "stream":
+        card_collection_strategy = StreamingCardCollection(selenium_facade, logger, worker_pool, **strategy_options)
+    elif worker_pool:
+        card_collection_strategy = PooledCardCollection(selenium_facade, logger, worker_pool, **strategy_options)
+    elif job.card_strategy == "http":
+        card_collection_strategy = HttpCardCollection(selenium_facade, logger, HttpEngine(logger), **strategy_options)
+    elif job.card_strategy == "bulk":
+        card_collection_strategy = BulkCardCollection(selenium_facade, logger, **strategy_options)
+    else:
+        card_collection_strategy = StandardCardCollection(selenium_facade, logger, **strategy_options)
+
+    return Automation(driver, 
+                      logger, 
+                      job.members_url, 
+                      selenium_facade, 
+                      job.login_url, 
+                      job.cards_url, 
+                      job.username, 
+                      job.password, 
+                      login_strategy, 
+                      card_collection_strategy,
+                      job.message, 
+                      job.min_age, 
+                      job.max_age,
+                      session_cache=SessionCache(job.session_cache_path, logger, account=job.account) if job.session_cache_path else None,
+                      checkpoint=RunCheckpoint(job.checkpoint_path, logger) if job.checkpoint_path else None,
+                      max_failures=job.max_failures)
+
+def run_job_on_driver(driver: webdriver.Chrome, job: CampaignJob, logger: logging.Logger, instrumentation: LatencyRecorder = None) -> dict:
+    """
+    Runs a job on an existing browser session.
+
+    Args:
+        driver (webdriver.Chrome): The WebDriver instance to run the job on.
+        job (CampaignJob): The job to run.
+        logger (logging.Logger): The job's logger.
+        instrumentation (LatencyRecorder, optional): Records the latency of every operation. Defaults to None.
+
+    Returns:
+        dict: Whether the job completed and got past the login, the number of sent and failed cards,
+            and the state of the send rate limiter and the detail cache.
+    """
+    from src.patterns.automation import State
+
+    with ExitStack() as stack:
+        automation = build_automation(driver, logger, job, stack, instrumentation)
+        automation.run()
+        outcomes = automation.card_collection_strategy.outcomes
+        stats = {
+            "completed": automation.current_state == State.DONE,
+            "authenticated": automation.current_state != State.LOGIN,
+            "sent": outcomes[OUTCOME_SENT],
+            "failed": outcomes[OUTCOME_FAILED],
+            "unknown": outcomes[OUTCOME_UNKNOWN],
+            "error": str(automation.last_error) if automation.last_error else None,
+            "circuit_open": automation.circuit_open,
+        }
+        rate_limiter = automation.card_collection_strategy.rate_limiter
+        if rate_limiter:
+            stats["send_rate"] = rate_limiter.stats()
+        if automation.card_collection_strategy.peak_dom_nodes:
+            stats["dom_nodes"] = {"last": automation.card_collection_strategy.dom_nodes, "peak": automation.card_collection_strategy.peak_dom_nodes}
+        detail_cache = automation.card_collection_strategy.detail_cache
+        if detail_cache:
+            stats["detail_cache"] = detail_cache.stats()
+            logger.info(f"Detail cache: {stats['detail_cache']['hits']} hits, {stats['detail_cache']['misses']} misses.")
+        return stats
+
+def run_job(job: CampaignJob, logger: logging.Logger, instrumentation: LatencyRecorder = None) -> dict:
+    """
+    Runs a campaign job in its own browser session.
+
+    Args:
+        job (CampaignJob): The job to run.
+        logger (logging.Logger): The campaign's logger; the job logs to a child logger named after it.
+        instrumentation (LatencyRecorder, optional): Records the latency of every operation. Defaults to None.
+
+    Returns:
+        dict: Whether the job completed and the number of sent and failed cards.
+    """
+    driver = setup_webdriver(config.chromedriver_path, config.browser_profile)
+    try:
+        stats = run_job_on_driver(driver, job, logger.getChild(job.name), instrumentation)
+        stats.pop("authenticated")
+        return stats
+    finally:
+        driver.quit()
+
+def run_campaign(path: str, logger: logging.Logger, concurrency: int, results_path: str = None, instrumentation: LatencyRecorder = None,
+                 per_account: int = 1):
+    """
+    Runs the jobs of a campaign file concurrently and reports their results.
+
+    Args:
+        path (str): The campaign file.
+        logger (logging.Logger): The logger for output messages.
+        concurrency (int): The maximum number of jobs (browser sessions) running at the same time.
+        results_path (str, optional): Where to write the results as JSON. Defaults to None.
+        instrumentation (LatencyRecorder, optional): Records the latency of every operation. Defaults to None.
+        per_account (int, optional): The maximum number of jobs of one account running at the same time. Defaults to 1.
+    """
+    from src.patterns.campaign import CampaignRunner, load_campaign
+
+    defaults = {name: value for name, value in asdict(env_job()).items() if value is not None and name != "name"}
+    jobs = load_campaign(path, defaults)
+    logger.info(f"Running {len(jobs)} jobs, {concurrency} at a time.")
+    runner = CampaignRunner(lambda job: run_job(job, logger, instrumentation), logger, concurrency, per_account)
+    try:
+        results = runner.run(jobs)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, no further jobs are started.")
+        raise
+    summary = CampaignRunner.summarize(results)
+    for result in results:
+        logger.info(f"Job '{result.name}': {result.status}, {result.sent} sent, {result.failed} failed"
+                    + (f" ({result.error})" if result.error else ""))
+    logger.info(f"Campaign finished: {summary['succeeded']}/{summary['jobs']} jobs succeeded, {summary['sent']} messages sent.")
+    if results_path:
+        with open(results_path, "w", encoding="utf-8") as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+        logger.info(f"Campaign results written to {results_path}.")
+
+def warm_up_session(driver: webdriver.Chrome, logger: logging.Logger) -> str:
+    """
+    Logs a new pooled browser session in with the stored session of the configured account, if there is one.
+    Daemon jobs keep their sessions per account, so this reads the file jobs of the configured account save to.
+
+    Args:
+        driver (webdriver.Chrome): The new WebDriver instance.
+        logger (logging.Logger): The logger for output messages.
+
+    Returns:
+        str: The account the session is logged in as, or None.
+    """
+    from src.patterns.campaign import scoped_path
+    from src.patterns.session_cache import SessionCache
+
+    if not (config.session_cache_path and config.username):
+        return None
+    session_cache = SessionCache(scoped_path(config.session_cache_path, config.username), logger, account=config.username)
+    if session_cache.restore(driver, config.members_url):
+        return config.username
+    return None
+
+def run_daemon(logger: logging.Logger, port: int, instrumentation: LatencyRecorder = None):
+    """
+    Keeps a pool of browser sessions running and serves jobs submitted over HTTP until interrupted.
+
+    Args:
+        logger (logging.Logger): The logger for output messages.
+        port (int): The local port to listen on.
+        instrumentation (LatencyRecorder, optional): Records the latency of every operation. Defaults to None.
+    """
+    from src.patterns.browser_daemon import BrowserSessionPool, JobDaemon
+
+    pool = BrowserSessionPool(lambda: setup_webdriver(config.chromedriver_path, config.browser_profile),
+                              logger,
+                              size=config.daemon_sessions,
+                              warmup=lambda driver: warm_up_session(driver, logger),
+                              max_jobs=config.daemon_max_jobs,
+                              max_memory_mb=config.daemon_max_memory_mb)
+    pool.start()
+    defaults = {name: value for name, value in asdict(env_job()).items() if value is not None and name != "name"}
+    daemon = JobDaemon(pool,
+                       lambda driver, job: run_job_on_driver(driver, job, logger.getChild(job.name), instrumentation),
+                       logger,
+                       defaults=defaults,
+                       port=port,
+                       token=config.daemon_token)
+    logger.info(f"Accepting jobs on http://127.0.0.1:{port}/jobs")
+    try:
+        daemon.serve_forever()
+    finally:
+        daemon.close()
+        pool.stop()
+
+def run_single(logger: logging.Logger, instrumentation: LatencyRecorder = None, service: PrestartedService = None, startup: StartupProfiler = None):
+    """
+    Runs the job configured by the environment variables.
+
+    Args:
+        logger (logging.Logger): The logger for output messages.
+        instrumentation (LatencyRecorder, optional): Records the latency of every operation. Defaults to None.
+        service (PrestartedService, optional): The chromedriver service booted during startup. Defaults to None.
+        startup (StartupProfiler, optional): Reported once the browser is launched. Defaults to None.
+    """
+    from selenium.common.exceptions import WebDriverException
+    from src.patterns.browser_profile import log_transfer
+    from src.patterns.trace import TraceRecorder
 
     # Set up WebDriver
-    chromedriver_path = "D:\\chromedriver\\chromedriver-win64\\chromedriver.exe"
     try:
-        driver = setup_webdriver(chromedriver_path)
-        logger.info("WebDriver initialized.")
+        with startup.phase("launch") if startup else nullcontext():
+            driver = setup_webdriver(config.chromedriver_path, config.browser_profile, service)
+        logger.info(f"WebDriver initialized with the '{config.browser_profile.name}' browser profile.")
+        if startup:
+            startup.report(logger)
     except WebDriverException:
         logger.critical("Exiting due to WebDriver initialization failure.")
         exit(1)
 
-    # Create the SeleniumFacade
-    selenium_facade = SeleniumFacade(driver)
-
-    # Create Strategy objects
-    login_strategy = StandardLogin(selenium_facade)
-    card_collection_strategy = StandardCardCollection(selenium_facade, logger)
-
-    # Start automation
-    automation = Automation(driver, 
-                            logger, 
-                            members_url, 
-                            selenium_facade, 
-                            login_url, 
-                            cards_url, 
-                            username, 
-                            password, 
-                            login_strategy, 
-                            card_collection_strategy,
-                            message, 
-                            min_age, 
-                            max_age)
     try:
-        automation.run()
+        with ExitStack() as stack:
+            job = env_job()
+            trace = None
+            if config.trace_path:
+                # Credentials are left out of the job; the recorder redacts typed text and cookies
+                trace = TraceRecorder(config.trace_path, metadata={"job": {name: value for name, value in asdict(job).items() if name not in ("username", "password")}})
+                stack.callback(trace.close)
+                logger.info(f"Recording driver commands to {config.trace_path}.")
+            automation = build_automation(driver, logger, job, stack, instrumentation, trace)
+            automation.run()
+            log_transfer(automation.facade, config.browser_profile, logger,
+                         os.path.join(config.metrics_dir, "transfer.json") if config.metrics_dir else None)
     except Exception as e:
         logger.error(f"An error occurred during automation: {e}")
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, stopping.")
     finally:
         # Clean up
         logger.info("Closing WebDriver.")
         driver.quit()
-        logger.info("Automation complete! 🪄✨")
\ No newline at end of file
+
+def replay_trace(path: str, logger: logging.Logger, timing: str, instrumentation: LatencyRecorder = None) -> dict:
+    """
+    Runs the job recorded in a trace against the recorded browser responses instead of a browser.
+
+    Args:
+        path (str): The trace file recorded with TRACE_PATH.
+        logger (logging.Logger): The logger for output messages.
+        timing (str): "original" waits each command's recorded latency, "fast" answers immediately.
+        instrumentation (LatencyRecorder, optional): Records the latency of every operation. Defaults to None.
+
+    Returns:
+        dict: The replay's timing compared with the recorded run.
+    """
+    from src.patterns.trace import ReplayDriver
+
+    driver = ReplayDriver(path, timing)
+    values = driver.metadata.get("job")
+    if not values:
+        raise ValueError(f"{path} does not hold the job it recorded.")
+    # Local state that changed since the recording, and extra sessions the trace does not cover, are left out
+    job = make_job({**values, "username": "", "password": "", "workers": 0, "ledger_path": None, "session_cache_path": None,
+                    "detail_cache_path": None, "export_path": None, "checkpoint_path": None, "send_rate": 0})
+    if job.card_strategy in ("http", "shard"):
+        raise ValueError(f"Runs with CARD_STRATEGY={job.card_strategy} cannot be replayed, they send requests outside the browser session.")
+    with ExitStack() as stack:
+        automation = build_automation(driver, logger, job, stack, instrumentation)
+        automation.run()
+    stats = driver.replay.stats()
+    if automation.last_error:
+        stats["error"] = str(automation.last_error)
+    logger.info(f"Replayed {stats['commands_replayed']}/{stats['commands_recorded']} commands in {stats['replay_seconds']}s "
+                f"({stats['python_seconds']}s in Python); the recorded run took {stats['recorded_seconds']}s.")
+    return stats
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Send messages to the members matching the configured filters.")
+    parser.add_argument("--campaign", help="run the jobs of a campaign file (JSON) instead of the single job configured in .env")
+    parser.add_argument("--concurrency", type=int, help="jobs of a campaign running at the same time (default: CAMPAIGN_CONCURRENCY)")
+    parser.add_argument("--per-account", type=int, help="jobs of one account running at the same time (default: CAMPAIGN_PER_ACCOUNT)")
+    parser.add_argument("--results", help="write the campaign's per-job results to this JSON file")
+    parser.add_argument("--daemon", action="store_true", help="keep browser sessions running and accept jobs over a local HTTP endpoint")
+    parser.add_argument("--port", type=int, help="port of the daemon's HTTP endpoint (default: DAEMON_PORT)")
+    parser.add_argument("--replay", help="replay a trace recorded with TRACE_PATH instead of driving a browser")
+    parser.add_argument("--replay-timing", choices=("original", "fast"), default="fast", help="wait the recorded latency of every command, or none")
+    parser.add_argument("--profile-startup", action="store_true", help="log the time spent importing, loading the configuration and launching the browser")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    logger = setup_logging()
+    startup = StartupProfiler(process_started)
+    load_dotenv()
+
+    service = None
+    if not (args.replay or args.daemon or args.campaign):
+        # The single run's chromedriver boots while the run's modules are imported and the configuration is loaded
+        try:
+            chromedriver_path = find_chromedriver(os.getenv("CHROMEDRIVER_PATH"))
+        except ValueError as e:
+            logger.critical(e)
+            exit(1)
+        with startup.phase("imports"):
+            from src.patterns.driver_service import PrestartedService
+        service = PrestartedService(chromedriver_path)
+        if service.start_in_background():
+            with startup.phase("imports"):
+                preload(RUN_MODULES)
+    try:
+        with startup.phase("config"):
+            config = load_config(service.path if service else None)
+    except ValueError as e:
+        logger.critical(f"Invalid configuration: {e}")
+        if service:
+            service.stop()
+        exit(1)
+    if args.profile_startup and not service:
+        startup.report(logger)
+
+    instrumentation = None
+    if config.metrics_dir:
+        instrumentation = LatencyRecorder()
+        instrumentation.start_periodic_export(config.metrics_dir, config.metrics_interval)
+    try:
+        if args.replay:
+            replay_trace(args.replay, logger, args.replay_timing, instrumentation)
+        elif args.daemon:
+            run_daemon(logger, args.port if args.port is not None else config.daemon_port, instrumentation)
+        elif args.campaign:
+            concurrency = args.concurrency if args.concurrency is not None else config.campaign_concurrency
+            per_account = args.per_account if args.per_account is not None else config.campaign_per_account
+            run_campaign(args.campaign, logger, concurrency, args.results, instrumentation, per_account)
+        else:
+            if config.min_age is None or config.max_age is None:
+                logger.critical("MIN_AGE and MAX_AGE must be set.")
+                service.stop()
+                exit(1)
+            run_single(logger, instrumentation, service, startup if args.profile_startup else None)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted.")
+    finally:
+        if instrumentation:
+            instrumentation.stop()
+            instrumentation.export(config.metrics_dir)
+            logger.info(f"Latency metrics written to {config.metrics_dir}.")
+        logger.info("Automation complete! 🪄✨")
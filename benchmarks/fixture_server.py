@@ -0,0 +1,404 @@
+import json
+import re
+import threading
+import time
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.pages.xpaths import *
+
+SESSION_COOKIE = "bench_session"
+LOGIN_PATH = "/login/"
+MEMBERS_PATH = "/"
+CARDS_PATH = "/members-list/"
+AJAX_PATH = "/wp-admin/admin-ajax.php"
+VOID_TAGS = {"input", "br", "img", "meta", "link"}
+
+
+class PageTree:
+    """
+    Builds markup in which the absolute XPaths of `src.pages.xpaths` resolve to the intended elements.
+    Positional steps such as `div[5]` are satisfied by inserting empty siblings before the element.
+    """
+
+    def __init__(self, title: str):
+        self.title = title
+        self.head = ""
+        self.root = _Node("html")
+
+    def add(self, xpath: str, attrs: dict = None, html: str = "") -> "_Node":
+        """
+        Adds the element at an absolute XPath, creating its ancestors as needed.
+
+        Args:
+            xpath (str): An absolute XPath made of `tag` and `tag[n]` steps, starting at /html.
+            attrs (dict, optional): Attributes of the element. Defaults to None.
+            html (str, optional): Markup appended after the element's children. Defaults to "".
+
+        Returns:
+            _Node: The element's node.
+        """
+        steps = xpath.strip("/").split("/")
+        if steps[0] != "html":
+            raise ValueError(f"Not an absolute XPath: {xpath}")
+        node = self.root
+        for step in steps[1:]:
+            match = re.fullmatch(r"(\w+)(?:\[(\d+)\])?", step)
+            if match is None:
+                raise ValueError(f"Unsupported XPath step '{step}' in {xpath}")
+            node = node.child(match.group(1), int(match.group(2) or 1))
+        node.attrs.update(attrs or {})
+        node.html += html
+        return node
+
+    def render(self) -> str:
+        """
+        Renders the page.
+
+        Returns:
+            str: The HTML document.
+        """
+        head = f"<head><meta charset=\"utf-8\" /><title>{escape(self.title)}</title>{self.head}</head>"
+        return "<!DOCTYPE html>\n" + self.root.render(prefix=head)
+
+
+class _Node:
+    """An element of a PageTree."""
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.attrs = {}
+        self.html = ""
+        self.children = {}
+
+    def child(self, tag: str, index: int) -> "_Node":
+        """Gets or creates the `index`-th child with the given tag."""
+        return self.children.setdefault((tag, index), _Node(tag))
+
+    def render(self, prefix: str = "") -> str:
+        """Renders the element, filling positional gaps with empty siblings."""
+        attrs = "".join(f' {name}="{escape(str(value))}"' for name, value in self.attrs.items())
+        if self.tag in VOID_TAGS:
+            return f"<{self.tag}{attrs} />"
+        parts = [prefix]
+        tags = list(dict.fromkeys(tag for tag, _ in self.children))
+        for tag in tags:
+            last = max(index for child_tag, index in self.children if child_tag == tag)
+            for index in range(1, last + 1):
+                parts.append(self.children.get((tag, index), _Node(tag)).render())
+        parts.append(self.html)
+        return f"<{self.tag}{attrs}>{''.join(parts)}</{self.tag}>"
+
+
+def _parent(xpath: str, tag: str) -> str:
+    """Gets the XPath of the closest ancestor with the given tag."""
+    return xpath[:xpath.rindex(f"/{tag}/") + len(tag) + 1]
+
+
+def build_login_page() -> str:
+    """Builds the login page with the email, password and submit elements of LOGIN_PAGE_LOCATORS."""
+    page = PageTree("Login")
+    page.add(_parent(LOGIN_EMAIL_TEXTBOX, "form"), {"method": "post", "action": LOGIN_PATH})
+    page.add(LOGIN_EMAIL_TEXTBOX, {"type": "email", "name": "log"})
+    page.add(LOGIN_PASSWORD_TEXTBOX, {"type": "password", "name": "pwd"})
+    page.add(LOGIN_SUBMIT_BUTTON, {"type": "submit"}, "Log in")
+    return page.render()
+
+
+def build_members_page() -> str:
+    """Builds the landing page members are redirected to after logging in."""
+    page = PageTree("Members")
+    page.add("/html/body/div[1]", html=f'<h1>Welcome</h1><a href="{CARDS_PATH}">Members list</a>')
+    return page.render()
+
+
+CARDS_PAGE_SCRIPT = """
+window.jQuery = window.jQuery || {active: 0};
+(function () {
+  var container = document.getElementById('cards');
+  var state = {offset: 0, total: null, loading: false, generation: 0};
+  function filters() {
+    var genders = Array.prototype.map.call(document.querySelectorAll('input[type=checkbox]:checked'), function (box) { return box.value; });
+    return 'gender=' + genders.join(',') +
+      '&min_age=' + document.querySelector('.jet-range__slider__input--min').value +
+      '&max_age=' + document.querySelector('.jet-range__slider__input--max').value;
+  }
+  function load(reset) {
+    if (!reset && (state.loading || (state.total !== null && state.offset >= state.total))) return;
+    var generation = reset ? ++state.generation : state.generation;
+    var offset = reset ? 0 : state.offset;
+    state.loading = true;
+    window.jQuery.active++;
+    fetch('/api/cards?offset=' + offset + '&' + filters()).then(function (response) { return response.json(); }).then(function (data) {
+      if (generation !== state.generation) return;
+      if (reset) container.innerHTML = '';
+      container.insertAdjacentHTML('beforeend', data.html);
+      state.offset = offset + data.count;
+      state.total = data.total;
+    }).finally(function () {
+      window.jQuery.active--;
+      if (generation === state.generation) state.loading = false;
+    });
+  }
+  window.addEventListener('scroll', function () {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 300) load(false);
+  });
+  document.querySelectorAll('input[type=checkbox], .jet-range__slider__input').forEach(function (input) {
+    input.addEventListener('change', function () { load(true); });
+  });
+  document.getElementById('popup-close').addEventListener('click', function () {
+    document.getElementById('popup').style.display = 'none';
+  });
+  load(true);
+})();
+"""
+
+FILTERS_HTML = """
+<label><input type="checkbox" value="female" /> Female</label>
+<label><input type="checkbox" value="male" /> Male</label>
+<div class="jet-range__slider">
+  <input type="range" min="18" max="99" value="18" class="jet-range__slider__input jet-range__slider__input--min" />
+  <input type="range" min="18" max="99" value="99" class="jet-range__slider__input jet-range__slider__input--max" />
+</div>
+"""
+
+
+def build_cards_page() -> str:
+    """
+    Builds the members list: the gender and age filters, an empty cards container filled in batches
+    from /api/cards as the page is scrolled, and the popup POPUP_BUTTON closes.
+    """
+    page = PageTree("Members list")
+    page.head = "<style>.card{height:120px;border-bottom:1px solid #ccc}#popup{position:fixed;inset:0;background:rgba(0,0,0,.5)}" \
+                "#popup-close{display:inline-block;width:24px;height:24px;background:#fff;cursor:pointer}</style>"
+    page.add("/html/body/div[2]/div/section[1]", html=FILTERS_HTML)
+    page.add(CARDS_CONTAINER_XPATH, {"id": "cards"})
+    page.add(SEND_POPUP_XPATH.rsplit("/", 1)[0], {"id": "popup"})
+    page.add(POPUP_BUTTON, {"id": "popup-close", "title": "Close"})
+    page.add("/html/body", html=f"<script>{CARDS_PAGE_SCRIPT}</script>")
+    return page.render()
+
+
+def build_card(profile: dict) -> str:
+    """Builds one card of the members list, matching CARDS_XPATH, CARD_NAME and CARD_BUTTON."""
+    href = f"/profile/{profile['id']}/"
+    return (
+        f'<div class="card" data-post-id="{profile["id"]}">'
+        f'<img class="avatar" src="/media/avatar-{profile["id"]}.jpg" alt="" width="96" height="96" />'
+        f'<h2 class="elementor-heading-title elementor-size-default"><a href="{href}">{escape(profile["name"])}</a></h2>'
+        f'<div class="elementor-button-wrapper"><a class="elementor-button" href="{href}" target="_blank">View</a></div>'
+        f"</div>"
+    )
+
+
+DETAILS_PAGE_SCRIPT = """
+window.ElementorProFrontendConfig = {"ajaxurl": "%(ajax_url)s"};
+document.getElementById('send-button').addEventListener('click', function (event) {
+  event.preventDefault();
+  document.getElementById('send-popup').style.display = 'block';
+});
+document.getElementById('send-form').addEventListener('submit', function (event) {
+  event.preventDefault();
+  var form = event.target;
+  var data = new FormData(form);
+  data.append('action', 'elementor_pro_forms_send_form');
+  data.append('referrer', window.location.href);
+  fetch(window.ElementorProFrontendConfig.ajaxurl, {method: 'POST', body: new URLSearchParams(data)})
+    .then(function (response) { return response.json(); })
+    .then(function (result) {
+      var message = document.createElement('div');
+      message.className = 'elementor-message ' + (result.success ? 'elementor-message-success' : 'elementor-message-danger');
+      message.textContent = result.success ? 'Sent' : 'Failed';
+      form.appendChild(message);
+    });
+});
+"""
+
+
+def build_details_page(profile: dict, ajax_url: str) -> str:
+    """Builds a card's details page with the send button and the hidden send popup."""
+    page = PageTree(profile["name"])
+    page.head = "<style>#send-popup{display:none}</style>"
+    page.add("/html/body/div[2]/div/section[1]", html=f"<h1>{escape(profile['name'])}</h1><p>Age {profile['age']}</p>")
+    page.add(_parent(SEND_BUTTON_XPATH, "a"), {"id": "send-button", "href": "#"})
+    page.add(SEND_BUTTON_XPATH, html="Send a message")
+    page.add(SEND_POPUP_XPATH.rsplit("/", 1)[0], {"id": "send-popup"})
+    form_xpath = _parent(SEND_POPUP_TEXTAREA_XPATH, "form")
+    page.add(form_xpath, {"id": "send-form", "class": "elementor-form", "method": "post"})
+    page.add(f"{form_xpath}/div[1]", html=(
+        '<input type="hidden" name="post_id" value="1" />'
+        '<input type="hidden" name="form_id" value="send" />'
+        f'<input type="hidden" name="queried_id" value="{profile["id"]}" />'
+    ))
+    page.add(SEND_POPUP_TEXTAREA_XPATH, {"name": "form_fields[message]", "rows": "4"})
+    page.add(SEND_POPUP_SUBMIT_BUTTON_XPATH, {"type": "submit"}, "Send")
+    page.add("/html/body", html=f"<script>{DETAILS_PAGE_SCRIPT % {'ajax_url': ajax_url}}</script>")
+    return page.render()
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    A local replica of the cards site, serving the pages the automation drives.
+    Every response is delayed by `latency` seconds and every batch of cards by `batch_latency` more.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, cards: int = 100, batch_size: int = 24, latency: float = 0.0, batch_latency: float = 0.3, image_kb: int = 30, port: int = 0):
+        """
+        Initializes the FixtureServer.
+
+        Args:
+            cards (int, optional): The number of cards on the site. Defaults to 100.
+            batch_size (int, optional): The number of cards loaded per infinite-scroll batch. Defaults to 24.
+            latency (float, optional): Artificial delay of every response, in seconds. Defaults to 0.
+            batch_latency (float, optional): Additional delay of every batch of cards, in seconds. Defaults to 0.3.
+            image_kb (int, optional): Size of every card's avatar image, in KB. Defaults to 30.
+            port (int, optional): The port to listen on, 0 for any free port. Defaults to 0.
+        """
+        super().__init__(("127.0.0.1", port), FixtureRequestHandler)
+        self.batch_size = batch_size
+        self.latency = latency
+        self.batch_latency = batch_latency
+        self.image = b"\xff\xd8\xff\xe0" + bytes(max(0, image_kb * 1024 - 4))
+        self.profiles = [
+            {"id": str(1000 + number), "name": f"Member {number}", "gender": "male" if number % 4 == 0 else "female", "age": 18 + (number * 7) % 50}
+            for number in range(1, cards + 1)
+        ]
+        self.messages = []
+        self.pages = {LOGIN_PATH: build_login_page(), MEMBERS_PATH: build_members_page(), CARDS_PATH: build_cards_page()}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """The server's root URL, without a trailing slash."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        """
+        Gets the absolute URL of a path on the server.
+
+        Args:
+            path (str): The path, e.g. LOGIN_PATH.
+
+        Returns:
+            str: The absolute URL.
+        """
+        return self.base_url + path
+
+    def start(self) -> "FixtureServer":
+        """Serves requests in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and closes the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def matching_profiles(self, genders: list[str], min_age: int, max_age: int) -> list[dict]:
+        """Gets the profiles passing the list filters; no selected gender means any."""
+        return [
+            profile for profile in self.profiles
+            if (not genders or profile["gender"] in genders) and min_age <= profile["age"] <= max_age
+        ]
+
+    def record_message(self, fields: dict):
+        """Records a submitted message with its arrival time."""
+        with self._lock:
+            self.messages.append({"received_at": time.time(), "profile_id": fields.get("queried_id", ""), "message": fields.get("form_fields[message]", "")})
+
+    def stats(self) -> dict:
+        """
+        Summarizes the submitted messages.
+
+        Returns:
+            dict: The number of messages and the arrival time of the first and last one.
+        """
+        with self._lock:
+            times = [message["received_at"] for message in self.messages]
+        return {"messages": len(times), "first_message_at": min(times, default=None), "last_message_at": max(times, default=None)}
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of a FixtureServer."""
+
+    server: FixtureServer
+
+    def log_message(self, format, *args):
+        """Keeps the benchmark output quiet."""
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        url = urlparse(self.path)
+        if url.path.startswith("/media/"):
+            return self.send_body(self.server.image, "image/jpeg")
+        if url.path == LOGIN_PATH:
+            return self.send_html(self.server.pages[LOGIN_PATH])
+        if not self.logged_in():
+            return self.redirect(LOGIN_PATH)
+        if url.path in self.server.pages:
+            return self.send_html(self.server.pages[url.path])
+        if url.path == "/api/cards":
+            return self.send_cards(parse_qs(url.query))
+        if url.path == "/stats":
+            return self.send_json(self.server.stats())
+        match = re.fullmatch(r"/profile/(\d+)/", url.path)
+        profile = next((profile for profile in self.server.profiles if match and profile["id"] == match.group(1)), None)
+        if profile is None:
+            return self.send_error(404)
+        self.send_html(build_details_page(profile, self.server.url(AJAX_PATH)))
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        length = int(self.headers.get("Content-Length") or 0)
+        fields = {name: values[0] for name, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        path = urlparse(self.path).path
+        if path == LOGIN_PATH:
+            return self.redirect(MEMBERS_PATH, cookie=f"{SESSION_COOKIE}=1; Path=/")
+        if path == AJAX_PATH:
+            if not self.logged_in() or not fields.get("form_fields[message]"):
+                return self.send_json({"success": False})
+            self.server.record_message(fields)
+            return self.send_json({"success": True, "data": {"message": "Sent"}})
+        self.send_error(404)
+
+    def send_cards(self, query: dict):
+        """Sends a batch of cards, starting at the `offset` query parameter."""
+        time.sleep(self.server.batch_latency)
+        genders = [gender for gender in query.get("gender", [""])[0].split(",") if gender]
+        profiles = self.server.matching_profiles(genders, int(query.get("min_age", ["0"])[0] or 0), int(query.get("max_age", ["200"])[0] or 200))
+        offset = int(query.get("offset", ["0"])[0])
+        batch = profiles[offset:offset + self.server.batch_size]
+        self.send_json({"html": "".join(build_card(profile) for profile in batch), "count": len(batch), "total": len(profiles)})
+
+    def logged_in(self) -> bool:
+        """Checks the session cookie set at login."""
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return SESSION_COOKIE in cookie
+
+    def redirect(self, location: str, cookie: str = None):
+        self.send_response(302)
+        self.send_header("Location", location)
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_html(self, html: str):
+        self.send_body(html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def send_json(self, data: dict):
+        self.send_body(json.dumps(data).encode("utf-8"), "application/json")
+
+    def send_body(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
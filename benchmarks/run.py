@@ -0,0 +1,283 @@
+"""
+Runs the automation headless against the local replica of the cards site and reports its throughput.
+
+Usage:
+    python -m benchmarks.run --cards 200 --strategy bulk
+    python -m benchmarks.run --cards 200 --strategy bulk --save-baseline
+    python -m benchmarks.run --cards 200 --strategy bulk --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+from benchmarks.fixture_server import FixtureServer, LOGIN_PATH, MEMBERS_PATH, CARDS_PATH
+from src.patterns.automation import Automation
+from src.patterns.facade import SeleniumFacade
+from src.patterns.browser_profile import BrowserProfile, PROFILES, get_profile, measure_transfer
+from src.patterns.login_strategy import StandardLogin
+from src.patterns.cards_strategy import StandardCardCollection, BulkCardCollection, PooledCardCollection, HttpCardCollection, StreamingCardCollection, ShardedCardCollection
+from src.patterns.http_engine import HttpEngine
+from src.patterns.metrics import LatencyRecorder
+from src.patterns.rate_limiter import SendRateLimiter
+from src.patterns.export import ProfileWriter, open_profile_writer
+from src.pages.xpaths import PROFILE_FIELDS
+from src.patterns.worker_pool import CardWorkerPool
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "latest.json")
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+# Results where a lower value is an improvement
+LOWER_IS_BETTER = {"elapsed_seconds", "time_to_first_message_seconds", "python_peak_rss_mb", "browser_js_heap_mb", "dom_nodes", "peak_dom_nodes", "page_requests", "page_transfer_kb"}
+
+
+def setup_headless_webdriver(profile: BrowserProfile, chromedriver_path: str = None) -> webdriver.Chrome:
+    """
+    Sets up a Chrome WebDriver with the given browser profile, forced headless.
+
+    Args:
+        profile (BrowserProfile): The browser profile to benchmark.
+        chromedriver_path (str, optional): Path to the ChromeDriver executable. Defaults to None (resolved by Selenium).
+
+    Returns:
+        webdriver.Chrome: Configured WebDriver instance.
+    """
+    chrome_options = profile.apply_options(Options())
+    if not profile.headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--window-size=1280,900")
+    service = Service(executable_path=chromedriver_path) if chromedriver_path else Service()
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    profile.apply(driver)
+    return driver
+
+
+def build_strategy(args: argparse.Namespace,
+                   selenium_facade: SeleniumFacade,
+                   logger: logging.Logger,
+                   worker_pool: CardWorkerPool,
+                   rate_limiter: SendRateLimiter = None,
+                   profile_writer: ProfileWriter = None):
+    """Creates the card collection strategy selected on the command line, the same way app.py does."""
+    options = dict(reuse_detail_tab=args.reuse_detail_tab, rate_limiter=rate_limiter, profile_writer=profile_writer, snapshot_parser=args.snapshot_parser, prune_dom=args.prune_dom)
+    if args.strategy == "shard":
+        if not worker_pool:
+            raise ValueError("--strategy shard needs --workers > 0")
+        return ShardedCardCollection(selenium_facade, logger, worker_pool, args.min_age, args.max_age, args.shards, **options)
+    if args.strategy == "stream":
+        return StreamingCardCollection(selenium_facade, logger, worker_pool, **options)
+    if worker_pool:
+        return PooledCardCollection(selenium_facade, logger, worker_pool, **options)
+    if args.strategy == "http":
+        return HttpCardCollection(selenium_facade, logger, HttpEngine(logger), **options)
+    if args.strategy == "bulk":
+        return BulkCardCollection(selenium_facade, logger, **options)
+    return StandardCardCollection(selenium_facade, logger, **options)
+
+
+def python_peak_memory_mb() -> float:
+    """
+    Gets the peak resident memory of the benchmark process.
+
+    Returns:
+        float: The peak in MB, or None where the `resource` module is unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def browser_metrics(driver: webdriver.Chrome, selenium_facade: SeleniumFacade) -> dict:
+    """
+    Reads the JS heap size and DOM node count of the main tab through the DevTools protocol,
+    and the network transfer of its page through the Resource Timing API.
+
+    Args:
+        driver (webdriver.Chrome): The benchmarked WebDriver instance.
+        selenium_facade (SeleniumFacade): The benchmarked SeleniumFacade instance.
+
+    Returns:
+        dict: browser_js_heap_mb, dom_nodes, page_requests and page_transfer_kb, for those that could be read.
+    """
+    metrics = {}
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        performance = {metric["name"]: metric["value"] for metric in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+        metrics.update(browser_js_heap_mb=round(performance["JSHeapUsedSize"] / (1024 * 1024), 1), dom_nodes=int(performance["Nodes"]))
+    except Exception:
+        pass
+    try:
+        transfer = measure_transfer(selenium_facade)
+        metrics.update(page_requests=transfer["requests"], page_transfer_kb=round(transfer["transferred_bytes"] / 1024, 1))
+    except Exception:
+        pass
+    return metrics
+
+
+def run_benchmark(args: argparse.Namespace, logger: logging.Logger) -> dict:
+    """
+    Starts the fixture server, runs the automation against it and collects the results.
+
+    Args:
+        args (argparse.Namespace): The command line options.
+        logger (logging.Logger): The logger for output messages.
+
+    Returns:
+        dict: The benchmark's configuration, results and per-operation latency.
+    """
+    server = FixtureServer(cards=args.cards, batch_size=args.batch_size, latency=args.latency, batch_latency=args.batch_latency, image_kb=args.image_kb).start()
+    logger.info(f"Fixture server listening on {server.base_url}")
+    profile = get_profile(args.profile)
+    driver = setup_headless_webdriver(profile, args.chromedriver)
+    instrumentation = LatencyRecorder()
+    selenium_facade = SeleniumFacade(driver, 
+                                     cache_elements=args.cache_elements, 
+                                     instrumentation=instrumentation, 
+                                     wait_mode=args.wait_mode, 
+                                     poll_interval=args.poll_interval)
+    rate_limiter = SendRateLimiter(args.send_rate, logger, args.send_burst) if args.send_rate > 0 else None
+    profile_writer = open_profile_writer(args.export, tuple(PROFILE_FIELDS)) if args.export else None
+    worker_pool = CardWorkerPool(lambda: setup_headless_webdriver(profile, args.chromedriver), logger, args.workers, instrumentation, rate_limiter, profile_writer) if args.workers > 0 else None
+    automation = Automation(driver,
+                            logger,
+                            server.url(MEMBERS_PATH),
+                            selenium_facade,
+                            server.url(LOGIN_PATH),
+                            server.url(CARDS_PATH),
+                            "benchmark@example.com",
+                            "benchmark",
+                            StandardLogin(selenium_facade),
+                            build_strategy(args, selenium_facade, logger, worker_pool, rate_limiter, profile_writer),
+                            "benchmark message",
+                            args.min_age,
+                            args.max_age)
+    try:
+        started = time.time()
+        automation.run()
+        elapsed = time.time() - started
+        browser = browser_metrics(driver, selenium_facade)
+    finally:
+        if worker_pool:
+            worker_pool.shutdown()
+        if profile_writer:
+            profile_writer.close()
+        driver.quit()
+        server.stop()
+
+    stats = server.stats()
+    first_message = stats["first_message_at"] - started if stats["first_message_at"] else None
+    results = {
+        "cards_available": len(server.matching_profiles(["female"], args.min_age, args.max_age)),
+        "messages_sent": stats["messages"],
+        "elapsed_seconds": round(elapsed, 3),
+        "cards_per_second": round(stats["messages"] / elapsed, 3) if elapsed else 0.0,
+        "time_to_first_message_seconds": round(first_message, 3) if first_message is not None else None,
+        "python_peak_rss_mb": python_peak_memory_mb(),
+        "peak_dom_nodes": automation.card_collection_strategy.peak_dom_nodes,
+        **browser,
+    }
+    config = {name: getattr(args, name) for name in ("cards", "batch_size", "latency", "batch_latency", "image_kb", "profile", "strategy", "workers", "shards", "reuse_detail_tab", "send_rate", "send_burst", "export", "snapshot_parser", "prune_dom", "cache_elements", "wait_mode", "poll_interval", "min_age", "max_age")}
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": config,
+        "results": results,
+        "operations": instrumentation.summary(),
+    }
+
+
+def compare(report: dict, baseline: dict) -> list[str]:
+    """
+    Compares a benchmark report with a baseline.
+
+    Args:
+        report (dict): The report of the current run.
+        baseline (dict): A report saved by an earlier run.
+
+    Returns:
+        list[str]: Lines of a table with the baseline value, the current value and the relative change of every result.
+    """
+    lines = []
+    if report["config"] != baseline.get("config"):
+        lines.append(f"Warning: baseline configuration differs: {baseline.get('config')}")
+    lines.append(f"{'result':<32}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, value in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or not before:
+            lines.append(f"{name:<32}{str(before):>12}{str(value):>12}{'':>10}")
+            continue
+        change = (value - before) / before * 100
+        worse = change > 0 if name in LOWER_IS_BETTER else change < 0
+        marker = " !" if worse and abs(change) >= 10 else ""
+        lines.append(f"{name:<32}{before:>12}{value:>12}{change:>+9.1f}%{marker}")
+    return lines
+
+
+def write_report(report: dict, path: str):
+    """Writes a benchmark report as JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the automation against a local replica of the cards site.")
+    parser.add_argument("--cards", type=int, default=100, help="number of cards on the site")
+    parser.add_argument("--batch-size", type=int, default=24, help="cards loaded per infinite-scroll batch")
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial delay of every response, in seconds")
+    parser.add_argument("--batch-latency", type=float, default=0.3, help="additional delay of every batch of cards, in seconds")
+    parser.add_argument("--image-kb", type=int, default=30, help="size of every card's avatar image, in KB")
+    parser.add_argument("--profile", choices=tuple(PROFILES), default="headless", help="browser profile (always run headless)")
+    parser.add_argument("--strategy", choices=("standard", "bulk", "http", "stream", "shard"), default="standard", help="card collection strategy")
+    parser.add_argument("--workers", type=int, default=0, help="parallel worker sessions for the details pages")
+    parser.add_argument("--shards", type=int, help="age sub-ranges of --strategy shard (default: one per age)")
+    parser.add_argument("--reuse-detail-tab", action="store_true", help="open every details page in one persistent tab")
+    parser.add_argument("--send-rate", type=float, default=0, help="messages per minute allowed by the send rate limiter (default: unlimited)")
+    parser.add_argument("--send-burst", type=int, default=3, help="messages the send rate limiter lets out back to back")
+    parser.add_argument("--export", help="export the processed profiles to this .csv, .jsonl or .parquet file")
+    parser.add_argument("--snapshot-parser", choices=("script", "html"), default="script", help="extract the cards by script or by parsing the list's HTML (requires lxml)")
+    parser.add_argument("--prune-dom", action="store_true", help="hollow out the list's elements of cards no longer needed")
+    parser.add_argument("--cache-elements", action="store_true", help="enable the facade's element cache")
+    parser.add_argument("--wait-mode", choices=("observer", "poll"), default="observer", help="how the facade waits for elements")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="seconds between checks of polled waits")
+    parser.add_argument("--min-age", type=int, default=18)
+    parser.add_argument("--max-age", type=int, default=99)
+    parser.add_argument("--chromedriver", default=os.getenv("CHROMEDRIVER_PATH"), help="ChromeDriver executable (default: resolved by Selenium)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the report")
+    parser.add_argument("--baseline", help="report to compare the results with")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write the report to {DEFAULT_BASELINE}")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    logger = logging.getLogger("benchmark")
+
+    report = run_benchmark(args, logger)
+    write_report(report, args.output)
+    if args.save_baseline:
+        write_report(report, DEFAULT_BASELINE)
+    print(json.dumps(report["results"], indent=2))
+    print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            print("\n".join(compare(report, json.load(file))))
+    return 0 if report["results"]["messages_sent"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
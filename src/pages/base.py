@@ -20,7 +20,7 @@ class BasePage:
             url (str): The URL of the page to load.
         """
         self.logger.info(f"Navigating to: {url}")
-        self.driver.get(url)
+        self.selenium_facade.navigate(url)
         self.wait_for_page_load(url)
 
     def wait_for_page_load(self, url: str = ""):
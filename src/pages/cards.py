@@ -1,12 +1,11 @@
 import logging
-import time
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from src.patterns.cards_strategy import CardCollectionStrategy
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from src.pages.xpaths import *
+from src.pages.scripts import WAIT_FOR_AJAX_IDLE_SCRIPT
 from src.pages.base import BasePage
 from src.patterns.facade import SeleniumFacade
 from src.pages.pageobjects.age_filter import AgeFilter
@@ -54,9 +53,10 @@ class CardsPage(BasePage):
             url (str, optional): The URL of the page to wait for. Defaults to "".
         """
         try:
-            WebDriverWait(self.driver, 10).until(EC.url_contains(url))
+            self.selenium_facade.wait_until(EC.url_contains(url), description=f"url contains {url}")
             self.logger.info("Waiting for cards container to load...")
             self.find_element(CARDS_CONTAINER_XPATH)
+            self.selenium_facade.preflight(CARDS_PAGE_LOCATORS)
             self.logger.info("Cards container loaded.")
         except Exception as e:
             self.logger.error(f"Error waiting for page load: {e}")
@@ -64,7 +64,7 @@ class CardsPage(BasePage):
 
     def apply_filters(self, min_age, max_age):
         """
-        Applies the gender and age range filters.
+        Applies the gender and age range filters and waits for the card list to reload.
         """
         try:
             self.logger.info("Setting filters...")
@@ -74,7 +74,28 @@ class CardsPage(BasePage):
         except Exception as e:
             self.logger.error(f"Error setting filters: {e}")
             raise
-        time.sleep(5)
+        self.wait_for_filtered_cards()
+
+    def wait_for_filtered_cards(self, timeout: float = 10, settle: float = 0.3, idle: float = 1):
+        """
+        Waits inside the browser until the card list has reloaded for the new filters.
+
+        Args:
+            timeout (float, optional): Maximum time in seconds to wait. Defaults to 10.
+            settle (float, optional): Time in seconds without DOM changes after which the list is considered reloaded. Defaults to 0.3.
+            idle (float, optional): Time in seconds to wait for a reload when the site sends no request. Defaults to 1.
+        """
+        result = self.selenium_facade.execute_async_script(
+            WAIT_FOR_AJAX_IDLE_SCRIPT,
+            int(timeout * 1000),
+            int(settle * 1000),
+            int(idle * 1000),
+            timeout=timeout + 5
+        )
+        if result["pending"]:
+            self.logger.warning(f"Card list still loading after {timeout}s.")
+        else:
+            self.logger.info(f"Card list reloaded in {result['waited'] / 1000:.2f}s.")
 
     def process_cards(self, message: str):
         """
@@ -1,6 +1,5 @@
 import logging
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webdriver import WebDriver
 
@@ -35,13 +34,12 @@ class LoginPage(BasePage):
         try:
             self.logger.info("Start Login")
             self.login_strategy.login(self.driver, email, password)  # Use the strategy
-            WebDriverWait(self.driver, 10).until(EC.url_to_be(redirect_url))
+            self.selenium_facade.wait_until(EC.url_to_be(redirect_url), description=f"redirect to {redirect_url}")
             self.logger.info("Login successful!")
 
         except Exception as e:
             self.logger.error(f"Error during login: {e}")
-            self.driver.quit()
-            exit(1)
+            raise
 
     def wait_for_page_load(self, url: str = ""):
         """
@@ -53,9 +51,9 @@ class LoginPage(BasePage):
         try:
             self.logger.info("Waiting for login form to load...")
             self.find_element(LOGIN_FORM_XPATH)
+            self.selenium_facade.preflight(LOGIN_PAGE_LOCATORS)
             self.logger.info("Login form loaded.")
 
         except Exception as e:
             self.logger.error(f"Error during login page load: {e}")
-            self.driver.quit()
-            exit(1)
\ No newline at end of file
+            raise
\ No newline at end of file
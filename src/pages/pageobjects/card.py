@@ -1,46 +1,77 @@
 import logging
+from dataclasses import dataclass
 from selenium.webdriver.remote.webelement import WebElement
 from src.pages.xpaths import *
 from src.patterns.facade import SeleniumFacade
 
+
+@dataclass(frozen=True)
+class CardRecord:
+    """Plain snapshot of a card's data, detached from the live DOM."""
+
+    __slots__ = ("id", "name", "href", "index")
+
+    id: str
+    name: str
+    href: str
+    index: int
+
+
 class Card:
-    """Represents an individual card on the page."""
+    """
+    Represents an individual card on the page.
+
+    Only the card's data is kept; the live element is looked up again whenever it has to be clicked,
+    so the card stays usable after the list is re-rendered.
+    """
 
-    def __init__(self, selenium_facade: SeleniumFacade, card_element: WebElement):
+    __slots__ = ("selenium_facade", "id", "name", "href", "index")
+
+    def __init__(self, selenium_facade: SeleniumFacade, record: CardRecord):
         """
         Initializes the Card.
 
         Args:
             selenium_facade (SeleniumFacade): The SeleniumFacade instance for interacting with the browser.
-            card_element (WebElement): The WebElement representing the card.
+            record (CardRecord): The card's data, as extracted from the cards list.
         """
         self.selenium_facade = selenium_facade
-        self.card_element = card_element
-        self.name = self.get_name()
+        self.id = record.id
+        self.name = record.name
+        self.href = record.href
+        self.index = record.index
 
-    def get_name(self) -> str:
+    def get_locator(self) -> str:
         """
-        Gets the name from the card.
+        Gets an XPath locating the card in the list: by post id or element id when it has one,
+        otherwise by its position.
 
         Returns:
-            str: The name of the card.
+            str: The card's XPath.
         """
-        try:
-            name = self.selenium_facade.get_element_text(CARD_NAME, parent_element=self.card_element)
-            logging.info(f"Card name retrieved: {name}")
-            return name
-        except Exception as e:
-            logging.error(f"Error retrieving card name: {e}")
-            raise
+        if self.id and self.id.isdigit():
+            return f"{CARDS_XPATH}[@data-post-id='{self.id}']"
+        if self.id and self.id != self.href:
+            return f"{CARDS_XPATH}[@id='{self.id}']"
+        return f"({CARDS_XPATH})[{self.index + 1}]"
+
+    def find_element(self) -> WebElement:
+        """
+        Finds the card's live element.
+
+        Returns:
+            WebElement: The card's element.
+        """
+        return self.selenium_facade.find_element(self.get_locator())
 
     def click_view_button(self):
         """
         Clicks the 'View' button on the card.
         """
         try:
-            view_button = self.selenium_facade.find_element(CARD_BUTTON, parent_element=self.card_element)
+            view_button = self.selenium_facade.find_element(CARD_BUTTON, parent_element=self.find_element())
             view_button.click()
             logging.info("Clicked 'View' button on card.")
         except Exception as e:
             logging.error(f"Error clicking 'View' button: {e}")
-            raise
\ No newline at end of file
+            raise
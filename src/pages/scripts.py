@@ -0,0 +1,217 @@
+# Constants for JavaScript snippets executed in the browser
+
+# Scrolls to the bottom of the page and resolves once the card list has grown and
+# settled, the site's AJAX request finished without adding cards, or nothing happened
+# at all within the idle window (end of list).
+# Arguments: cards xpath, previous card count, timeout (ms), settle time (ms), idle time (ms).
+WAIT_FOR_NEW_CARDS_SCRIPT = """
+var xpath = arguments[0], previous = arguments[1], timeout = arguments[2],
+    settle = arguments[3], idle = arguments[4], done = arguments[arguments.length - 1];
+
+function count() {
+    return document.evaluate('count(' + xpath + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue;
+}
+function pending() {
+    return !!(window.jQuery && window.jQuery.active > 0);
+}
+
+var started = Date.now(), lastChange = started, sawRequest = false, finished = false, timer = null;
+var observer = new MutationObserver(function() { lastChange = Date.now(); });
+
+function finish() {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(timer);
+    done({
+        count: count(),
+        pending: pending(),
+        atBottom: window.innerHeight + window.scrollY >= document.body.scrollHeight - 2,
+        nodes: document.getElementsByTagName('*').length
+    });
+}
+
+observer.observe(document.body, {childList: true, subtree: true});
+window.scrollTo(0, document.body.scrollHeight);
+
+timer = setInterval(function() {
+    var now = Date.now(), busy = pending();
+    if (busy) sawRequest = true;
+    if (now - started >= timeout) return finish();
+    if (busy || now - lastChange < settle) return;
+    if (sawRequest || now - lastChange >= idle || count() > previous) finish();
+}, 50);
+"""
+
+# Resolves once the site's AJAX requests have finished and the page stopped changing, e.g. after
+# a filter change reloaded the card list, or after the idle time if no request was seen.
+# Arguments: timeout (ms), settle time (ms), idle time (ms).
+WAIT_FOR_AJAX_IDLE_SCRIPT = """
+var timeout = arguments[0], settle = arguments[1], idle = arguments[2], done = arguments[arguments.length - 1];
+
+function pending() {
+    return !!(window.jQuery && window.jQuery.active > 0);
+}
+
+var started = Date.now(), lastChange = started, sawRequest = pending(), timer = null;
+var observer = new MutationObserver(function() { lastChange = Date.now(); });
+observer.observe(document.body, {childList: true, subtree: true});
+
+timer = setInterval(function() {
+    var now = Date.now(), busy = pending();
+    if (busy) sawRequest = true;
+    var quiet = !busy && now - lastChange >= settle && (sawRequest || now - lastChange >= idle);
+    if (quiet || now - started >= timeout) {
+        observer.disconnect();
+        clearInterval(timer);
+        done({pending: busy, waited: now - started});
+    }
+}, 50);
+"""
+
+# Extracts every loaded card's id, name and details link in a single round-trip.
+# Arguments: cards xpath, card name xpath (relative), card button xpath (relative), start index.
+SNAPSHOT_CARDS_SCRIPT = """
+var cardsXpath = arguments[0], nameXpath = arguments[1], buttonXpath = arguments[2], start = arguments[3] || 0;
+
+function first(xpath, context) {
+    return document.evaluate(xpath, context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+var cards = document.evaluate(cardsXpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var records = [];
+for (var i = start; i < cards.snapshotLength; i++) {
+    var card = cards.snapshotItem(i), name = first(nameXpath, card), button = first(buttonXpath, card);
+    var href = button ? button.href : (name ? name.href : null);
+    records.push({
+        index: i,
+        id: card.getAttribute('data-post-id') || card.id || href || null,
+        name: name ? name.innerText.trim() : '',
+        href: href
+    });
+}
+return records;
+"""
+
+# Hollows out the card elements in [start, end): their content is removed, while the element itself,
+# its attributes and its height are kept, so card indexes, the scroll position and the site's
+# lazy-load trigger are unaffected. Returns the number of pruned cards and of elements in the page.
+# Arguments: cards xpath, start index, end index.
+PRUNE_CARDS_SCRIPT = """
+var cardsXpath = arguments[0], start = arguments[1], end = arguments[2];
+
+var cards = document.evaluate(cardsXpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var heights = [], pruned = 0;
+end = Math.min(end, cards.snapshotLength);
+// Read every height before changing the layout, so the page is laid out once
+for (var i = start; i < end; i++) {
+    heights.push(cards.snapshotItem(i).offsetHeight);
+}
+for (var i = start; i < end; i++) {
+    var card = cards.snapshotItem(i);
+    if (card.hasAttribute('data-pruned')) continue;
+    card.style.boxSizing = 'border-box';
+    card.style.height = heights[i - start] + 'px';
+    card.replaceChildren();
+    card.setAttribute('data-pruned', '');
+    pruned++;
+}
+return {pruned: pruned, nodes: document.getElementsByTagName('*').length};
+"""
+
+# Reads the text of the first match of every field's XPath in a single round-trip (null if nothing matches).
+# Arguments: object mapping field names to XPaths.
+EXTRACT_FIELDS_SCRIPT = """
+var fields = arguments[0], values = {};
+Object.keys(fields).forEach(function(name) {
+    var node = document.evaluate(fields[name], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    values[name] = node ? node.textContent.trim() : null;
+});
+return values;
+"""
+
+# Returns the outerHTML of the first node matching an XPath, or null.
+# Arguments: xpath.
+OUTER_HTML_SCRIPT = """
+var node = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return node ? node.outerHTML : null;
+"""
+
+# Counts the matches of every locator in a single round-trip (-1 for an invalid XPath).
+# Arguments: object mapping locator names to XPaths.
+PREFLIGHT_LOCATORS_SCRIPT = """
+var locators = arguments[0], counts = {};
+for (var name in locators) {
+    try {
+        counts[name] = document.evaluate('count(' + locators[name] + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue;
+    } catch (e) {
+        counts[name] = -1;
+    }
+}
+return counts;
+"""
+
+# Resolves as soon as an XPath matches, watching the DOM with a MutationObserver instead of polling.
+# Conditions: 'present' (first match), 'clickable' (first match, displayed and enabled), 'all' (every match).
+# Resolves {result: element(s)}, {timedOut: true} or {error: message}.
+# Arguments: xpath, condition, timeout (ms), context node (optional, defaults to the document).
+WAIT_FOR_LOCATOR_SCRIPT = """
+var xpath = arguments[0], condition = arguments[1], timeout = arguments[2],
+    context = arguments[3] || document, done = arguments[arguments.length - 1];
+
+function clickable(el) {
+    var style = window.getComputedStyle(el);
+    return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0' && !el.disabled;
+}
+function match() {
+    if (condition === 'all') {
+        var nodes = document.evaluate(xpath, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), all = [];
+        for (var i = 0; i < nodes.snapshotLength; i++) all.push(nodes.snapshotItem(i));
+        return all.length ? all : null;
+    }
+    var el = document.evaluate(xpath, context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return el && (condition !== 'clickable' || clickable(el)) ? el : null;
+}
+
+var finished = false, observer = null, timer = null, fallback = null;
+function finish(value) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(fallback);
+    done(value);
+}
+function check() {
+    try {
+        var found = match();
+        if (found) finish({result: found});
+    } catch (e) {
+        finish({error: String(e)});
+    }
+}
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    timer = setTimeout(function() { finish({timedOut: true}); }, timeout);
+    // Visibility can also change without a DOM mutation (stylesheets, transitions)
+    fallback = setInterval(check, 100);
+}
+"""
+
+# Sums the network transfer of the current page (document and every resource) from the Resource Timing API.
+# Blocked requests never start, so they are not counted.
+TRANSFER_STATS_SCRIPT = """
+var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+var transferred = 0, decoded = 0;
+for (var i = 0; i < entries.length; i++) {
+    transferred += entries[i].transferSize || 0;
+    decoded += entries[i].decodedBodySize || 0;
+}
+return {requests: entries.length, transferred: transferred, decoded: decoded};
+"""
+
+# Installed on every new document so long card lists do not overflow the default buffer of 250 resource entries.
+RESOURCE_TIMING_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(100000);"
@@ -13,4 +13,32 @@ CARD_BUTTON = ".//div[contains(@class, 'elementor-button-wrapper')]//a"
 SEND_BUTTON_XPATH = "/html/body/div[2]/div/section[2]/div/div/div/div/div/div[1]/div/div[2]/a/span"
 SEND_POPUP_XPATH = "/html/body/div[5]/div"
 SEND_POPUP_TEXTAREA_XPATH = "/html/body/div[5]/div/div[2]/div/div/section/div/div/div/div/div/div[3]/div/form/div[2]/div/textarea"
-SEND_POPUP_SUBMIT_BUTTON_XPATH = "/html/body/div[5]/div/div[2]/div/div/section/div/div/div/div/div/div[3]/div/form/div[3]/div/div/button"
\ No newline at end of file
+SEND_POPUP_SUBMIT_BUTTON_XPATH = "/html/body/div[5]/div/div[2]/div/div/section/div/div/div/div/div/div[3]/div/form/div[3]/div/div/button"
+SEND_SUCCESS_XPATH = "//div[contains(@class, 'elementor-message-success')]"
+SEND_ERROR_XPATH = "//div[contains(@class, 'elementor-message-danger') or contains(@class, 'elementor-message-error')]"
+SEND_RESULT_XPATH = f"{SEND_SUCCESS_XPATH} | {SEND_ERROR_XPATH}"
+
+# Details page fields exported with every profile, by column name ("age" is converted to a number)
+PROFILE_FIELDS = {
+    "age": "/html/body/div[2]/div/section[1]//p",
+}
+
+# Locators expected on each page, checked in a single call by the locator preflight
+LOGIN_PAGE_LOCATORS = {
+    "LOGIN_EMAIL_TEXTBOX": LOGIN_EMAIL_TEXTBOX,
+    "LOGIN_PASSWORD_TEXTBOX": LOGIN_PASSWORD_TEXTBOX,
+    "LOGIN_SUBMIT_BUTTON": LOGIN_SUBMIT_BUTTON,
+}
+CARDS_PAGE_LOCATORS = {
+    "CARDS_CONTAINER_XPATH": CARDS_CONTAINER_XPATH,
+    "GENDER_CHECKBOX_XPATH": GENDER_CHECKBOX_XPATH.replace("{gender}", "female"),
+    "AGE_SLIDER_XPATH": AGE_SLIDER_XPATH,
+}
+DETAILS_PAGE_LOCATORS = {
+    "SEND_BUTTON_XPATH": SEND_BUTTON_XPATH,
+}
+SEND_POPUP_LOCATORS = {
+    "SEND_POPUP_XPATH": SEND_POPUP_XPATH,
+    "SEND_POPUP_TEXTAREA_XPATH": SEND_POPUP_TEXTAREA_XPATH,
+    "SEND_POPUP_SUBMIT_BUTTON_XPATH": SEND_POPUP_SUBMIT_BUTTON_XPATH,
+}
\ No newline at end of file
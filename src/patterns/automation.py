@@ -1,10 +1,16 @@
-from src.patterns.facade import SeleniumFacade
+from src.patterns.facade import SeleniumFacade, LocatorPreflightError
 from src.pages.login import LoginPage
 from src.pages.cards import CardsPage
 from src.patterns.login_strategy import LoginStrategy
 from src.patterns.cards_strategy import CardCollectionStrategy
+from src.patterns.session_cache import SessionCache
+from src.patterns.checkpoint import RunCheckpoint
 from selenium.webdriver.remote.webdriver import WebDriver
+from collections import Counter
+from dataclasses import dataclass
 import logging
+import threading
+import time
 
 class State:
     """
@@ -15,8 +21,33 @@ class State:
     LOAD_CARDS = 'load_cards'
     APPLY_FILTERS = 'apply_filters'
     PROCESS_CARDS = 'process_cards'
+    DONE = 'done'
     # ... add more states as needed
 
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How often a state is retried after an error, how long to wait in between, and which state
+    the retry starts from.
+    """
+    attempts: int = 3
+    backoff: float = 2
+    factor: float = 2
+    max_backoff: float = 60
+    restart_from: str = None
+
+    def delay(self, failures: int) -> float:
+        """Returns the seconds to wait before the retry following the given number of failures."""
+        return min(self.max_backoff, self.backoff * self.factor ** (failures - 1))
+
+# A failed filter or card pass leaves the cards page in an unknown state, so the retry reloads it
+DEFAULT_RETRY_POLICIES = {
+    State.LOGIN: RetryPolicy(attempts=2, backoff=5),
+    State.LOAD_CARDS: RetryPolicy(),
+    State.APPLY_FILTERS: RetryPolicy(restart_from=State.LOAD_CARDS),
+    State.PROCESS_CARDS: RetryPolicy(restart_from=State.LOAD_CARDS),
+}
+
 class Automation:
     """
     Using State-Machine pattern to manage the state and flow of the automation.
@@ -33,7 +64,11 @@ class Automation:
                  card_collection_strategy: CardCollectionStrategy,
                  message: str, 
                  min_age: int, 
-                 max_age: int):
+                 max_age: int,
+                 session_cache: SessionCache = None,
+                 checkpoint: RunCheckpoint = None,
+                 retry_policies: dict = None,
+                 max_failures: int = 5):
         """
         Initializes the state machine.
 
@@ -46,16 +81,26 @@ class Automation:
             password (str): The password for login.
             login_strategy (LoginStrategy): The strategy for logging into the website.
             card_collection_strategy (CardCollectionStrategy): The strategy for handling card collections.
+            session_cache (SessionCache, optional): Stores the logged-in session between runs. Defaults to None.
+            checkpoint (RunCheckpoint, optional): Records the run's progress on every transition and every few processed cards,
+                and resumes an unfinished run. Defaults to None.
+            retry_policies (dict, optional): The RetryPolicy of each state. Defaults to DEFAULT_RETRY_POLICIES.
+            max_failures (int, optional): Failures in all states after which the run stops (circuit breaker). Defaults to 5.
         """
         self.driver = driver
         self.logger = logger
         self.current_state = State.LOGIN  # Start in the login state
+        self.last_error = None
+        self.failures = Counter()
+        self.circuit_open = False
 
         # Credentials & URLs
         self.login_url = login_url
         self.cards_url = cards_url
         self.members_url = members_url
         self.facade = facade
+        if self.facade.instrumentation:
+            self.facade.instrumentation.current_state = self.current_state
         self.username = username
         self.password = password
         self.message = message
@@ -65,6 +110,15 @@ class Automation:
         # Strategies
         self.login_strategy = login_strategy
         self.card_collection_strategy = card_collection_strategy
+        self.session_cache = session_cache
+        self.checkpoint = checkpoint
+        self.cards_since_checkpoint = 0
+        # Card strategies report processed cards from worker threads; saves are serialized so a checkpoint never goes back
+        self._checkpoint_lock = threading.RLock()
+        if self.checkpoint:
+            self.card_collection_strategy.progress_callback = self.card_processed
+        self.retry_policies = DEFAULT_RETRY_POLICIES if retry_policies is None else retry_policies
+        self.max_failures = max_failures
         
         # Page Objects
         self.login_page = LoginPage(self.driver, self.logger, self.facade, self.login_strategy)
@@ -73,8 +127,10 @@ class Automation:
     def run(self):
         """
         The main loop of the state machine.
-        Continues to execute actions based on the current state.
+        Continues to execute actions based on the current state, retrying failed states per their
+        RetryPolicy until they succeed, run out of attempts or the circuit breaker opens.
         """
+        self.resume_from_checkpoint()
         while True: # The loop can be controlled by a condition for ending the automation
             try:
                 if self.current_state == State.LOGIN:
@@ -85,19 +141,109 @@ class Automation:
                     self.handle_apply_filters_state()
                 elif self.current_state == State.PROCESS_CARDS:
                     self.handle_process_cards_state()
+                elif self.current_state == State.DONE:
+                    self.logger.info("All cards processed.")
+                    break
                 # ... handle more states
                 else:
                     self.logger.error(f"Invalid state: {self.current_state}")
                     break # Exit the loop if in invalid state 
-            except Exception as e:
+            except LocatorPreflightError as e:
+                # A broken locator fails the same way on every attempt
                 self.logger.error(f"Error in state '{self.current_state}': {e}")
+                self.last_error = e
+                self.save_checkpoint()
                 break
+            except KeyboardInterrupt:
+                self.save_checkpoint()
+                raise
+            except Exception as e:
+                self.logger.error(f"Error in state '{self.current_state}': {e}")
+                self.last_error = e
+                if not self.recover():
+                    break
+
+    def recover(self) -> bool:
+        """
+        Applies the failed state's retry policy and the circuit breaker after an error.
+
+        Returns:
+            bool: True if the state is retried, False if the run stops.
+        """
+        state = self.current_state
+        self.failures[state] += 1
+        self.save_checkpoint()
+        total = sum(self.failures.values())
+        if total >= self.max_failures:
+            self.circuit_open = True
+            self.logger.error(f"Circuit breaker open after {total} failures, stopping the run.")
+            return False
+        policy = self.retry_policies.get(state, RetryPolicy(attempts=1))
+        if self.failures[state] >= policy.attempts:
+            self.logger.error(f"State '{state}' failed {self.failures[state]} times, stopping the run.")
+            return False
+        delay = policy.delay(self.failures[state])
+        self.logger.warning(f"Retrying state '{policy.restart_from or state}' in {delay:.1f}s "
+                            f"(attempt {self.failures[state] + 1}/{policy.attempts}).")
+        time.sleep(delay)
+        if policy.restart_from:
+            self.transition_to(policy.restart_from)
+        return True
+
+    def filters(self) -> dict:
+        """The filters of the run, stored with the checkpoint."""
+        return {"username": self.username, "cards_url": self.cards_url, "min_age": self.min_age, "max_age": self.max_age}
+
+    def save_checkpoint(self):
+        """Records the current state, the filters and the processed cards, if a checkpoint is configured."""
+        if not self.checkpoint:
+            return
+        with self._checkpoint_lock:
+            self.cards_since_checkpoint = 0
+            try:
+                self.checkpoint.save(self.current_state, self.filters(), self.card_collection_strategy.processed_card_ids())
+            except OSError as e:
+                self.logger.warning(f"Failed to save checkpoint: {e}")
+
+    def card_processed(self):
+        """Saves the checkpoint every `checkpoint.every` processed cards; called by the card strategy, possibly from worker threads."""
+        with self._checkpoint_lock:
+            self.cards_since_checkpoint += 1
+            if self.cards_since_checkpoint >= self.checkpoint.every:
+                self.save_checkpoint()
+
+    def resume_from_checkpoint(self):
+        """
+        Continues an unfinished run with the same filters: the cards it processed are skipped and,
+        if the stored session is still valid, the login is skipped too.
+        """
+        saved = self.checkpoint.load() if self.checkpoint else None
+        if not saved or saved["state"] == State.DONE:
+            return
+        if saved["filters"] != self.filters():
+            self.logger.info("Filters changed since the checkpoint, starting over.")
+            return
+        self.card_collection_strategy.processed_ids = set(saved["processed_ids"])
+        profile_writer = getattr(self.card_collection_strategy, "profile_writer", None)
+        if profile_writer:
+            # Keep the profiles exported before the run stopped
+            profile_writer.resume()
+        self.logger.info(f"Resuming the run stopped in state '{saved['state']}' after {len(saved['processed_ids'])} cards.")
+        if saved["state"] != State.LOGIN and self.session_cache and self.session_cache.restore(self.driver, self.members_url):
+            # The browser is new, so the cards page is loaded and filtered again
+            self.transition_to(State.LOAD_CARDS)
 
     def handle_login_state(self):
         """Handles the logic for the LOGIN state."""
         try:
+            if self.session_cache and self.session_cache.restore(self.driver, self.members_url):
+                self.logger.info("Skipping login, using stored session.")
+                self.transition_to(State.LOAD_CARDS)
+                return
             self.login_page.load(self.login_url)
             self.login_page.login(self.members_url, self.username, self.password)
+            if self.session_cache:
+                self.session_cache.save(self.driver)
             self.transition_to(State.LOAD_CARDS)  # Transition to the next state after login
         except Exception as e:
             self.logger.error(f"Failed to handle login state: {e}")
@@ -125,7 +271,7 @@ class Automation:
         """Handles the logic for the PROCESS_CARDS state."""
         try:
             self.cards_page.process_cards(self.message)
-            # ... (add logic for transitioning to other states or ending automation if needed)
+            self.transition_to(State.DONE)
         except Exception as e:
             self.logger.error(f"Failed to handle process cards state: {e}")
             raise
@@ -138,4 +284,7 @@ class Automation:
             new_state (str): The desired new state.
         """
         self.logger.info(f"Transitioning from state '{self.current_state}' to '{new_state}'")
-        self.current_state = new_state
\ No newline at end of file
+        self.current_state = new_state
+        if self.facade.instrumentation:
+            self.facade.instrumentation.current_state = new_state
+        self.save_checkpoint()
\ No newline at end of file
@@ -0,0 +1,441 @@
+import hmac
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.patterns.campaign import STATUS_FAILED, CampaignJob, JobResult, execute_job, make_job, separate_paths
+from src.patterns.worker_pool import is_alive
+
+try:
+    import psutil
+except ImportError:  # Memory-based recycling is skipped without psutil
+    psutil = None
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+
+
+class PooledSession:
+    """A pre-launched browser session of a BrowserSessionPool."""
+
+    def __init__(self, session_id: int, driver: WebDriver):
+        self.id = session_id
+        self.driver = driver
+        self.account = None
+        self.jobs = 0
+        self.created_at = time.time()
+
+    def memory_mb(self) -> float:
+        """
+        Gets the resident memory of the session's browser (chromedriver and every Chrome process it started).
+
+        Returns:
+            float: The memory in MB, or None if psutil is not installed or the process cannot be inspected.
+        """
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        if psutil is None or process is None:
+            return None
+        try:
+            root = psutil.Process(process.pid)
+            return sum(member.memory_info().rss for member in [root, *root.children(recursive=True)]) / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    def clear_cookies(self):
+        """Logs the session out of every site by clearing all of the browser's cookies."""
+        self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self.account = None
+
+    def quit(self):
+        """Closes the browser, ignoring sessions that already crashed."""
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserSessionPool:
+    """
+    Keeps browser sessions launched between jobs and leases them out one job at a time.
+
+    Returned sessions are reset (extra tabs closed, blank page) and kept for the next job. Sessions that stop
+    responding, ran `max_jobs` jobs or grew beyond `max_memory_mb` are replaced by fresh ones. Idle sessions
+    are health-checked every `health_interval` seconds.
+    """
+
+    def __init__(self, driver_factory: Callable[[], WebDriver],
+                 logger: logging.Logger,
+                 size: int = 2,
+                 warmup: Callable[[WebDriver], str] = None,
+                 max_jobs: int = 25,
+                 max_memory_mb: float = None,
+                 health_interval: float = 60):
+        """
+        Initializes the BrowserSessionPool.
+
+        Args:
+            driver_factory (Callable[[], WebDriver]): Creates a new WebDriver instance.
+            logger (logging.Logger): The logger for output messages.
+            size (int, optional): The number of sessions kept. Defaults to 2.
+            warmup (Callable[[WebDriver], str], optional): Prepares a new session, e.g. restores a stored login, and
+                returns the account it is authenticated as (or None). Defaults to None.
+            max_jobs (int, optional): Jobs a session runs before it is replaced. Defaults to 25.
+            max_memory_mb (float, optional): Browser memory above which a session is replaced (requires psutil). Defaults to None.
+            health_interval (float, optional): Seconds between health checks of idle sessions. Defaults to 60.
+        """
+        self.driver_factory = driver_factory
+        self.logger = logger
+        self.size = size
+        self.warmup = warmup
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.health_interval = health_interval
+        self.recycled = 0
+        self._idle = []
+        self._leased = set()
+        self._next_id = 1
+        self._available = threading.Condition()
+        self._stop = threading.Event()
+        self._health_thread = None
+        if max_memory_mb and psutil is None:
+            logger.warning("psutil is not installed, sessions are not recycled by memory use.")
+
+    def start(self):
+        """Launches the sessions in parallel and starts the health checks."""
+        self._stop.clear()
+        with ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="session-launch") as executor:
+            launches = [executor.submit(self._launch) for _ in range(self.size)]
+        sessions = []
+        for launch in launches:
+            try:
+                sessions.append(launch.result())
+            except Exception as e:
+                self.logger.error(f"Failed to start browser session: {e}")
+        if not sessions:
+            raise Exception("No browser session could be started.")
+        with self._available:
+            self._idle.extend(sessions)
+            self._available.notify_all()
+        self._health_thread = threading.Thread(target=self._check_health, name="session-health", daemon=True)
+        self._health_thread.start()
+        self.logger.info(f"Browser pool ready with {len(sessions)} sessions.")
+
+    @contextmanager
+    def lease(self, account: str = None, timeout: float = None):
+        """
+        Leases a session for the duration of the block, preferring one already authenticated as `account`.
+
+        Args:
+            account (str, optional): The account the job runs as. Defaults to None.
+            timeout (float, optional): Maximum seconds to wait for a free session. Defaults to None (no limit).
+
+        Yields:
+            PooledSession: The leased session.
+
+        Raises:
+            TimeoutError: If no session became free within the timeout.
+        """
+        session = self._acquire(account, timeout)
+        try:
+            yield session
+        finally:
+            self._release(session)
+
+    def stop(self):
+        """Stops the health checks and closes every session."""
+        self._stop.set()
+        if self._health_thread:
+            self._health_thread.join()
+            self._health_thread = None
+        with self._available:
+            sessions = self._idle + list(self._leased)
+            self._idle.clear()
+            self._leased.clear()
+        for session in sessions:
+            session.quit()
+        self.logger.info("Browser pool stopped.")
+
+    def stats(self) -> dict:
+        """
+        Describes the pool.
+
+        Returns:
+            dict: The number of idle and leased sessions and of sessions replaced so far.
+        """
+        with self._available:
+            return {"size": self.size, "idle": len(self._idle), "leased": len(self._leased), "recycled": self.recycled}
+
+    def _launch(self) -> PooledSession:
+        """Starts and warms up a new session."""
+        with self._available:
+            session_id = self._next_id
+            self._next_id += 1
+        session = PooledSession(session_id, self.driver_factory())
+        if self.warmup:
+            try:
+                session.account = self.warmup(session.driver)
+            except Exception as e:
+                self.logger.warning(f"Warm-up of session {session_id} failed: {e}")
+        return session
+
+    def _acquire(self, account: str, timeout: float) -> PooledSession:
+        """Takes an idle session, replacing it if it stopped responding."""
+        with self._available:
+            if not self._available.wait_for(lambda: self._idle, timeout=timeout):
+                raise TimeoutError("No browser session became free.")
+            session = next((idle for idle in self._idle if account and idle.account == account), self._idle[0])
+            self._idle.remove(session)
+            self._leased.add(session)
+        if not is_alive(session.driver):
+            try:
+                session = self._replace(session, "stopped responding")
+            except Exception as e:
+                self.logger.error(f"Failed to replace browser session: {e}")
+                with self._available:
+                    self._leased.discard(session)
+                raise
+        if session.account is not None and session.account != account:
+            session.clear_cookies()
+        return session
+
+    def _release(self, session: PooledSession):
+        """Resets a session and returns it to the pool, or replaces it when it is worn out."""
+        session.jobs += 1
+        reason = None
+        memory = session.memory_mb()
+        if not is_alive(session.driver):
+            reason = "stopped responding"
+        elif session.jobs >= self.max_jobs:
+            reason = f"ran {session.jobs} jobs"
+        elif self.max_memory_mb and memory and memory > self.max_memory_mb:
+            reason = f"uses {memory:.0f} MB"
+        else:
+            try:
+                self._reset(session.driver)
+            except Exception as e:
+                reason = f"could not be reset ({e})"
+        if reason:
+            try:
+                session = self._replace(session, reason)
+            except Exception as e:
+                self.logger.error(f"Failed to replace browser session: {e}")
+                with self._available:
+                    self._leased.discard(session)
+                return
+        with self._available:
+            self._leased.discard(session)
+            self._idle.append(session)
+            self._available.notify()
+
+    def _replace(self, session: PooledSession, reason: str) -> PooledSession:
+        """Closes a session and launches its replacement, which takes over its place in the leased set."""
+        self.logger.warning(f"Replacing browser session {session.id}: {reason}.")
+        session.quit()
+        replacement = self._launch()
+        with self._available:
+            self._leased.discard(session)
+            self._leased.add(replacement)
+            self.recycled += 1
+        return replacement
+
+    @staticmethod
+    def _reset(driver: WebDriver):
+        """Closes every tab but the first and leaves the remaining one on a blank page."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+
+    def _check_health(self):
+        """Replaces idle sessions that stopped responding, until the pool is stopped."""
+        while not self._stop.wait(self.health_interval):
+            with self._available:
+                idle = list(self._idle)
+            for session in idle:
+                with self._available:
+                    if session not in self._idle:
+                        continue
+                    self._idle.remove(session)
+                    self._leased.add(session)
+                # Leased while checked, so no job picks it up
+                self._release_checked(session)
+
+    def _release_checked(self, session: PooledSession):
+        """Returns a health-checked session to the idle list, replacing it if it stopped responding."""
+        if not is_alive(session.driver):
+            try:
+                session = self._replace(session, "stopped responding")
+            except Exception as e:
+                self.logger.error(f"Failed to replace browser session: {e}")
+                with self._available:
+                    self._leased.discard(session)
+                return
+        with self._available:
+            self._leased.discard(session)
+            self._idle.append(session)
+            self._available.notify()
+
+
+class JobDaemon(ThreadingHTTPServer):
+    """
+    Accepts campaign jobs over a local HTTP endpoint and runs them on sessions leased from a BrowserSessionPool.
+
+    Endpoints:
+        POST /jobs        Queues a job; the body is a JSON object of CampaignJob fields. Returns its id.
+        GET  /jobs        Lists the jobs.
+        GET  /jobs/<id>   Gets a job's status and result.
+        GET  /health      Describes the pool.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pool: BrowserSessionPool,
+                 run_job: Callable[[WebDriver, CampaignJob], dict],
+                 logger: logging.Logger,
+                 defaults: dict = None,
+                 host: str = "127.0.0.1",
+                 port: int = 8765,
+                 token: str = None):
+        """
+        Initializes the JobDaemon.
+
+        Args:
+            pool (BrowserSessionPool): The started pool the jobs run on.
+            run_job (Callable[[WebDriver, CampaignJob], dict]): Runs a job on a leased driver and returns its statistics,
+                as expected by `execute_job`.
+            logger (logging.Logger): The logger for output messages.
+            defaults (dict, optional): Job settings used where a submitted job does not set them. Defaults to None.
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1" (local only).
+            port (int, optional): The port to listen on. Defaults to 8765.
+            token (str, optional): If set, requests must send it as "Authorization: Bearer <token>". Defaults to None.
+        """
+        super().__init__((host, port), JobRequestHandler)
+        self.pool = pool
+        self.run_job = run_job
+        self.logger = logger
+        self.defaults = defaults or {}
+        self.token = token
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="daemon-job")
+
+    def submit(self, values: dict) -> str:
+        """
+        Queues a job.
+
+        Args:
+            values (dict): The job's settings.
+
+        Returns:
+            str: The job's id.
+
+        Raises:
+            ValueError: If the settings do not make a valid job.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        job = separate_paths(make_job(values, self.defaults, name=f"job-{job_id}"), self.defaults)
+        with self._lock:
+            self.jobs[job_id] = {"id": job_id, "name": job.name, "status": JOB_QUEUED, "submitted_at": time.time(), "result": None}
+        self._executor.submit(self._run, job_id, job)
+        self.logger.info(f"Queued job '{job.name}' ({job_id}).")
+        return job_id
+
+    def job(self, job_id: str) -> dict:
+        """Gets a copy of a job's record, or None for an unknown id."""
+        with self._lock:
+            record = self.jobs.get(job_id)
+            return dict(record) if record else None
+
+    def close(self):
+        """Stops accepting requests and waits for the running jobs."""
+        self.shutdown()
+        self.server_close()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job_id: str, job: CampaignJob):
+        """Runs a job on a leased session and stores its result."""
+        try:
+            with self.pool.lease(job.account) as session:
+                with self._lock:
+                    self.jobs[job_id]["status"] = JOB_RUNNING
+                result = execute_job(job, lambda job: self.run_job(session.driver, job), self.logger.getChild(job.name))
+                # The login is only kept for jobs that restore it from a session cache; other jobs log in through the form
+                if job.session_cache_path and result.details.pop("authenticated", False):
+                    session.account = job.account
+                else:
+                    result.details.pop("authenticated", None)
+                    try:
+                        session.clear_cookies()
+                    except Exception as e:
+                        self.logger.warning(f"Could not clear the cookies of session {session.id}: {e}")
+        except Exception as e:
+            self.logger.error(f"Job '{job.name}' could not get a browser session: {e}")
+            result = JobResult(job.name, STATUS_FAILED, time.time(), 0.0, error=str(e))
+        with self._lock:
+            self.jobs[job_id].update(status=result.status, result=asdict(result))
+        self.logger.info(f"Job '{job.name}' {result.status} in {result.duration:.1f}s.")
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of a JobDaemon."""
+
+    server: JobDaemon
+
+    def log_message(self, format, *args):
+        self.server.logger.debug(format % args)
+
+    def do_GET(self):
+        if not self.authorized():
+            return
+        if self.path == "/health":
+            return self.send_json(200, self.server.pool.stats())
+        if self.path == "/jobs":
+            with self.server._lock:
+                return self.send_json(200, list(self.server.jobs.values()))
+        if self.path.startswith("/jobs/"):
+            record = self.server.job(self.path[len("/jobs/"):])
+            return self.send_json(200, record) if record else self.send_json(404, {"error": "Unknown job"})
+        self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if not self.authorized():
+            return
+        if self.path != "/jobs":
+            return self.send_json(404, {"error": "Not found"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            values = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(values, dict):
+                raise ValueError("The job must be a JSON object.")
+            job_id = self.server.submit(values)
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+        self.send_json(202, {"id": job_id, "status": JOB_QUEUED})
+
+    def authorized(self) -> bool:
+        """Checks the bearer token, answering 401 if it does not match."""
+        if not self.server.token:
+            return True
+        if hmac.compare_digest(self.headers.get("Authorization", ""), f"Bearer {self.server.token}"):
+            return True
+        self.send_json(401, {"error": "Unauthorized"})
+        return False
+
+    def send_json(self, status: int, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.pages.scripts import TRANSFER_STATS_SCRIPT, RESOURCE_TIMING_BUFFER_SCRIPT
+from src.patterns.facade import SeleniumFacade
+
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "connect.facebook.net",
+    "static.hotjar.com",
+    "clarity.ms",
+)
+# URL patterns blocked through the DevTools protocol, by category.
+# Fonts are blocked by host so the site's own icon fonts (e.g. the popup's close icon) keep loading.
+BLOCKED_URL_PATTERNS = {
+    "images": ("*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.ico"),
+    "media": ("*.mp4", "*.webm", "*.mov", "*.mp3", "*.m3u8", "*youtube.com/embed*", "*player.vimeo.com*"),
+    "fonts": ("*fonts.googleapis.com*", "*fonts.gstatic.com*", "*use.typekit.net*"),
+    "trackers": tuple(f"*{host}*" for host in TRACKER_HOSTS),
+}
+
+
+class BrowserProfile:
+    """A named set of Chrome options and network rules trading rendering fidelity for speed."""
+
+    def __init__(self, name: str,
+                 headless: bool = False,
+                 block: tuple = (),
+                 disable_extensions: bool = False,
+                 disable_gpu: bool = False,
+                 page_load_strategy: str = "normal",
+                 arguments: tuple = ()):
+        """
+        Initializes the BrowserProfile.
+
+        Args:
+            name (str): The profile's name, as selected with BROWSER_PROFILE.
+            headless (bool, optional): Run Chrome without a window. Defaults to False.
+            block (tuple, optional): Categories of BLOCKED_URL_PATTERNS whose requests are blocked. Defaults to ().
+            disable_extensions (bool, optional): Start Chrome without extensions. Defaults to False.
+            disable_gpu (bool, optional): Disable GPU acceleration. Defaults to False.
+            page_load_strategy (str, optional): "normal", "eager" (return at DOMContentLoaded) or "none". Defaults to "normal".
+            arguments (tuple, optional): Additional Chrome command line arguments. Defaults to ().
+        """
+        unknown = set(block) - set(BLOCKED_URL_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown blocked categories: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.headless = headless
+        self.block = tuple(block)
+        self.disable_extensions = disable_extensions
+        self.disable_gpu = disable_gpu
+        self.page_load_strategy = page_load_strategy
+        self.arguments = tuple(arguments)
+
+    @property
+    def blocked_urls(self) -> list[str]:
+        """The URL patterns blocked by this profile."""
+        return [pattern for category in self.block for pattern in BLOCKED_URL_PATTERNS[category]]
+
+    def apply_options(self, options: Options) -> Options:
+        """
+        Adds the profile's settings to the Chrome options a driver is created with.
+
+        Images and trackers are also blocked browser-wide here (content settings and host resolver rules),
+        so tabs opened later are covered as well.
+
+        Args:
+            options (Options): The Chrome options to extend.
+
+        Returns:
+            Options: The same options, for chaining.
+        """
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.disable_extensions:
+            options.add_argument("--disable-extensions")
+        if self.disable_gpu:
+            options.add_argument("--disable-gpu")
+        if "images" in self.block:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if "trackers" in self.block:
+            rules = ", ".join(f"MAP {host} ~NOTFOUND, MAP *.{host} ~NOTFOUND" for host in TRACKER_HOSTS)
+            options.add_argument(f"--host-resolver-rules={rules}")
+        for argument in self.arguments:
+            options.add_argument(argument)
+        options.page_load_strategy = self.page_load_strategy
+        return options
+
+    def apply(self, driver: WebDriver):
+        """
+        Installs the profile's network rules on a started driver.
+        The rules apply to the driver's current tab; tabs opened later only get the browser-wide rules of `apply_options`.
+
+        Args:
+            driver (WebDriver): The Chrome WebDriver instance created with `apply_options`.
+        """
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RESOURCE_TIMING_BUFFER_SCRIPT})
+        if self.blocked_urls:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+
+
+PROFILES = {
+    # The browser as it always ran: visible, loading everything
+    "default": BrowserProfile("default", arguments=("--verbose",)),
+    "headless": BrowserProfile("headless", headless=True, disable_gpu=True),
+    "lean": BrowserProfile(
+        "lean",
+        headless=True,
+        block=("images", "media", "fonts", "trackers"),
+        disable_extensions=True,
+        disable_gpu=True,
+        page_load_strategy="eager",
+        arguments=("--mute-audio", "--autoplay-policy=user-gesture-required"),
+    ),
+}
+# The profile the savings of the others are measured against: headless, but loading every resource
+BASELINE_PROFILE = "headless"
+
+
+def get_profile(name: str) -> BrowserProfile:
+    """
+    Gets a browser profile by name.
+
+    Args:
+        name (str): One of the PROFILES names.
+
+    Returns:
+        BrowserProfile: The profile.
+
+    Raises:
+        ValueError: If there is no profile with that name.
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown browser profile '{name}', expected one of {', '.join(PROFILES)}") from None
+
+
+def measure_transfer(selenium_facade: SeleniumFacade) -> dict:
+    """
+    Measures the network transfer of the current page since it was loaded, including
+    everything fetched while scrolling it.
+
+    Args:
+        selenium_facade (SeleniumFacade): The SeleniumFacade instance for interacting with the browser.
+
+    Returns:
+        dict: The number of requests and the transferred (compressed) and decoded bytes.
+    """
+    stats = selenium_facade.execute_script(TRANSFER_STATS_SCRIPT)
+    return {"requests": int(stats["requests"]), "transferred_bytes": int(stats["transferred"]), "decoded_bytes": int(stats["decoded"])}
+
+
+def compare_transfer(path: str, profile: BrowserProfile, stats: dict, logger: logging.Logger) -> dict:
+    """
+    Records a profile's transfer in a file keeping the last transfer of every profile, and logs its savings
+    against the last transfer recorded with BASELINE_PROFILE. The comparison only holds for runs with the same filters.
+
+    Args:
+        path (str): The JSON file of transfers by profile name.
+        profile (BrowserProfile): The profile the transfer was measured with.
+        stats (dict): The transfer, as returned by `measure_transfer`.
+        logger (logging.Logger): The logger for output messages.
+
+    Returns:
+        dict: The requests and bytes saved against the baseline, or an empty dict if there is no baseline to compare with.
+    """
+    transfers = {}
+    try:
+        with open(path, encoding="utf-8") as file:
+            transfers = json.load(file)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read recorded transfers, starting over: {e}")
+    transfers[profile.name] = stats
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(transfers, file, indent=2)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not record the transfer: {e}")
+
+    baseline = transfers.get(BASELINE_PROFILE)
+    if profile.name == BASELINE_PROFILE or not baseline or not baseline.get("transferred_bytes"):
+        return {}
+    saved = {
+        "baseline": BASELINE_PROFILE,
+        "saved_requests": baseline["requests"] - stats["requests"],
+        "saved_bytes": baseline["transferred_bytes"] - stats["transferred_bytes"],
+    }
+    saved["saved_percent"] = round(saved["saved_bytes"] / baseline["transferred_bytes"] * 100, 1)
+    logger.info(f"The '{profile.name}' profile transferred {saved['saved_bytes'] / 1024:.0f} KB ({saved['saved_percent']}%) "
+                f"and {saved['saved_requests']} requests less than the last run with the '{BASELINE_PROFILE}' profile.")
+    return saved
+
+
+def log_transfer(selenium_facade: SeleniumFacade, profile: BrowserProfile, logger: logging.Logger, path: str = None) -> dict:
+    """
+    Logs the network transfer of the current page under the given profile.
+
+    Args:
+        selenium_facade (SeleniumFacade): The SeleniumFacade instance for interacting with the browser.
+        profile (BrowserProfile): The profile the browser runs with.
+        logger (logging.Logger): The logger for output messages.
+        path (str, optional): Records the transfer there and compares it with the baseline profile's (see `compare_transfer`). Defaults to None.
+
+    Returns:
+        dict: The measured transfer, with the savings against the baseline profile if compared, or an empty dict if it could not be measured.
+    """
+    try:
+        stats = measure_transfer(selenium_facade)
+    except Exception as e:
+        logger.warning(f"Could not measure network transfer: {e}")
+        return {}
+    logger.info(f"Page transferred {stats['transferred_bytes'] / 1024:.0f} KB in {stats['requests']} requests "
+                f"({stats['decoded_bytes'] / 1024:.0f} KB decoded) with the '{profile.name}' browser profile.")
+    if path:
+        return {**stats, **compare_transfer(path, profile, stats, logger)}
+    return stats
@@ -0,0 +1,333 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, fields, replace
+from typing import Callable
+
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+# Files kept per account (logins, sent members, details pages fetched with the account's session)
+ACCOUNT_PATHS = ("session_cache_path", "ledger_path", "detail_cache_path")
+# Files a single job writes and replaces
+JOB_PATHS = ("export_path", "checkpoint_path")
+
+
+@dataclass
+class CampaignJob:
+    """The configuration of one campaign: an account, its filters and its message."""
+
+    name: str
+    username: str
+    password: str
+    message: str
+    min_age: int
+    max_age: int
+    login_url: str
+    cards_url: str
+    members_url: str
+    card_strategy: str = "standard"
+    target_cards: int = None
+    max_scroll_time: float = None
+    workers: int = 0
+    shards: int = None
+    shard_stats_path: str = None
+    session_cache_path: str = None
+    ledger_path: str = None
+    cache_elements: bool = False
+    reuse_detail_tab: bool = False
+    send_rate: float = 20
+    send_burst: int = 3
+    export_path: str = None
+    detail_cache_path: str = None
+    snapshot_parser: str = "script"
+    prune_dom: bool = False
+    checkpoint_path: str = None
+    max_failures: int = 5
+    wait_mode: str = "observer"
+    poll_interval: float = 0.5
+
+    @property
+    def account(self) -> str:
+        """The account the job runs as; jobs of one account are scheduled one after another."""
+        return self.username
+
+
+@dataclass
+class JobResult:
+    """The outcome of running a campaign job."""
+
+    name: str
+    status: str
+    started_at: float
+    duration: float
+    sent: int = 0
+    failed: int = 0
+    error: str = None
+    details: dict = field(default_factory=dict)
+
+
+def make_job(values: dict, defaults: dict = None, name: str = "job") -> CampaignJob:
+    """
+    Creates a job from its settings.
+
+    Args:
+        values (dict): The job's settings, named like the CampaignJob fields.
+        defaults (dict, optional): Settings used where `values` does not set them. Defaults to None.
+        name (str, optional): The job's name if `values` does not set one. Defaults to "job".
+
+    Returns:
+        CampaignJob: The job.
+
+    Raises:
+        ValueError: If a setting is unknown or a required one is missing.
+    """
+    values = {**(defaults or {}), **values}
+    values.setdefault("name", name)
+    unknown = set(values) - {job_field.name for job_field in fields(CampaignJob)}
+    if unknown:
+        raise ValueError(f"Job '{values['name']}' has unknown fields: {', '.join(sorted(unknown))}")
+    try:
+        return CampaignJob(**values)
+    except TypeError as e:
+        raise ValueError(f"Job '{values['name']}' is incomplete: {e}") from e
+
+
+def scoped_path(path: str, scope: str) -> str:
+    """
+    Inserts a scope before a path's extension, e.g. ledger.sqlite3 -> ledger.alice.sqlite3.
+
+    Args:
+        path (str): The shared path.
+        scope (str): The account or the job the path is for.
+
+    Returns:
+        str: The scoped path.
+    """
+    root, extension = os.path.splitext(path)
+    return f"{root}.{re.sub(r'[^A-Za-z0-9_.-]+', '_', scope or 'default')}{extension}"
+
+
+def separate_paths(job: CampaignJob, defaults: dict) -> CampaignJob:
+    """
+    Gives a job its own copy of the paths it inherits from `defaults`: one per account for the session
+    cache, the ledger and the detail cache, one per job for the export and the checkpoint.
+    Paths the job sets itself are kept.
+
+    Args:
+        job (CampaignJob): The job.
+        defaults (dict): The settings the job was created with.
+
+    Returns:
+        CampaignJob: The job with its own paths.
+    """
+    changes = {}
+    for name in ACCOUNT_PATHS + JOB_PATHS:
+        path = getattr(job, name)
+        if path and path == defaults.get(name):
+            changes[name] = scoped_path(path, job.account if name in ACCOUNT_PATHS else job.name)
+    return replace(job, **changes)
+
+
+def check_paths(jobs: list[CampaignJob]):
+    """
+    Checks that no file is shared by jobs of different accounts, and that no export or checkpoint is shared at all.
+
+    Args:
+        jobs (list[CampaignJob]): The jobs of a campaign.
+
+    Raises:
+        ValueError: If a path is shared.
+    """
+    for name in ACCOUNT_PATHS + JOB_PATHS:
+        owners = {}
+        for job in jobs:
+            path = getattr(job, name)
+            if not path:
+                continue
+            owner = job.account if name in ACCOUNT_PATHS else job.name
+            if owners.setdefault(path, owner) != owner:
+                shared_by = "accounts" if name in ACCOUNT_PATHS else "jobs"
+                raise ValueError(f"Job '{job.name}' shares the {name} {path} with other {shared_by}.")
+
+
+def execute_job(job: CampaignJob, run_job: Callable[[CampaignJob], dict], logger: logging.Logger) -> JobResult:
+    """
+    Runs a job, turning its statistics or its error into a result.
+
+    Args:
+        job (CampaignJob): The job to run.
+        run_job (Callable[[CampaignJob], dict]): Runs the job and returns "completed" (bool), "sent" and "failed" (int)
+            and "error" (str, optional); any other keys are kept as details.
+        logger (logging.Logger): The logger for output messages.
+
+    Returns:
+        JobResult: The job's result.
+    """
+    started = time.time()
+    try:
+        stats = dict(run_job(job) or {})
+    except Exception as e:
+        logger.error(f"Job '{job.name}' failed: {e}")
+        return JobResult(job.name, STATUS_FAILED, started, time.time() - started, error=str(e))
+    completed = stats.pop("completed", False)
+    return JobResult(
+        job.name,
+        STATUS_SUCCEEDED if completed else STATUS_FAILED,
+        started,
+        time.time() - started,
+        sent=stats.pop("sent", 0),
+        failed=stats.pop("failed", 0),
+        error=stats.pop("error", None),
+        details=stats,
+    )
+
+
+def load_campaign(path: str, defaults: dict = None) -> list[CampaignJob]:
+    """
+    Reads a campaign file.
+
+    The file is a JSON object with a "jobs" list and optional "defaults" shared by every job:
+
+        {"defaults": {"message": "...", "card_strategy": "bulk"},
+         "jobs": [{"name": "young", "min_age": 20, "max_age": 30}, ...]}
+
+    Paths inherited from the defaults are separated per account or per job (see `separate_paths`).
+
+    Args:
+        path (str): The campaign file.
+        defaults (dict, optional): Values used where neither the job nor the file's defaults set one,
+            e.g. the settings of the environment. Defaults to None.
+
+    Returns:
+        list[CampaignJob]: The campaign's jobs, in file order.
+
+    Raises:
+        ValueError: If a job sets an unknown field, misses a required one or shares a path it must not share.
+    """
+    with open(path, encoding="utf-8") as file:
+        campaign = json.load(file)
+    defaults = {**(defaults or {}), **campaign.get("defaults", {})}
+    jobs = [separate_paths(make_job(entry, defaults, f"job-{number}"), defaults)
+            for number, entry in enumerate(campaign.get("jobs", []), start=1)]
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("Job names in a campaign must be unique.")
+    check_paths(jobs)
+    return jobs
+
+
+class CampaignRunner:
+    """
+    Runs campaign jobs concurrently under a global limit.
+
+    Jobs are scheduled round-robin across accounts, so a campaign with many jobs for one account does not
+    starve the others, and at most `per_account` jobs of an account run at the same time (which also lets
+    later jobs of an account reuse the session cached by the first one). A failing job is recorded in the
+    results and does not affect the others.
+    """
+
+    def __init__(self, run_job: Callable[[CampaignJob], dict], logger: logging.Logger, concurrency: int = 2, per_account: int = 1):
+        """
+        Initializes the CampaignRunner.
+
+        Args:
+            run_job (Callable[[CampaignJob], dict]): Runs a job to completion in its own browser session and returns its
+                statistics: "completed" (bool), "sent" and "failed" (int) and "error" (str, optional); any other keys
+                are kept as details.
+            logger (logging.Logger): The logger for output messages.
+            concurrency (int, optional): The maximum number of jobs running at the same time. Defaults to 2.
+            per_account (int, optional): The maximum number of jobs of one account running at the same time. Defaults to 1.
+        """
+        self.run_job = run_job
+        self.logger = logger
+        self.concurrency = max(1, concurrency)
+        self.per_account = max(1, per_account)
+        self._stop = threading.Event()
+
+    def run(self, jobs: list[CampaignJob]) -> list[JobResult]:
+        """
+        Runs every job and waits for all of them.
+
+        Args:
+            jobs (list[CampaignJob]): The jobs to run.
+
+        Returns:
+            list[JobResult]: One result per job, in the order of `jobs`.
+        """
+        pending = OrderedDict()
+        for job in jobs:
+            pending.setdefault(job.account, deque()).append(job)
+        running = {account: 0 for account in pending}
+        limit = len(pending) * self.per_account
+        if self.concurrency > limit:
+            self.logger.warning(f"Only {limit} of {self.concurrency} jobs can run at a time: {len(pending)} account(s), "
+                                f"{self.per_account} job(s) per account.")
+        results = {}
+        self._stop.clear()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="campaign") as executor:
+            futures = {}
+            while pending or futures:
+                while len(futures) < self.concurrency and not self._stop.is_set():
+                    job = self._next_job(pending, running)
+                    if job is None:
+                        break
+                    running[job.account] += 1
+                    self.logger.info(f"Starting job '{job.name}' ({len(futures) + 1} running).")
+                    futures[executor.submit(execute_job, job, self.run_job, self.logger)] = job
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = futures.pop(future)
+                    running[job.account] -= 1
+                    results[job.name] = future.result()
+                    self.logger.info(f"Job '{job.name}' {results[job.name].status} in {results[job.name].duration:.1f}s.")
+
+        for job in jobs:
+            if job.name not in results:
+                results[job.name] = JobResult(job.name, STATUS_FAILED, time.time(), 0.0, error="Not started, campaign stopped.")
+        return [results[job.name] for job in jobs]
+
+    def stop(self):
+        """Starts no further jobs; running jobs are finished."""
+        self._stop.set()
+
+    def _next_job(self, pending: OrderedDict, running: dict) -> CampaignJob:
+        """Takes the next job of the first account with a free slot, then moves that account to the back of the rotation."""
+        for account in list(pending):
+            if running[account] >= self.per_account:
+                continue
+            queue = pending[account]
+            job = queue.popleft()
+            if queue:
+                pending.move_to_end(account)
+            else:
+                del pending[account]
+            return job
+        return None
+
+    @staticmethod
+    def summarize(results: list[JobResult]) -> dict:
+        """
+        Aggregates job results.
+
+        Args:
+            results (list[JobResult]): The results returned by `run`.
+
+        Returns:
+            dict: Totals over all jobs and every job's result.
+        """
+        return {
+            "jobs": len(results),
+            "succeeded": sum(result.status == STATUS_SUCCEEDED for result in results),
+            "failed": sum(result.status == STATUS_FAILED for result in results),
+            "sent": sum(result.sent for result in results),
+            "failed_cards": sum(result.failed for result in results),
+            "results": [asdict(result) for result in results],
+        }
@@ -1,8 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Callable
-from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.remote.webdriver import WebDriver
-from src.pages.pageobjects.card import Card
+from src.pages.pageobjects.card import Card, CardRecord
 
 
 class CardCollectionStrategy(ABC):
@@ -20,12 +19,12 @@ class CardCollectionStrategy(ABC):
             driver (webdriver): The Selenium WebDriver instance.
 
         Returns:
-            list: A list of card WebElements.
+            list: The collected CardRecords, or a generator yielding them as they load.
         """
         pass
 
     @abstractmethod
-    def iterate_through_cards(self, driver: WebDriver, cards: list[WebElement], card_processing_function: Callable[[WebDriver, Card, str], None], message: str):
+    def iterate_through_cards(self, driver: WebDriver, cards: list[CardRecord], card_processing_function: Callable[[WebDriver, Card, str], None], message: str):
         """Iterates through the collected cards and applies the provided processing function."""
         pass
 
@@ -35,71 +34,449 @@ class CardCollectionStrategy(ABC):
         pass
 
 # from .card_collection_strategy import CardCollectionStrategy
+import os
+import json
 import time
+import queue
 import logging
+import threading
+from collections import Counter
+from dataclasses import replace
+from concurrent.futures import as_completed
+from selenium.common.exceptions import NoSuchWindowException, TimeoutException
 
 from src.pages.xpaths import *
-from src.patterns.facade import SeleniumFacade
+from src.pages.scripts import *
+from src.patterns.facade import SeleniumFacade, LocatorPreflightError
 from src.patterns.cards_strategy import CardCollectionStrategy
+from src.patterns.http_engine import HttpEngine, HttpFallback, HttpSendError, HttpRejected
+from src.patterns.ledger import CardLedger, OUTCOME_SENT, OUTCOME_FAILED, OUTCOME_UNKNOWN
+from src.patterns.rate_limiter import SendRateLimiter
+from src.patterns.export import ProfileWriter, ProfileRecord, parse_age
+from src.patterns.detail_cache import DetailCache
+from src.patterns.html_snapshot import CardListParser, extract_fields
+
+
+def plan_age_shards(min_age: int, max_age: int, shards: int, counts: dict = None) -> list[tuple[int, int]]:
+    """
+    Splits an age range into contiguous sub-ranges.
+
+    Without counts every sub-range spans about the same number of ages; with counts the ranges are cut so
+    each one holds about the same number of cards, so popular ages get narrower shards.
+
+    Args:
+        min_age (int): The minimum age of the range.
+        max_age (int): The maximum age of the range.
+        shards (int): The number of sub-ranges, at most one per age.
+        counts (dict, optional): The number of cards observed per age. Defaults to None.
+
+    Returns:
+        list[tuple[int, int]]: The (min_age, max_age) of each sub-range, in ascending order.
+    """
+    ages = range(min_age, max_age + 1)
+    shards = max(1, min(shards, len(ages)))
+    # Ages never observed still weigh one card, so they are not all lumped into one shard
+    weights = [max(1, (counts or {}).get(age, 0)) for age in ages]
+    total = sum(weights)
+    ranges = []
+    start = min_age
+    cumulative = 0
+    for age, weight in zip(ages, weights):
+        cumulative += weight
+        remaining_ages = max_age - age
+        remaining_shards = shards - len(ranges) - 1
+        if remaining_shards > 0 and (cumulative >= total * (len(ranges) + 1) / shards or remaining_ages == remaining_shards):
+            ranges.append((start, age))
+            start = age + 1
+    ranges.append((start, max_age))
+    return ranges
 
 class StandardCardCollection(CardCollectionStrategy):
-    """Collects cards by scrolling and finding them using a specific XPath."""
+    """
+    Collects cards by scrolling and extracting them using a specific XPath, then clicks through each card.
+    With `prune_dom`, cards are opened from their recorded links instead, as their elements are pruned while scrolling.
+    """
 
-    def __init__(self, selenium_facade: SeleniumFacade, logger: logging.Logger):
+    def __init__(self, selenium_facade: SeleniumFacade, 
+                 logger: logging.Logger, 
+                 target_count: int = None, 
+                 max_scroll_time: float = None, 
+                 batch_timeout: float = 10, 
+                 settle_time: float = 0.3, 
+                 idle_time: float = 2, 
+                 ledger: CardLedger = None,
+                 reuse_detail_tab: bool = False,
+                 rate_limiter: SendRateLimiter = None,
+                 confirm_timeout: float = 15,
+                 profile_writer: ProfileWriter = None,
+                 detail_cache: DetailCache = None,
+                 snapshot_parser: str = "script",
+                 prune_dom: bool = False):
         """
         Initializes the StandardCardCollection strategy.
 
         Args:
             selenium_facade (SeleniumFacade): The SeleniumFacade instance for interacting with the browser.
             logger (logging.Logger): The logger for output messages.
+            target_count (int, optional): Stop scrolling once this many cards are loaded. Defaults to None (load all).
+            max_scroll_time (float, optional): Maximum time in seconds to spend scrolling. Defaults to None (no limit).
+            batch_timeout (float, optional): Maximum time in seconds to wait for a single scroll step. Defaults to 10.
+            settle_time (float, optional): Time in seconds without DOM changes after which a batch is considered loaded. Defaults to 0.3.
+            idle_time (float, optional): Time in seconds without any request or DOM change after which the list is considered complete. Defaults to 2.
+            ledger (CardLedger, optional): Records processed cards so they are skipped on later runs. Defaults to None.
+            reuse_detail_tab (bool, optional): Open every details page in one persistent tab instead of a new tab per card. Defaults to False.
+            rate_limiter (SendRateLimiter, optional): Paces the submissions and adapts their rate to the site's responses. Defaults to None.
+            confirm_timeout (float, optional): Maximum time in seconds to wait for the site to confirm a submission. Defaults to 15.
+            profile_writer (ProfileWriter, optional): Exports a record of every processed profile. Defaults to None.
+            detail_cache (DetailCache, optional): Keeps details pages and their fields between runs. Defaults to None.
+            snapshot_parser (str, optional): Extract the loaded cards with a script in the browser ("script"), or parse
+                the list's HTML in-process with lxml ("html"). Defaults to "script".
+            prune_dom (bool, optional): Hollow out the list's elements of cards as soon as they are recorded, so the page's
+                size stays flat however long the list grows. Defaults to False.
         """
         self.selenium_facade = selenium_facade
         self.logger = logger
+        self.target_count = target_count
+        self.max_scroll_time = max_scroll_time
+        self.batch_timeout = batch_timeout
+        self.settle_time = settle_time
+        self.idle_time = idle_time
+        self.ledger = ledger
+        self.reuse_detail_tab = reuse_detail_tab
+        self.rate_limiter = rate_limiter
+        self.confirm_timeout = confirm_timeout
+        self.profile_writer = profile_writer
+        self.detail_cache = detail_cache
+        self.card_list_parser = None
+        if snapshot_parser == "html":
+            try:
+                self.card_list_parser = CardListParser()
+            except Exception as e:
+                self.logger.warning(f"Extracting cards by script instead of parsing the list's HTML: {e}")
+        elif snapshot_parser != "script":
+            raise ValueError(f"Unknown snapshot parser '{snapshot_parser}', expected 'script' or 'html'")
+        self.prune_dom = prune_dom
+        self.pruned_count = 0
+        self.dom_nodes = None
+        self.peak_dom_nodes = None
+        self.list_handle = None
+        self.detail_handle = None
+        self.scroll_steps = []
+        self.checked_locators = set()
+        self.outcomes = Counter()
+        self._outcomes_lock = threading.Lock()
+        # Ids of the cards processed by this run, or before it resumed; they are not processed again
+        self.processed_ids = set()
+        # Called after every processed card, e.g. to save a checkpoint
+        self.progress_callback = None
 
-    def collect_cards(self, driver: WebDriver):
-        """Collects all visible cards on the page after scrolling."""
+    def collect_cards(self, driver: WebDriver) -> list[CardRecord]:
+        """Collects a record for every loaded card after scrolling."""
         try:
-            self.scroll_to_load_all_cards(driver)
-            cards = self.selenium_facade.find_elements(CARDS_XPATH)
+            self.pruned_count = 0
+            if self.prune_dom:
+                # Record the cards of every scroll step and prune them before loading more
+                cards = []
+                for count in self.iter_scroll_steps(driver):
+                    if count > len(cards):
+                        cards.extend(self.snapshot_cards(len(cards)))
+                        self.prune_cards(len(cards))
+            else:
+                self.scroll_to_load_all_cards(driver)
+                cards = self.snapshot_cards()
             self.logger.info(f"Found {len(cards)} cards.")
             return cards
 
         except Exception as e:
             raise Exception(f"Error collecting cards: {e}")
 
-    def scroll_to_load_all_cards(self, driver: WebDriver):
-        """Scrolls down the page until all cards are loaded."""
+    def snapshot_cards(self, start: int = 0) -> list[CardRecord]:
+        """
+        Extracts the id, name and details link of the loaded cards in one browser round-trip.
+
+        Args:
+            start (int, optional): Index of the first card to extract. Defaults to 0.
+
+        Returns:
+            list[CardRecord]: The extracted card records.
+        """
+        if self.card_list_parser:
+            return self.parse_cards_html(start)
+        records = self.selenium_facade.execute_script(SNAPSHOT_CARDS_SCRIPT, CARDS_XPATH, CARD_NAME, CARD_BUTTON, start)
+        return [CardRecord(id=str(record["id"]) if record["id"] else None, name=record["name"], href=record["href"], index=record["index"])
+                for record in records]
+
+    def parse_cards_html(self, start: int = 0) -> list[CardRecord]:
+        """
+        Transfers the cards container's HTML once and parses the cards in-process.
+
+        Args:
+            start (int, optional): Index of the first card to extract. Defaults to 0.
+
+        Returns:
+            list[CardRecord]: The extracted card records.
+        """
+        html = self.selenium_facade.execute_script(OUTER_HTML_SCRIPT, self.card_list_parser.container_xpath)
+        if html is None:
+            raise Exception("Cards container not found.")
+        started = time.monotonic()
+        records = self.card_list_parser.parse(html, self.selenium_facade.driver.current_url, start)
+        self.logger.info(f"Parsed {len(records)} cards from {len(html) / 1024:.0f} KB of HTML in {time.monotonic() - started:.3f}s.")
+        return records
+
+    def prune_cards(self, end: int):
+        """
+        Hollows out the list's elements of the cards before `end` that are not pruned yet. The elements
+        keep their attributes and height, so card indexes, the scroll position and the site's lazy-loading
+        are unaffected, while their content no longer takes up memory or slows down queries.
+
+        Args:
+            end (int): The index after the last card to prune.
+        """
+        if end <= self.pruned_count:
+            return
+        try:
+            result = self.selenium_facade.execute_script(PRUNE_CARDS_SCRIPT, CARDS_XPATH, self.pruned_count, end)
+        except Exception as e:
+            self.logger.warning(f"Failed to prune cards: {e}")
+            return
+        self.pruned_count = end
+        self.count_dom_nodes(result["nodes"])
+        self.logger.debug(f"Pruned {result['pruned']} cards, {self.dom_nodes} DOM nodes left.")
+
+    def count_dom_nodes(self, nodes: int):
+        """Keeps the number of elements in the cards page, and its peak, as last reported by the browser."""
+        self.dom_nodes = int(nodes)
+        self.peak_dom_nodes = max(self.peak_dom_nodes or 0, self.dom_nodes)
+
+    def scroll_to_load_all_cards(self, driver: WebDriver) -> int:
+        """
+        Scrolls down the page until all cards are loaded.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+
+        Returns:
+            int: The number of cards loaded.
+        """
+        count = 0
+        for count in self.iter_scroll_steps(driver):
+            pass
+        return count
+
+    def iter_scroll_steps(self, driver: WebDriver):
+        """
+        Scrolls down the page step by step, yielding the number of loaded cards after each step.
+
+        Each scroll step waits inside the browser for new cards to be attached to the list
+        (or for the site's AJAX request to finish) instead of sleeping a fixed time.
+        The number of cards loaded by every step is kept in `scroll_steps`.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+
+        Yields:
+            int: The number of cards loaded so far.
+        """
         self.logger.info("Scrolling to load all cards...")
-        cards = []
+        self.scroll_steps = []
+        scroll_time = 0
+        count = 0
+        empty_steps = 0
         while True:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
-            new_cards = self.selenium_facade.find_elements(CARDS_XPATH)
-            if len(new_cards) == len(cards):
+            step_started = time.monotonic()
+            result = self.selenium_facade.execute_async_script(
+                WAIT_FOR_NEW_CARDS_SCRIPT,
+                CARDS_XPATH,
+                count,
+                int(self.batch_timeout * 1000),
+                int(self.settle_time * 1000),
+                int(self.idle_time * 1000),
+                timeout=self.batch_timeout + 5
+            )
+            loaded = int(result["count"]) - count
+            count = int(result["count"])
+            self.count_dom_nodes(result["nodes"])
+            step_time = time.monotonic() - step_started
+            scroll_time += step_time
+            self.scroll_steps.append({"step": len(self.scroll_steps) + 1, "loaded": loaded, "total": count, "seconds": round(step_time, 3)})
+            self.logger.info(f"Scroll step {len(self.scroll_steps)}: loaded {loaded} cards ({count} total, {self.dom_nodes} DOM nodes) in {step_time:.2f}s.")
+            yield count
+
+            if self.target_count and count >= self.target_count:
+                self.logger.info(f"Reached target of {self.target_count} cards.")
+                break
+            if self.max_scroll_time and scroll_time >= self.max_scroll_time:
+                self.logger.warning(f"Stopped scrolling after {self.max_scroll_time}s.")
                 break
-            cards = new_cards
-        self.logger.info("All cards loaded.")
+            empty_steps = empty_steps + 1 if loaded == 0 else 0
+            if empty_steps and (not result["pending"] or empty_steps >= 3):
+                break
+        self.logger.info(f"All cards loaded ({count}) in {scroll_time:.2f}s of scrolling.")
 
-    def iterate_through_cards(self, driver: WebDriver, cards: list[WebElement], card_processing_function: Callable[[WebDriver, Card, str], None], *args):
+    def iterate_through_cards(self, driver: WebDriver, cards: list[CardRecord], card_processing_function: Callable[[WebDriver, Card, str], None], *args):
         """Iterates through the collected cards and applies the provided processing function."""
-        for index, card_element in enumerate(cards):
-            card = Card(self.selenium_facade, card_element)
+        try:
+            for record in self.skip_processed(cards):
+                card = Card(self.selenium_facade, record)
+                try:
+                    self.logger.info(f"Processing card {card.index + 1}: {card.name}")
+
+                    # Apply the provided card processing function with any additional arguments 
+                    with self.selenium_facade.measure("card"):
+                        sent = card_processing_function(driver, card, *args)
+                    self.record_outcome(card.id, card.href, card.name, sent, *args)
+
+                except LocatorPreflightError:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Error processing card: {e}")
+                self.mark_processed(card)
+        finally:
+            self.close_detail_tab(driver)
+
+    def process_card(self, driver: WebDriver, card: Card, message: str):
+        """Opens the card's details tab, enters the message, and submits the form."""
+        if self.reuse_detail_tab and card.href:
             try:
-                self.logger.info(f"Processing card {index + 1}: {card.name}")
+                self.show_in_detail_tab(driver, card.href)
+                return self.handle_details(card, message)
+            finally:
+                self.selenium_facade.switch_to_window(self.list_handle)
 
-                # Apply the provided card processing function with any additional arguments 
-                card_processing_function(driver, card, *args)
+        self.open_details(driver, card)
 
-            except Exception as e:
-                self.logger.error(f"Error processing card: {e}")
+        self.selenium_facade.switch_to_window(driver.window_handles[-1])
+        try:
+            return self.handle_details(card, message)
+        finally:
+            driver.close()
+            self.selenium_facade.switch_to_window(driver.window_handles[0])
 
+    def handle_details(self, card: Card, message: str) -> bool:
+        """Acts on the card's details page once it is the current tab."""
+        fields = self.profile_fields(card) if self.profile_writer else None
+        sent = self.send_message(card.name, message)
 
-    def process_card(self, driver: WebDriver, card: Card, message: str):
-        """Clicks the "View" button, enters the message, and submits the form."""
+        # --- Your actions in the new tab ---
+        # ... (your code to extract data or interact with elements on the new page) ...
+
+        self.export_profile(card, sent, fields)
+        return sent
+
+    def profile_fields(self, card: CardRecord) -> dict:
+        """
+        Gets the details page fields of a card from the detail cache, or reads them from the current page and caches them.
+
+        Args:
+            card (CardRecord): The card whose details page is open.
+
+        Returns:
+            dict: The text of every field of PROFILE_FIELDS.
+        """
+        cached = self.detail_cache.get(card.href) if self.detail_cache and card.href else None
+        if cached and cached["fields"] is not None:
+            return cached["fields"]
+        fields = self.extract_fields()
+        if self.detail_cache and card.href and fields:
+            self.detail_cache.put(card.href, fields=fields)
+        return fields
+
+    def extract_fields(self) -> dict:
+        """
+        Reads the PROFILE_FIELDS of the current details page in one browser round-trip.
+
+        Returns:
+            dict: The text of every field (None if it was not found), or an empty dict if the page could not be read.
+        """
+        try:
+            return self.selenium_facade.execute_script(EXTRACT_FIELDS_SCRIPT, PROFILE_FIELDS)
+        except Exception as e:
+            self.logger.warning(f"Could not extract profile fields: {e}")
+            return {}
+
+    def export_profile(self, card: CardRecord, sent: bool, fields: dict = None):
+        """
+        Writes a profile's record to the export, if one is set.
+
+        Args:
+            card (CardRecord): The processed card.
+            sent (bool): Whether the message was sent.
+            fields (dict, optional): The details page fields read by `extract_fields`. Defaults to None.
+        """
+        if not self.profile_writer:
+            return
+        fields = dict(fields or {})
+        age = parse_age(fields.pop("age", None))
+        self.profile_writer.write(ProfileRecord(card.id, card.name, card.href, age, sent, fields=fields))
+
+    def show_in_detail_tab(self, driver: WebDriver, url: str):
+        """
+        Loads a details page in the persistent details tab, opening the tab on first use.
+        The cards list stays loaded in its own tab, which the caller switches back to.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            url (str): The details page to load.
+        """
+        if self.list_handle is None:
+            self.list_handle = driver.current_window_handle
+        try:
+            if self.detail_handle is None:
+                raise NoSuchWindowException("No details tab yet.")
+            self.selenium_facade.switch_to_window(self.detail_handle)
+        except NoSuchWindowException:
+            self.detail_handle = self.selenium_facade.open_tab()
+            self.logger.info("Opened the details tab.")
+        self.selenium_facade.navigate(url)
+
+    def close_detail_tab(self, driver: WebDriver):
+        """Closes the persistent details tab, if one was opened, and returns to the cards list."""
+        if self.detail_handle is None:
+            return
+        try:
+            self.selenium_facade.switch_to_window(self.detail_handle)
+            driver.close()
+        except NoSuchWindowException:
+            pass
+        finally:
+            self.detail_handle = None
+        self.selenium_facade.switch_to_window(self.list_handle)
+
+    def open_details(self, driver: WebDriver, card: Card):
+        """Opens the card's details page in a new tab by clicking its "View" button, or from its link if the list is pruned."""
+        if self.prune_dom:
+            self.open_details_link(card)
+            return
         card.click_view_button()
         self.logger.info(f"Clicked 'View' button on card: {card.name}")
 
-        driver.switch_to.window(driver.window_handles[-1])
+    def open_details_link(self, card: CardRecord):
+        """Opens the card's details page in a new tab from its recorded link."""
+        if not card.href:
+            raise Exception(f"Card has no details link: {card.name}")
+        self.selenium_facade.execute_script("window.open(arguments[0], '_blank');", card.href)
+        self.logger.info(f"Opened details page of card: {card.name}")
+
+    def compose_message(self, name: str, message: str) -> str:
+        """Builds the personal message text sent to a card's owner."""
+        return f"היי {name} {message}"
+
+    def send_message(self, name: str, message: str) -> bool:
+        """
+        Sends the message from the currently open details page.
+
+        Args:
+            name (str): The name of the card's owner, used in the greeting.
+            message (str): The message to send.
+
+        Returns:
+            bool: True if the site confirmed the submission.
+        """
+        if "details" not in self.checked_locators:
+            # Wait for the page to load before checking its locators
+            self.selenium_facade.find_element(SEND_BUTTON_XPATH)
+        self.preflight_once("details", DETAILS_PAGE_LOCATORS)
 
         # --- Click "Send" button in the new tab ---
         try:
@@ -112,23 +489,525 @@ class StandardCardCollection(CardCollectionStrategy):
         try:
             # Wait for popup to be visible
             self.selenium_facade.find_element(SEND_POPUP_XPATH)
+            self.preflight_once("send_popup", SEND_POPUP_LOCATORS)
 
             # Enter text in the textarea 
-            text = f"היי {card.name} {message}"
+            text = self.compose_message(name, message)
             self.selenium_facade.enter_text(SEND_POPUP_TEXTAREA_XPATH, text)
             self.logger.info(f"Entered text in textarea: {text}")
 
-            # Click the submit button
+            # Click the submit button once the send rate allows it
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            submitted = time.monotonic()
             self.selenium_facade.click_element(SEND_POPUP_SUBMIT_BUTTON_XPATH)
             self.logger.info("Clicked 'Submit' button")
 
-            time.sleep(3) # wait for manually verification of the message and the submition.
+            sent = self.confirm_sent()
+            if self.rate_limiter:
+                self.rate_limiter.record_result(sent, time.monotonic() - submitted)
+            return sent
 
+        except LocatorPreflightError:
+            raise
         except Exception as e:
             self.logger.error(f"Error interacting with popup: {e}")
+            return False
 
-        # --- Your actions in the new tab ---
-        # ... (your code to extract data or interact with elements on the new page) ...
+    def confirm_sent(self) -> bool:
+        """
+        Waits for the form's success or error message after a submission.
 
-        driver.close()
-        driver.switch_to.window(driver.window_handles[0])
\ No newline at end of file
+        Returns:
+            bool: True if the site showed its success message.
+        """
+        try:
+            result = self.selenium_facade.find_element(SEND_RESULT_XPATH, timeout=self.confirm_timeout)
+        except TimeoutException:
+            self.logger.warning(f"Submission not confirmed within {self.confirm_timeout}s.")
+            return False
+        if "elementor-message-success" in (result.get_attribute("class") or ""):
+            self.logger.info("Message sent.")
+            return True
+        self.logger.warning(f"Site rejected the message: {result.text}")
+        return False
+
+    def preflight_once(self, page: str, locators: dict):
+        """
+        Checks the locators of a page the first time it is visited, failing fast if any of them is broken.
+
+        Args:
+            page (str): A name for the page, used to check it only once.
+            locators (dict): Locator names mapped to XPaths.
+        """
+        if page in self.checked_locators:
+            return
+        self.selenium_facade.preflight(locators)
+        self.checked_locators.add(page)
+
+    def record_outcome(self, card_id: str, url: str, name: str, sent: bool, message: str = None):
+        """
+        Counts the outcome of processing a card in `outcomes` and records it in the ledger, if one is configured.
+        A `sent` of None records a submission with an unknown outcome.
+        """
+        outcome = OUTCOME_UNKNOWN if sent is None else OUTCOME_SENT if sent else OUTCOME_FAILED
+        with self._outcomes_lock:
+            self.outcomes[outcome] += 1
+        if not self.ledger or not card_id:
+            return
+        text = self.compose_message(name, message) if sent and message is not None else None
+        self.ledger.record(card_id, outcome, url=url, name=name, message=text)
+
+    def mark_processed(self, card: CardRecord):
+        """
+        Records that a card was processed, whatever its outcome, so it is skipped if processing restarts or resumes.
+
+        Args:
+            card (CardRecord): The processed card.
+        """
+        with self._outcomes_lock:
+            self.processed_ids.add(card.id)
+        if self.progress_callback:
+            self.progress_callback()
+
+    def processed_card_ids(self) -> list[str]:
+        """Returns a copy of the ids of the processed cards, safe to take while workers are processing."""
+        with self._outcomes_lock:
+            return sorted(self.processed_ids)
+
+    def skip_processed(self, cards: list[CardRecord]) -> list[CardRecord]:
+        """
+        Drops the cards without an id, as they could not be told apart from other cards or recorded,
+        the cards processed by this run or before it resumed, and the card records the ledger has
+        already recorded as sent or submitted with an unknown outcome, with a single lookup.
+
+        Args:
+            cards (list[CardRecord]): The collected card records.
+
+        Returns:
+            list[CardRecord]: The cards that still need processing.
+        """
+        for card in cards:
+            if card.id is None:
+                self.logger.warning(f"Skipping card {card.index + 1} ({card.name or 'no name'}): it has no id or details link.")
+        cards = [card for card in cards if card.id is not None]
+        if self.processed_ids:
+            processed_ids = set(self.processed_card_ids())
+            cards = [card for card in cards if card.id not in processed_ids]
+        if not self.ledger:
+            return cards
+        processed = self.ledger.processed_ids([card.id for card in cards], (OUTCOME_SENT, OUTCOME_UNKNOWN))
+        if processed:
+            self.logger.info(f"Skipping {len(processed)} already processed cards.")
+        return [card for card in cards if card.id not in processed]
+
+
+class BulkCardCollection(StandardCardCollection):
+    """Processes the collected card records directly, opening each details page from its recorded link."""
+
+    def iterate_through_cards(self, driver: WebDriver, cards: list[CardRecord], card_processing_function: Callable[[WebDriver, CardRecord, str], None], *args):
+        """Iterates through the card records and applies the provided processing function."""
+        try:
+            for card in self.skip_processed(cards):
+                try:
+                    self.logger.info(f"Processing card {card.index + 1}: {card.name}")
+                    with self.selenium_facade.measure("card"):
+                        sent = card_processing_function(driver, card, *args)
+                    self.record_outcome(card.id, card.href, card.name, sent, *args)
+
+                except LocatorPreflightError:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Error processing card: {e}")
+                self.mark_processed(card)
+        finally:
+            self.close_detail_tab(driver)
+
+    def open_details(self, driver: WebDriver, card: CardRecord):
+        """Opens the card's details page in a new tab from its recorded link."""
+        self.open_details_link(card)
+
+
+class PooledCardCollection(BulkCardCollection):
+    """Collects card records in the main session and processes them in parallel on a worker pool."""
+
+    def __init__(self, selenium_facade: SeleniumFacade, logger: logging.Logger, worker_pool, **kwargs):
+        """
+        Initializes the PooledCardCollection strategy.
+
+        Args:
+            selenium_facade (SeleniumFacade): The SeleniumFacade instance for interacting with the browser.
+            logger (logging.Logger): The logger for output messages.
+            worker_pool (CardWorkerPool): The pool of browser sessions processing the cards.
+            **kwargs: Scrolling options passed to StandardCardCollection.
+        """
+        super().__init__(selenium_facade, logger, **kwargs)
+        self.worker_pool = worker_pool
+
+    def iterate_through_cards(self, driver: WebDriver, cards: list[CardRecord], card_processing_function: Callable[[WebDriver, CardRecord, str], None], *args):
+        """
+        Hands the card records out to the worker pool and waits for all of them.
+
+        The cards are processed by the workers' own sessions, so `card_processing_function`
+        (which acts on the main session) is not used.
+        """
+        self.worker_pool.start(driver.get_cookies(), driver.current_url)
+        futures = {self.worker_pool.submit(card, *args): card for card in self.skip_processed(cards)}
+        for future in as_completed(futures):
+            card = futures[future]
+            try:
+                self.record_outcome(card.id, card.href, card.name, future.result(), *args)
+            except Exception as e:
+                self.logger.error(f"Error processing card {card.index + 1}: {e}")
+            self.mark_processed(card)
+
+
+class HttpCardCollection(BulkCardCollection):
+    """
+    Collects card records in the browser and sends the messages over HTTP with the browser's session,
+    falling back to the browser flow for any card the HTTP path cannot handle.
+    """
+
+    def __init__(self, selenium_facade: SeleniumFacade, logger: logging.Logger, http_engine: HttpEngine, **kwargs):
+        """
+        Initializes the HttpCardCollection strategy.
+
+        Args:
+            selenium_facade (SeleniumFacade): The SeleniumFacade instance for interacting with the browser.
+            logger (logging.Logger): The logger for output messages.
+            http_engine (HttpEngine): The engine sending requests with the browser's session.
+            **kwargs: Scrolling options passed to StandardCardCollection.
+        """
+        super().__init__(selenium_facade, logger, **kwargs)
+        self.http_engine = http_engine
+
+    def process_card(self, driver: WebDriver, card: CardRecord, message: str):
+        """
+        Sends the message over HTTP, or through the browser if the HTTP path fails before submitting.
+
+        Returns:
+            bool: Whether the message was sent, or None if it was submitted over HTTP with an unknown outcome.
+        """
+        if not self.http_engine.loaded:
+            self.http_engine.load_session(driver)
+        try:
+            html = self.send_over_http(card, message)
+            self.logger.info(f"Sent message over HTTP to card: {card.name}")
+            self.export_profile(card, True, self.http_profile_fields(card, html))
+            return True
+        except HttpFallback as e:
+            self.logger.warning(f"HTTP path failed, falling back to the browser: {e}")
+            return super().process_card(driver, card, message)
+        except HttpRejected as e:
+            self.logger.error(f"Message to card {card.name} was rejected: {e}")
+            self.export_profile(card, False, self.http_profile_fields(card))
+            return False
+        except HttpSendError as e:
+            # The site may have delivered the message, so it is neither sent again nor retried on later runs
+            self.logger.error(f"Message to card {card.name} was submitted, but its outcome is unknown: {e}")
+            self.export_profile(card, None, self.http_profile_fields(card))
+            return None
+
+    def http_profile_fields(self, card: CardRecord, html: str = None) -> dict:
+        """
+        Gets the details page fields of a card from the detail cache, or parses them from the page's HTML and caches them.
+
+        Args:
+            card (CardRecord): The processed card.
+            html (str, optional): The details page the message was submitted from. Defaults to the cached page.
+
+        Returns:
+            dict: The text of every field of PROFILE_FIELDS, or None if no export is set or the page is not available.
+        """
+        if not self.profile_writer:
+            return None
+        cached = self.detail_cache.get(card.href) if self.detail_cache and card.href else None
+        if cached and cached["fields"] is not None:
+            return cached["fields"]
+        html = html or (cached["html"] if cached else None)
+        if not html:
+            return None
+        try:
+            fields = extract_fields(html, PROFILE_FIELDS)
+        except Exception as e:
+            self.logger.warning(f"Could not extract profile fields: {e}")
+            return None
+        if self.detail_cache and card.href:
+            self.detail_cache.put(card.href, fields=fields)
+        return fields
+
+    def send_over_http(self, card: CardRecord, message: str) -> str:
+        """
+        Submits the card's send form, taking the details page from the detail cache when it holds a valid copy.
+        A cached page without a form, or whose form the site rejects, is dropped and fetched again once;
+        a submission with an unknown outcome is never repeated.
+
+        Args:
+            card (CardRecord): The card to message.
+            message (str): The message to send.
+
+        Returns:
+            str: The HTML of the details page the message was submitted from.
+
+        Raises:
+            HttpFallback: If the page could not be fetched or has no form; nothing was submitted.
+            HttpRejected: If the site rejected the submission of the freshly fetched page.
+            HttpSendError: If the submission failed or its answer could not be read.
+        """
+        text = self.compose_message(card.name, message)
+        cached = self.detail_cache.get(card.href) if self.detail_cache else None
+        if cached and cached["html"]:
+            try:
+                request = self.http_engine.prepare_submission(card.href, text, cached["html"])
+                self.submit_over_http(card, *request)
+                return cached["html"]
+            except (HttpFallback, HttpRejected) as e:
+                self.logger.info(f"Cached details page of {card.name} is outdated, fetching it again: {e}")
+                self.detail_cache.invalidate(card.href)
+        html = self.http_engine.fetch_details(card.href)
+        if self.detail_cache:
+            self.detail_cache.put(card.href, html=html)
+        self.submit_over_http(card, *self.http_engine.prepare_submission(card.href, text, html))
+        return html
+
+    def submit_over_http(self, card: CardRecord, ajax_url: str, data: dict):
+        """
+        Posts the card's filled-in form, paced by the rate limiter and reporting the outcome to it.
+
+        Args:
+            card (CardRecord): The card to message.
+            ajax_url (str): The URL the form is posted to.
+            data (dict): The form's data.
+
+        Raises:
+            HttpSendError: If the submission failed or was not accepted.
+        """
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        submitted = time.monotonic()
+        try:
+            self.http_engine.submit(card.href, ajax_url, data)
+        except HttpSendError:
+            if self.rate_limiter:
+                self.rate_limiter.record_result(False, time.monotonic() - submitted)
+            raise
+        if self.rate_limiter:
+            self.rate_limiter.record_result(True, time.monotonic() - submitted)
+
+
+class StreamingCardCollection(BulkCardCollection):
+    """
+    Processes cards while the list is still loading: every scroll step yields its new cards right away.
+    With a worker pool, scrolling and sending overlap through a bounded queue; without one,
+    cards are processed between scroll steps.
+    """
+
+    def __init__(self, selenium_facade: SeleniumFacade, logger: logging.Logger, worker_pool=None, queue_size: int = 20, **kwargs):
+        """
+        Initializes the StreamingCardCollection strategy.
+
+        Args:
+            selenium_facade (SeleniumFacade): The SeleniumFacade instance for interacting with the browser.
+            logger (logging.Logger): The logger for output messages.
+            worker_pool (CardWorkerPool, optional): The pool of browser sessions processing the cards. Defaults to None.
+            queue_size (int, optional): Maximum number of loaded cards waiting for a worker. Defaults to 20.
+            **kwargs: Scrolling options passed to StandardCardCollection.
+        """
+        super().__init__(selenium_facade, logger, **kwargs)
+        self.worker_pool = worker_pool
+        self.queue_size = queue_size
+
+    def collect_cards(self, driver: WebDriver):
+        """Returns a generator yielding each card record as soon as it is loaded."""
+        return self.stream_cards(driver)
+
+    def stream_cards(self, driver: WebDriver):
+        """
+        Scrolls the list and yields the records of the cards each scroll step loaded.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+
+        Yields:
+            CardRecord: The next loaded card that still needs processing.
+        """
+        extracted = 0
+        self.pruned_count = 0
+        for count in self.iter_scroll_steps(driver):
+            if count > extracted:
+                cards = self.snapshot_cards(extracted)
+                extracted = count
+                if self.prune_dom:
+                    self.prune_cards(extracted)
+                yield from self.skip_processed(cards)
+
+    def iterate_through_cards(self, driver: WebDriver, cards, card_processing_function: Callable[[WebDriver, CardRecord, str], None], *args):
+        """Processes the cards from the stream as they arrive."""
+        started = time.monotonic()
+        if self.worker_pool:
+            processed = self._iterate_with_pool(driver, cards, *args)
+        else:
+            processed = 0
+            try:
+                for card in cards:
+                    try:
+                        self.logger.info(f"Processing card {card.index + 1}: {card.name}")
+                        with self.selenium_facade.measure("card"):
+                            sent = card_processing_function(driver, card, *args)
+                        self.record_outcome(card.id, card.href, card.name, sent, *args)
+                        processed += 1
+                        if processed == 1:
+                            self.logger.info(f"First card processed after {time.monotonic() - started:.2f}s.")
+
+                    except LocatorPreflightError:
+                        raise
+                    except Exception as e:
+                        self.logger.error(f"Error processing card: {e}")
+                    self.mark_processed(card)
+            finally:
+                self.close_detail_tab(driver)
+        self.logger.info(f"Processed {processed} cards in {time.monotonic() - started:.2f}s.")
+
+    def _iterate_with_pool(self, driver: WebDriver, cards, *args) -> int:
+        """Scrolls in this thread while consumer threads feed the queued cards to the worker pool."""
+        self.worker_pool.start(driver.get_cookies(), driver.current_url)
+        pending = queue.Queue(maxsize=self.queue_size)
+        started = time.monotonic()
+        processed = []
+        lock = threading.Lock()
+
+        def consume():
+            while True:
+                card = pending.get()
+                if card is None:
+                    return
+                try:
+                    sent = self.worker_pool.submit(card, *args).result()
+                    self.record_outcome(card.id, card.href, card.name, sent, *args)
+                    with lock:
+                        processed.append(card)
+                        if len(processed) == 1:
+                            self.logger.info(f"First card processed after {time.monotonic() - started:.2f}s.")
+                except Exception as e:
+                    self.logger.error(f"Error processing card {card.index + 1}: {e}")
+                self.mark_processed(card)
+
+        consumers = [threading.Thread(target=consume, name=f"card-consumer-{number}", daemon=True) for number in range(self.worker_pool.workers)]
+        for consumer in consumers:
+            consumer.start()
+        try:
+            for card in cards:
+                pending.put(card)
+        except BaseException:
+            # Drop the cards that have not been handed to a worker yet
+            while not pending.empty():
+                pending.get_nowait()
+            raise
+        finally:
+            for _ in consumers:
+                pending.put(None)
+            for consumer in consumers:
+                consumer.join()
+        return len(processed)
+
+
+class ShardedCardCollection(PooledCardCollection):
+    """
+    Splits the age range into sub-ranges collected in parallel by the worker pool, each in its own session,
+    then processes the merged cards on the pool. Every shard scrolls a shorter list with a lighter DOM
+    than the full range would.
+    """
+
+    def __init__(self, selenium_facade: SeleniumFacade,
+                 logger: logging.Logger,
+                 worker_pool,
+                 min_age: int,
+                 max_age: int,
+                 shards: int = None,
+                 shard_stats_path: str = None,
+                 **kwargs):
+        """
+        Initializes the ShardedCardCollection strategy.
+
+        Args:
+            selenium_facade (SeleniumFacade): The SeleniumFacade instance for interacting with the browser.
+            logger (logging.Logger): The logger for output messages.
+            worker_pool (CardWorkerPool): The pool of browser sessions collecting and processing the cards.
+            min_age (int): The minimum age of the full range.
+            max_age (int): The maximum age of the full range.
+            shards (int, optional): The number of sub-ranges. Defaults to one per age.
+            shard_stats_path (str, optional): A JSON file keeping the cards observed per age, used to balance
+                the shards of later runs. Defaults to None.
+            **kwargs: Scrolling options passed to StandardCardCollection.
+        """
+        super().__init__(selenium_facade, logger, worker_pool, **kwargs)
+        self.min_age = min_age
+        self.max_age = max_age
+        self.shards = shards or max_age - min_age + 1
+        self.shard_stats_path = shard_stats_path
+        self.age_counts = self.load_age_counts()
+
+    def collect_cards(self, driver: WebDriver) -> list[CardRecord]:
+        """
+        Collects every shard on the worker pool and merges the results.
+
+        Args:
+            driver (WebDriver): The main session, whose login the workers reuse.
+
+        Returns:
+            list[CardRecord]: The cards of all shards, without duplicates and with continuous indexes.
+        """
+        cards_url = driver.current_url
+        self.worker_pool.start(driver.get_cookies(), cards_url)
+        ranges = plan_age_shards(self.min_age, self.max_age, self.shards, self.age_counts)
+        self.logger.info(f"Collecting {len(ranges)} age shards: {', '.join(f'{low}-{high}' for low, high in ranges)}")
+        started = time.monotonic()
+        futures = {self.worker_pool.submit_collection(cards_url, low, high): (low, high) for low, high in ranges}
+        collected = {}
+        for future in as_completed(futures):
+            low, high = futures[future]
+            try:
+                collected[low, high] = future.result()
+                self.logger.info(f"Shard {low}-{high} collected {len(collected[low, high])} cards.")
+            except Exception as e:
+                self.logger.error(f"Error collecting shard {low}-{high}: {e}")
+
+        cards = []
+        seen = set()
+        for low, high in ranges:
+            if (low, high) not in collected:
+                continue
+            shard = collected[low, high]
+            for age in range(low, high + 1):
+                self.age_counts[age] = len(shard) / (high - low + 1)
+            for card in shard:
+                if card.id is not None:
+                    if card.id in seen:
+                        continue
+                    seen.add(card.id)
+                cards.append(replace(card, index=len(cards)))
+        self.logger.info(f"Collected {len(cards)} unique cards from {len(collected)}/{len(ranges)} shards in {time.monotonic() - started:.2f}s.")
+        if len(collected) == len(ranges):
+            self.save_age_counts()
+        return cards
+
+    def load_age_counts(self) -> dict:
+        """Reads the cards observed per age by earlier runs, if a stats file is set and exists."""
+        if not self.shard_stats_path or not os.path.exists(self.shard_stats_path):
+            return {}
+        try:
+            with open(self.shard_stats_path, encoding="utf-8") as file:
+                return {int(age): count for age, count in json.load(file).items()}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable shard stats {self.shard_stats_path}: {e}")
+            return {}
+
+    def save_age_counts(self):
+        """Stores the cards observed per age for balancing the shards of later runs."""
+        if not self.shard_stats_path:
+            return
+        try:
+            with open(self.shard_stats_path, "w", encoding="utf-8") as file:
+                json.dump({str(age): count for age, count in sorted(self.age_counts.items())}, file, indent=2)
+        except OSError as e:
+            self.logger.warning(f"Could not save shard stats to {self.shard_stats_path}: {e}")
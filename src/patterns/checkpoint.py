@@ -0,0 +1,75 @@
+import json
+import logging
+import os
+import threading
+import time
+
+
+class RunCheckpoint:
+    """
+    Stores the progress of a run on disk: the state it reached, the filters it applied and the ids
+    of the cards it processed, so a restarted run can continue where the previous one stopped even
+    if the list changed in between. The file is replaced atomically, so a crash while saving leaves
+    the previous checkpoint intact.
+    """
+
+    def __init__(self, path: str, logger: logging.Logger, every: int = 5):
+        """
+        Initializes the RunCheckpoint.
+
+        Args:
+            path (str): The file the checkpoint is stored in.
+            logger (logging.Logger): The logger for output messages.
+            every (int, optional): The number of processed cards after which the checkpoint is saved again. Defaults to 5.
+        """
+        self.path = path
+        self.logger = logger
+        self.every = max(1, every)
+
+    def save(self, state: str, filters: dict, processed_ids: list[str]):
+        """
+        Replaces the checkpoint.
+
+        Args:
+            state (str): The state the run is in.
+            filters (dict): The filters the run applies.
+            processed_ids (list[str]): The ids of the cards processed so far.
+        """
+        data = {
+            "saved_at": time.time(),
+            "state": state,
+            "filters": filters,
+            "processed_ids": processed_ids,
+        }
+        # Saves from several threads, or jobs sharing a directory, never write the same temporary file
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.path)
+
+    def load(self) -> dict:
+        """
+        Loads the checkpoint.
+
+        Returns:
+            dict: The stored "state", "filters" and "processed_ids", or None if there is no readable checkpoint.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable checkpoint: {e}")
+            return None
+        if not {"state", "filters", "processed_ids"} <= set(data):
+            self.logger.warning(f"Ignoring incomplete checkpoint {self.path}.")
+            return None
+        return data
+
+    def clear(self):
+        """Deletes the checkpoint."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,210 @@
+import argparse
+import json
+import sqlite3
+import threading
+import time
+
+# Entries evicted per query while the cache is over its size limit
+EVICTION_BATCH_SIZE = 50
+
+
+class DetailCache:
+    """
+    On-disk SQLite cache of card details pages, keyed by the page URL.
+
+    An entry holds the page's HTML and/or the fields extracted from it. Entries expire `ttl` seconds
+    after they were stored, and the least recently used entries are evicted once the cache grows
+    beyond `max_bytes`. Hits and misses are counted for the lifetime of the instance.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Initializes the DetailCache, creating the database if needed.
+
+        Args:
+            path (str): The SQLite database file.
+            ttl (float, optional): Seconds an entry stays valid. Defaults to 86400 (one day).
+            max_bytes (int, optional): The total size of the entries above which the least recently used are evicted. Defaults to 100 MB.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS detail_pages (
+                    url TEXT PRIMARY KEY,
+                    html TEXT,
+                    fields TEXT,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS detail_pages_accessed ON detail_pages (accessed_at)")
+            self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM detail_pages").fetchone()[0]
+
+    def get(self, url: str) -> dict:
+        """
+        Looks up a details page, counting a hit or a miss.
+
+        Args:
+            url (str): The URL of the details page.
+
+        Returns:
+            dict: The cached "html" and "fields" (either may be None), or None if there is no valid entry.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT html, fields FROM detail_pages WHERE url = ? AND stored_at >= ?", (url, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._connection.execute("UPDATE detail_pages SET accessed_at = ? WHERE url = ?", (now, url))
+        return {"html": row["html"], "fields": json.loads(row["fields"]) if row["fields"] else None}
+
+    def put(self, url: str, html: str = None, fields: dict = None):
+        """
+        Stores a details page, keeping the HTML or fields of a valid earlier entry that are not given.
+        Committed immediately; evicts the least recently used entries if the cache grows too large.
+
+        Args:
+            url (str): The URL of the details page.
+            html (str, optional): The page's HTML. Defaults to None.
+            fields (dict, optional): The fields extracted from the page. Defaults to None.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT html, fields, size, stored_at FROM detail_pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None:
+                self._size -= row["size"]
+                if row["stored_at"] >= now - self.ttl:
+                    html = html if html is not None else row["html"]
+                    fields = fields if fields is not None else (json.loads(row["fields"]) if row["fields"] else None)
+            fields_json = json.dumps(fields, ensure_ascii=False) if fields is not None else None
+            size = len((html or "").encode("utf-8")) + len((fields_json or "").encode("utf-8"))
+            self._connection.execute(
+                "INSERT OR REPLACE INTO detail_pages (url, html, fields, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, html, fields_json, size, now, now)
+            )
+            self._size += size
+            self._evict()
+
+    def invalidate(self, url: str = None, older_than: float = None) -> int:
+        """
+        Deletes entries so the pages are fetched again.
+
+        Args:
+            url (str, optional): Only delete this page. Defaults to None.
+            older_than (float, optional): Only delete entries stored more than this many seconds ago. Defaults to None.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        conditions = []
+        params = []
+        if url:
+            conditions.append("url = ?")
+            params.append(url)
+        if older_than is not None:
+            conditions.append("stored_at < ?")
+            params.append(time.time() - older_than)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        with self._lock, self._connection:
+            self._size -= self._connection.execute(f"SELECT COALESCE(SUM(size), 0) FROM detail_pages{where}", params).fetchone()[0]
+            return self._connection.execute(f"DELETE FROM detail_pages{where}", params).rowcount
+
+    def prune_expired(self) -> int:
+        """
+        Deletes the expired entries.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        return self.invalidate(older_than=self.ttl)
+
+    def stats(self) -> dict:
+        """
+        Summarizes the cache.
+
+        Returns:
+            dict: The number of entries and their size, and the hits, misses and evictions of this instance.
+        """
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM detail_pages").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "size_mb": round(self._size / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self):
+        """Deletes the least recently used entries until the cache fits `max_bytes`; the caller holds the lock."""
+        while self._size > self.max_bytes:
+            rows = self._connection.execute(
+                "SELECT url, size FROM detail_pages ORDER BY accessed_at LIMIT ?", (EVICTION_BATCH_SIZE,)
+            ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self._connection.execute("DELETE FROM detail_pages WHERE url = ?", (row["url"],))
+                self._size -= row["size"]
+                self.evictions += 1
+
+
+def main(argv: list[str] = None):
+    """Command line interface for inspecting and invalidating the details page cache."""
+    parser = argparse.ArgumentParser(prog="python -m src.patterns.detail_cache", description="Inspect or invalidate the details page cache.")
+    parser.add_argument("--db", default="detail_cache.sqlite3", help="The cache database file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("stats", help="Count the cached pages and their size.")
+
+    invalidate_parser = commands.add_parser("invalidate", help="Delete cached pages so they are fetched again.")
+    invalidate_parser.add_argument("--url", help="Only delete this page.")
+    invalidate_parser.add_argument("--older-than-hours", type=float, help="Only delete pages cached more than this many hours ago.")
+    invalidate_parser.add_argument("--all", action="store_true", help="Allow deleting every page.")
+
+    args = parser.parse_args(argv)
+    cache = DetailCache(args.db)
+    try:
+        if args.command == "stats":
+            stats = cache.stats()
+            print(f"entries: {stats['entries']}")
+            print(f"size: {stats['size_mb']} MB")
+        elif args.command == "invalidate":
+            older_than = args.older_than_hours * 3600 if args.older_than_hours is not None else None
+            if older_than is None and not args.url and not args.all:
+                parser.error("invalidate needs --url, --older-than-hours or --all")
+            print(f"Deleted {cache.invalidate(args.url, older_than)} entries.")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
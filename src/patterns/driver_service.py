@@ -0,0 +1,61 @@
+import threading
+
+from selenium.webdriver.chrome.service import Service
+
+
+class PrestartedService(Service):
+    """
+    A chromedriver service that boots in a background thread, so the driver process starts while
+    the app is still importing and loading its configuration. Creating the driver with it waits for
+    the boot instead of starting another process.
+    """
+
+    def __init__(self, executable_path: str = None, **kwargs):
+        """
+        Initializes the PrestartedService.
+
+        Args:
+            executable_path (str, optional): The chromedriver executable. Defaults to None (resolved by Selenium Manager when the driver is created).
+        """
+        super().__init__(executable_path=executable_path, **kwargs)
+        self._thread = None
+        self._error = None
+
+    def start_in_background(self) -> bool:
+        """
+        Starts booting chromedriver, unless its path is not known yet.
+
+        Returns:
+            bool: Whether the boot was started.
+        """
+        if not self.path:
+            return False
+        self._thread = threading.Thread(target=self._boot, name="chromedriver-boot", daemon=True)
+        self._thread.start()
+        return True
+
+    def start(self):
+        """Waits for the background boot, or starts chromedriver now if none was started."""
+        if self._thread is None:
+            super().start()
+            return
+        self._thread.join()
+        self._thread = None
+        if self._error:
+            error, self._error = self._error, None
+            raise error
+
+    def stop(self):
+        """Stops chromedriver, waiting for a background boot first."""
+        # Selenium stops the service itself when the boot fails, from the boot thread
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+        super().stop()
+
+    def _boot(self):
+        """Starts chromedriver and keeps any error for `start`."""
+        try:
+            super().start()
+        except BaseException as e:
+            self._error = e
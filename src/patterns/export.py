@@ -0,0 +1,250 @@
+import csv
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is unavailable without pyarrow
+    pyarrow = None
+
+# Columns every export has, in order; the detail-page fields follow them
+BASE_COLUMNS = ("card_id", "name", "url", "age", "sent", "collected_at")
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+
+@dataclass
+class ProfileRecord:
+    """The data of one profile: its card, its details page fields and whether the message was sent."""
+
+    card_id: str
+    name: str
+    url: str
+    age: int = None
+    sent: bool = None
+    collected_at: float = field(default_factory=time.time)
+    fields: dict = field(default_factory=dict)
+
+    def to_row(self) -> dict:
+        """Flattens the record into one column per base column and detail field."""
+        return {
+            "card_id": self.card_id,
+            "name": self.name,
+            "url": self.url,
+            "age": self.age,
+            "sent": self.sent,
+            "collected_at": self.collected_at,
+            **self.fields,
+        }
+
+
+def parse_age(text: str) -> int:
+    """
+    Reads an age from a details page text, e.g. "Age 34" or "34 years".
+
+    Args:
+        text (str): The text holding the age.
+
+    Returns:
+        int: The first number in the text, or None if there is none.
+    """
+    match = re.search(r"\d+", text or "")
+    return int(match.group()) if match else None
+
+
+class ProfileWriter(ABC):
+    """
+    Streams profile records to a file in batches.
+
+    Records are buffered and written every `batch_size` records, so memory stays bounded however
+    many profiles a run goes through. Writers are thread-safe, so the main session and the
+    workers of a run can share one. The file is opened with the first batch, so a run that turns
+    out to resume an earlier one can still `resume` its export instead of replacing it.
+    """
+
+    def __init__(self, path: str, field_names: tuple = (), batch_size: int = 500):
+        """
+        Initializes the ProfileWriter.
+
+        Args:
+            path (str): The file to write; it is replaced if it exists, unless the export is resumed.
+            field_names (tuple, optional): The detail-page fields exported after the base columns. Defaults to ().
+            batch_size (int, optional): The number of records buffered before they are written. Defaults to 500.
+        """
+        self.path = path
+        self.columns = BASE_COLUMNS + tuple(name for name in field_names if name not in BASE_COLUMNS)
+        self.batch_size = max(1, batch_size)
+        self.written = 0
+        self.closed = False
+        self.append = False
+        self._opened = False
+        self._buffer = []
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def resume(self):
+        """Adds the records to the existing file instead of replacing it, if nothing was written yet."""
+        with self._lock:
+            self.append = True
+
+    def write(self, record: ProfileRecord):
+        """
+        Adds a record, writing the buffered batch once it is full.
+
+        Args:
+            record (ProfileRecord): The record to export.
+        """
+        row = record.to_row()
+        with self._lock:
+            if self.closed:
+                raise Exception(f"Profile export {self.path} is closed.")
+            self._buffer.append({column: row.get(column) for column in self.columns})
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        """Writes the buffered records."""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Writes the buffered records and closes the file."""
+        with self._lock:
+            if self.closed:
+                return
+            self._flush()
+            self._open()
+            self._close_file()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def _flush(self):
+        """Writes the buffered records; the caller holds the lock."""
+        if not self._buffer:
+            return
+        self._open()
+        self._write_rows(self._buffer)
+        self.written += len(self._buffer)
+        self._buffer = []
+
+    def _open(self):
+        """Opens the file on first use; the caller holds the lock."""
+        if self._opened:
+            return
+        self._open_file(self.append and os.path.exists(self.path) and os.path.getsize(self.path) > 0)
+        self._opened = True
+
+    @abstractmethod
+    def _open_file(self, append: bool):
+        """Opens the file, adding to its records if `append` is set."""
+        pass
+
+    @abstractmethod
+    def _write_rows(self, rows: list[dict]):
+        """Writes a batch of rows to the file."""
+        pass
+
+    @abstractmethod
+    def _close_file(self):
+        """Closes the file."""
+        pass
+
+
+class CsvProfileWriter(ProfileWriter):
+    """Writes profile records as CSV with a header row."""
+
+    def _open_file(self, append: bool):
+        self._file = open(self.path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns)
+        if not append:
+            self._writer.writeheader()
+
+    def _write_rows(self, rows: list[dict]):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close_file(self):
+        self._file.close()
+
+
+class JsonlProfileWriter(ProfileWriter):
+    """Writes profile records as JSON Lines, one object per record."""
+
+    def _open_file(self, append: bool):
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+
+    def _write_rows(self, rows: list[dict]):
+        self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        self._file.flush()
+
+    def _close_file(self):
+        self._file.close()
+
+
+class ParquetProfileWriter(ProfileWriter):
+    """
+    Writes profile records as Parquet, one row group per batch (requires pyarrow).
+    Parquet files cannot be added to, so a resumed export is written next to the existing one, e.g. profiles.1700000000.parquet.
+    """
+
+    def __init__(self, path: str, field_names: tuple = (), batch_size: int = 500):
+        if pyarrow is None:
+            raise Exception("Parquet export requires pyarrow (pip install pyarrow).")
+        super().__init__(path, field_names, batch_size)
+        types = {"age": pyarrow.int32(), "sent": pyarrow.bool_(), "collected_at": pyarrow.float64()}
+        self.schema = pyarrow.schema([(column, types.get(column, pyarrow.string())) for column in self.columns])
+
+    def _open_file(self, append: bool):
+        if append:
+            root, extension = os.path.splitext(self.path)
+            self.path = f"{root}.{int(time.time())}{extension}"
+        self._writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+
+    def _write_rows(self, rows: list[dict]):
+        self._writer.write_table(pyarrow.Table.from_pylist(rows, schema=self.schema))
+
+    def _close_file(self):
+        self._writer.close()
+
+
+WRITERS = {
+    "csv": CsvProfileWriter,
+    "jsonl": JsonlProfileWriter,
+    "parquet": ParquetProfileWriter,
+}
+
+
+def open_profile_writer(path: str, field_names: tuple = (), batch_size: int = 500, export_format: str = None) -> ProfileWriter:
+    """
+    Creates the writer for an export file.
+
+    Args:
+        path (str): The file to write.
+        field_names (tuple, optional): The detail-page fields exported after the base columns. Defaults to ().
+        batch_size (int, optional): The number of records buffered before they are written. Defaults to 500.
+        export_format (str, optional): One of EXPORT_FORMATS. Defaults to the file's extension.
+
+    Returns:
+        ProfileWriter: The writer, to be closed once the run is over.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    export_format = (export_format or os.path.splitext(path)[1].lstrip(".")).lower()
+    if export_format == "json":
+        export_format = "jsonl"
+    if export_format not in WRITERS:
+        raise ValueError(f"Unknown export format '{export_format}', expected one of {', '.join(EXPORT_FORMATS)}")
+    return WRITERS[export_format](path, field_names, batch_size)
@@ -1,15 +1,105 @@
+import functools
+import inspect
+import time
+from contextlib import nullcontext
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import (
+    TimeoutException, 
+    WebDriverException, 
+    StaleElementReferenceException, 
+    ElementNotInteractableException, 
+    ElementClickInterceptedException
+)
+from src.pages.scripts import PREFLIGHT_LOCATORS_SCRIPT, WAIT_FOR_LOCATOR_SCRIPT
+from src.patterns.metrics import LatencyRecorder
+from src.patterns.trace import TraceRecorder
+
+WAIT_MODES = ("observer", "poll")
+# Expected conditions used when a wait is polled, by wait condition name
+POLL_CONDITIONS = {
+    "present": EC.presence_of_element_located,
+    "clickable": EC.element_to_be_clickable,
+    "all": EC.presence_of_all_elements_located,
+}
+
+
+def instrumented(operation: str, label_argument: str = None):
+    """
+    Times the decorated facade method with the facade's LatencyRecorder, tagged with its locator or script
+    (its first argument), or with the argument named `label_argument`.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.instrumentation is None:
+                return method(self, *args, **kwargs)
+            if label_argument:
+                target = signature.bind(self, *args, **kwargs).arguments.get(label_argument, "")
+            else:
+                target = args[0] if args else next(iter(kwargs.values()), "")
+            if isinstance(target, dict):
+                label = ",".join(target)[:80]
+            elif isinstance(target, str):
+                label = target.strip().splitlines()[0][:80] if target.strip() else ""
+            else:
+                label = type(target).__name__
+            with self.instrumentation.measure(operation, label):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class LocatorPreflightError(Exception):
+    """Raised when locators expected on the current page do not match any element."""
+
+    def __init__(self, report: dict):
+        self.report = report
+        missing = ", ".join(name for name, count in report.items() if count <= 0)
+        super().__init__(f"Locators not found on page: {missing}")
+
 
 class SeleniumFacade:
     """Provides a simplified interface for common Selenium WebDriver interactions."""
 
-    def __init__(self, driver: WebDriver):
+    def __init__(self, driver: WebDriver, 
+                 cache_elements: bool = False, 
+                 instrumentation: LatencyRecorder = None, 
+                 wait_mode: str = "observer", 
+                 poll_interval: float = 0.5,
+                 trace: TraceRecorder = None):
+        """
+        Initializes the SeleniumFacade.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            cache_elements (bool, optional): Reuse elements found on the current page instead of looking them up again. 
+                The cache is cleared on navigation and window switches. Defaults to False.
+            instrumentation (LatencyRecorder, optional): Records the latency of every operation. Defaults to None.
+            wait_mode (str, optional): "observer" waits for XPath locators inside the browser and returns as soon as they match, 
+                "poll" checks them every `poll_interval` seconds. Defaults to "observer".
+            poll_interval (float, optional): Seconds between checks of polled waits. Defaults to 0.5.
+            trace (TraceRecorder, optional): Records every driver command from now on, for replaying the run. Defaults to None.
+        """
+        if wait_mode not in WAIT_MODES:
+            raise ValueError(f"Unknown wait mode '{wait_mode}', expected one of {', '.join(WAIT_MODES)}")
         self.driver = driver
+        self.cache_elements = cache_elements
+        self.instrumentation = instrumentation
+        self.wait_mode = wait_mode
+        self.poll_interval = poll_interval
+        self.locator_health = {}
+        self._element_cache = {}
+        self._script_timeout = None
+        self.trace = trace
+        if trace:
+            trace.attach(driver)
 
+    @instrumented("find")
     def find_element(self, locator: str, by: By = By.XPATH, timeout: int = 10, parent_element=None):
         """
         Finds a single element on the page. 
@@ -28,16 +118,17 @@ class SeleniumFacade:
         """
         try:
             if parent_element:
-                return WebDriverWait(parent_element, timeout).until(
-                    EC.presence_of_element_located((by, locator))
-                )
+                return self._wait_for(by, locator, "present", timeout, parent_element)
             else:
-                return WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((by, locator))
-                )
+                element = self._element_cache.get((by, locator))
+                if element is None:
+                    element = self._wait_for(by, locator, "present", timeout)
+                    self._remember(by, locator, element)
+                return element
         except TimeoutException as e:
             raise TimeoutException(f"Element not found: {locator} by {by}") from e
 
+    @instrumented("find_all")
     def find_elements(self, locator: str, by: By = By.XPATH, timeout: int = 10):
         """
         Finds multiple elements on the page.
@@ -54,12 +145,11 @@ class SeleniumFacade:
             TimeoutException: If the elements are not found within the timeout period.
         """
         try:
-            return WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_all_elements_located((by, locator))
-            )
+            return self._wait_for(by, locator, "all", timeout)
         except TimeoutException as e:
             raise TimeoutException(f"Elements not found: {locator} by {by}") from e
 
+    @instrumented("click")
     def click_element(self, locator: str, by: By = By.XPATH, timeout: int = 10):
         """
         Finds an element and clicks it.
@@ -72,14 +162,21 @@ class SeleniumFacade:
         Raises:
             TimeoutException: If the element is not clickable within the timeout period.
         """
+        cached = self._element_cache.get((by, locator))
+        if cached is not None:
+            try:
+                cached.click()
+                return
+            except (StaleElementReferenceException, ElementNotInteractableException, ElementClickInterceptedException):
+                self._element_cache.pop((by, locator), None)
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((by, locator))
-            )
+            element = self._wait_for(by, locator, "clickable", timeout)
+            self._remember(by, locator, element)
             element.click()
         except TimeoutException as e:
             raise TimeoutException(f"Element not clickable: {locator} by {by}") from e
 
+    @instrumented("text")
     def get_element_text(self, locator: str, by: By = By.XPATH, timeout: int = 10, parent_element=None) -> str:
         """
         Gets the text content of an element.
@@ -102,6 +199,7 @@ class SeleniumFacade:
         except TimeoutException as e:
             raise TimeoutException(f"Element text not retrievable: {locator} by {by}") from e
 
+    @instrumented("type")
     def enter_text(self, locator: str, text: str, by: By = By.XPATH, timeout: int = 10):
         """
         Enters text into an input field.
@@ -117,10 +215,15 @@ class SeleniumFacade:
         """
         try:
             element = self.find_element(locator, by, timeout)
-            element.send_keys(text)
+            try:
+                element.send_keys(text)
+            except StaleElementReferenceException:
+                self._element_cache.pop((by, locator), None)
+                self.find_element(locator, by, timeout).send_keys(text)
         except TimeoutException as e:
             raise TimeoutException(f"Unable to enter text: {locator} by {by}") from e
 
+    @instrumented("script")
     def execute_script(self, script: str, *args):
         """
         Executes JavaScript in the browser.
@@ -135,4 +238,168 @@ class SeleniumFacade:
         try:
             return self.driver.execute_script(script, *args)
         except WebDriverException as e:
-            raise WebDriverException(f"Script execution failed: {script}") from e
\ No newline at end of file
+            raise WebDriverException(f"Script execution failed: {script}") from e
+
+    @instrumented("async_script")
+    def execute_async_script(self, script: str, *args, timeout: float = None):
+        """
+        Executes asynchronous JavaScript in the browser and waits for it to signal completion.
+
+        Args:
+            script (str): The JavaScript code to execute. It must call the callback passed as its last argument.
+            *args: Any additional arguments to pass to the script.
+            timeout (float, optional): The maximum time in seconds to wait for the callback. Defaults to the driver's script timeout.
+
+        Returns:
+            Any: The value passed to the callback.
+        """
+        try:
+            if timeout is not None:
+                self.driver.set_script_timeout(timeout)
+                self._script_timeout = timeout
+            return self.driver.execute_async_script(script, *args)
+        except WebDriverException as e:
+            raise WebDriverException(f"Async script execution failed: {script}") from e
+
+    @instrumented("wait", label_argument="description")
+    def wait_until(self, condition, timeout: int = 10, description: str = ""):
+        """
+        Waits until an expected condition is met.
+
+        Args:
+            condition: The expected condition, e.g. `EC.url_contains(url)`.
+            timeout (int, optional): The maximum time to wait. Defaults to 10 seconds.
+            description (str, optional): What is being waited for, used in errors and metrics. Defaults to "".
+
+        Returns:
+            Any: The condition's result.
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout period.
+        """
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=self.poll_interval).until(condition)
+        except TimeoutException as e:
+            raise TimeoutException(f"Condition not met: {description}") from e
+
+    def measure(self, operation: str, locator: str = ""):
+        """
+        Times a block of work with the facade's LatencyRecorder, if one is set.
+
+        Args:
+            operation (str): The kind of work, e.g. "card".
+            locator (str, optional): A label for what the work acted on. Defaults to "".
+
+        Returns:
+            A context manager timing the enclosed block.
+        """
+        if self.instrumentation is None:
+            return nullcontext()
+        return self.instrumentation.measure(operation, locator)
+
+    @instrumented("navigate")
+    def navigate(self, url: str):
+        """
+        Navigates the current window to the specified URL, clearing the element cache.
+
+        Args:
+            url (str): The URL to load.
+        """
+        self.invalidate_cache()
+        self.driver.get(url)
+
+    @instrumented("switch_window")
+    def switch_to_window(self, handle: str):
+        """
+        Switches to another browser window or tab, clearing the element cache.
+
+        Args:
+            handle (str): The window handle to switch to.
+        """
+        self.invalidate_cache()
+        self.driver.switch_to.window(handle)
+
+    @instrumented("open_tab")
+    def open_tab(self) -> str:
+        """
+        Opens a new blank tab and switches to it, clearing the element cache.
+
+        Returns:
+            str: The new tab's window handle.
+        """
+        self.invalidate_cache()
+        self.driver.switch_to.new_window("tab")
+        return self.driver.current_window_handle
+
+    def invalidate_cache(self):
+        """Forgets every cached element."""
+        self._element_cache.clear()
+
+    @instrumented("preflight")
+    def preflight(self, locators: dict, raise_on_missing: bool = True) -> dict:
+        """
+        Checks in a single script call that every locator matches at least one element on the current page.
+        The result is recorded in `locator_health`.
+
+        Args:
+            locators (dict): Locator names mapped to XPaths.
+            raise_on_missing (bool, optional): Raise if a locator matches nothing. Defaults to True.
+
+        Returns:
+            dict: Locator names mapped to their number of matches (-1 for an invalid XPath).
+
+        Raises:
+            LocatorPreflightError: If a locator matches nothing and `raise_on_missing` is set.
+        """
+        report = {name: int(count) for name, count in self.execute_script(PREFLIGHT_LOCATORS_SCRIPT, locators).items()}
+        for name, count in report.items():
+            self.locator_health[name] = count > 0
+        if raise_on_missing and any(count <= 0 for count in report.values()):
+            raise LocatorPreflightError(report)
+        return report
+
+    def _wait_for(self, by: By, locator: str, condition: str, timeout: float, parent_element=None):
+        """
+        Waits until a locator's element is present or clickable, or until it matches any element ("all").
+
+        In "observer" mode XPath locators are watched inside the browser by a MutationObserver, so the wait
+        ends as soon as the DOM matches. Other locators, and waits the browser could not run (e.g. because
+        the page navigated away), are polled every `poll_interval` seconds for the remaining time.
+
+        Args:
+            by (By): The method used to locate the element.
+            locator (str): The locator for the element.
+            condition (str): "present", "clickable" or "all".
+            timeout (float): The maximum time to wait, in seconds.
+            parent_element (WebElement, optional): The element to search within. Defaults to None (the entire page).
+
+        Returns:
+            WebElement or list: The element, or every matching element for "all".
+
+        Raises:
+            TimeoutException: If the condition is not met within the timeout period.
+        """
+        started = time.monotonic()
+        if self.wait_mode == "observer" and by == By.XPATH:
+            try:
+                if self._script_timeout is None or self._script_timeout < timeout + 1:
+                    self.driver.set_script_timeout(timeout + 1)
+                    self._script_timeout = timeout + 1
+                outcome = self.driver.execute_async_script(WAIT_FOR_LOCATOR_SCRIPT, locator, condition, int(timeout * 1000), parent_element) or {}
+                if outcome.get("timedOut"):
+                    raise TimeoutException(f"Timed out waiting for {locator}")
+                if "result" in outcome:
+                    return outcome["result"]
+            except TimeoutException:
+                raise
+            except WebDriverException:
+                pass
+            timeout = max(0, timeout - (time.monotonic() - started))
+        return WebDriverWait(parent_element or self.driver, timeout, poll_frequency=self.poll_interval).until(
+            POLL_CONDITIONS[condition]((by, locator))
+        )
+
+    def _remember(self, by: By, locator: str, element):
+        """Caches a found element if element caching is enabled."""
+        if self.cache_elements:
+            self._element_cache[(by, locator)] = element
@@ -0,0 +1,101 @@
+from urllib.parse import urljoin
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # Card lists are snapshotted by script without lxml
+    etree = None
+    lxml_html = None
+
+from src.pages.xpaths import CARDS_CONTAINER_XPATH, CARDS_XPATH, CARD_NAME, CARD_BUTTON
+from src.pages.pageobjects.card import CardRecord
+
+
+def extract_fields(html: str, fields: dict) -> dict:
+    """
+    Reads fields from a page's HTML in-process, like EXTRACT_FIELDS_SCRIPT does in the browser.
+
+    Args:
+        html (str): The page's HTML.
+        fields (dict): Field names mapped to XPaths.
+
+    Returns:
+        dict: The text of every field, or None if it was not found.
+
+    Raises:
+        Exception: If lxml is not installed.
+    """
+    if lxml_html is None:
+        raise Exception("Reading fields from HTML requires lxml (pip install lxml).")
+    document = lxml_html.document_fromstring(html)
+    values = {}
+    for name, xpath in fields.items():
+        nodes = document.xpath(xpath)
+        if not nodes:
+            values[name] = None
+        else:
+            values[name] = (nodes[0].text_content() if hasattr(nodes[0], "text_content") else str(nodes[0])).strip()
+    return values
+
+
+class CardListParser:
+    """
+    Parses card records out of the HTML of the cards container, in-process and with XPaths compiled once,
+    so extracting a long list costs one transfer of its HTML instead of work per card in the browser.
+    """
+
+    def __init__(self, container_xpath: str = CARDS_CONTAINER_XPATH,
+                 cards_xpath: str = CARDS_XPATH,
+                 name_xpath: str = CARD_NAME,
+                 button_xpath: str = CARD_BUTTON):
+        """
+        Initializes the CardListParser.
+
+        Args:
+            container_xpath (str, optional): The XPath of the cards container. Defaults to CARDS_CONTAINER_XPATH.
+            cards_xpath (str, optional): The XPath of the cards, below the container. Defaults to CARDS_XPATH.
+            name_xpath (str, optional): The card name's XPath, relative to a card. Defaults to CARD_NAME.
+            button_xpath (str, optional): The card button's XPath, relative to a card. Defaults to CARD_BUTTON.
+
+        Raises:
+            Exception: If lxml is not installed.
+            ValueError: If the cards XPath does not start with the container XPath.
+        """
+        if etree is None:
+            raise Exception("Parsing card list snapshots requires lxml (pip install lxml).")
+        if not cards_xpath.startswith(container_xpath + "/"):
+            raise ValueError(f"Cards XPath {cards_xpath} is not below the container {container_xpath}")
+        self.container_xpath = container_xpath
+        self._cards = etree.XPath("." + cards_xpath[len(container_xpath):])
+        self._name = etree.XPath(name_xpath)
+        self._button = etree.XPath(button_xpath)
+
+    def parse(self, html: str, base_url: str, start: int = 0) -> list[CardRecord]:
+        """
+        Extracts the id, name and details link of every card in the container's HTML.
+
+        Args:
+            html (str): The outerHTML of the cards container.
+            base_url (str): The URL of the cards page, used to resolve relative links.
+            start (int, optional): Index of the first card to extract. Defaults to 0.
+
+        Returns:
+            list[CardRecord]: The extracted card records.
+        """
+        container = lxml_html.fromstring(html)
+        records = []
+        for index, card in enumerate(self._cards(container)):
+            if index < start:
+                continue
+            names = self._name(card)
+            buttons = self._button(card)
+            link = buttons[0].get("href") if buttons else (names[0].get("href") if names else None)
+            href = urljoin(base_url, link) if link else None
+            card_id = card.get("data-post-id") or card.get("id") or href
+            records.append(CardRecord(
+                id=str(card_id) if card_id else None,
+                name=" ".join(names[0].text_content().split()) if names else "",
+                href=href,
+                index=index,
+            ))
+        return records
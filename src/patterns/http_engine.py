@@ -0,0 +1,188 @@
+import logging
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.remote.webdriver import WebDriver
+
+AJAX_URL_PATTERN = re.compile(r'"ajaxurl"\s*:\s*"([^"]+)"')
+FORM_ACTION = "elementor_pro_forms_send_form"
+
+
+class HttpFallback(Exception):
+    """Raised when the HTTP path fails before submitting the form, so the browser flow can be used instead."""
+
+
+class HttpSendError(Exception):
+    """Raised when a submitted form's outcome is unknown; the site may have delivered the message, so it must not be sent again."""
+
+
+class HttpRejected(HttpSendError):
+    """Raised when the site answered that it did not accept a submitted form, e.g. because its nonce expired."""
+
+# WordPress answers admin-ajax requests with a failed nonce check or an unknown action with a bare -1 or 0
+NONCE_FAILURE_RESPONSES = ("-1", "0")
+
+
+class SendFormParser(HTMLParser):
+    """Collects the fields of every form on a page."""
+
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+        self._form = None
+
+    def handle_starttag(self, tag: str, attrs: list):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._form = {"action": attrs.get("action") or "", "fields": {}, "textareas": []}
+            self.forms.append(self._form)
+        elif self._form is None:
+            return
+        elif tag == "input" and attrs.get("name"):
+            if attrs.get("type") in ("checkbox", "radio") and "checked" not in attrs:
+                return
+            self._form["fields"][attrs["name"]] = attrs.get("value") or ""
+        elif tag == "textarea" and attrs.get("name"):
+            self._form["textareas"].append(attrs["name"])
+            self._form["fields"][attrs["name"]] = ""
+
+    def handle_endtag(self, tag: str):
+        if tag == "form":
+            self._form = None
+
+
+class HttpEngine:
+    """
+    Fetches card details pages and submits the send-message form over HTTP,
+    reusing the cookies of an authenticated Selenium session.
+    """
+
+    def __init__(self, logger: logging.Logger, pool_size: int = 10, timeout: float = 15):
+        """
+        Initializes the HttpEngine.
+
+        Args:
+            logger (logging.Logger): The logger for output messages.
+            pool_size (int, optional): The number of pooled connections per host. Defaults to 10.
+            timeout (float, optional): The timeout in seconds of each request. Defaults to 15.
+        """
+        self.logger = logger
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.loaded = False
+
+    def load_session(self, driver: WebDriver):
+        """
+        Copies the browser's cookies and user agent into the HTTP session.
+
+        Args:
+            driver (WebDriver): The authenticated Selenium WebDriver instance.
+        """
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        self.session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+        self.loaded = True
+        self.logger.info("Copied browser session into the HTTP engine.")
+
+    def fetch_details(self, url: str) -> str:
+        """
+        Fetches a card details page.
+
+        Args:
+            url (str): The URL of the details page.
+
+        Returns:
+            str: The page's HTML.
+
+        Raises:
+            HttpFallback: If the page could not be fetched as a logged-in user.
+        """
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise HttpFallback(f"Request to {url} failed: {e}") from e
+        if response.status_code != 200:
+            raise HttpFallback(f"Unexpected status {response.status_code} for {url}")
+        if "login" in response.url and "login" not in url:
+            raise HttpFallback(f"Redirected to login page from {url}")
+        return response.text
+
+    def send_message(self, url: str, text: str, html: str = None):
+        """
+        Submits the send-message form of a card details page.
+
+        Args:
+            url (str): The URL of the details page.
+            text (str): The message to send.
+            html (str, optional): The details page's HTML, if already fetched. Defaults to None.
+
+        Raises:
+            HttpFallback: If the page could not be fetched or has no form; nothing was submitted.
+            HttpSendError: If the submission failed or was not accepted.
+        """
+        html = html if html is not None else self.fetch_details(url)
+        ajax_url, data = self.prepare_submission(url, text, html)
+        self.submit(url, ajax_url, data)
+
+    def prepare_submission(self, url: str, text: str, html: str) -> tuple[str, dict]:
+        """
+        Fills in the send-message form of a card details page.
+
+        Args:
+            url (str): The URL of the details page.
+            text (str): The message to send.
+            html (str): The details page's HTML.
+
+        Returns:
+            tuple[str, dict]: The URL the form is posted to and the form's data.
+
+        Raises:
+            HttpFallback: If the page has no message form.
+        """
+        parser = SendFormParser()
+        parser.feed(html)
+        form = next((form for form in parser.forms if form["textareas"]), None)
+        if form is None:
+            raise HttpFallback(f"No message form found on {url}")
+
+        data = dict(form["fields"])
+        data[form["textareas"][0]] = text
+        data["action"] = FORM_ACTION
+        data["referrer"] = url
+        match = AJAX_URL_PATTERN.search(html)
+        ajax_url = match.group(1).replace("\\/", "/") if match else urljoin(url, "/wp-admin/admin-ajax.php")
+        return ajax_url, data
+
+    def submit(self, url: str, ajax_url: str, data: dict):
+        """
+        Posts a filled-in send-message form.
+
+        Args:
+            url (str): The URL of the details page, sent as referrer.
+            ajax_url (str): The URL the form is posted to.
+            data (dict): The form's data.
+
+        Raises:
+            HttpRejected: If the site answered that it did not accept the submission.
+            HttpSendError: If the request failed or the answer could not be read.
+        """
+        try:
+            response = self.session.post(ajax_url, data=data, headers={"Referer": url}, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise HttpSendError(f"Message submission for {url} failed: {e}") from e
+        if response.text.strip() in NONCE_FAILURE_RESPONSES:
+            raise HttpRejected(f"Message submission for {url} failed the nonce check ({response.status_code})")
+        try:
+            result = response.json()
+        except ValueError as e:
+            raise HttpSendError(f"Unexpected response to message submission ({response.status_code}) for {url}") from e
+        if response.status_code != 200 or not isinstance(result, dict):
+            raise HttpSendError(f"Unexpected response to message submission ({response.status_code}) for {url}: {result}")
+        if not result.get("success"):
+            raise HttpRejected(f"Message submission rejected for {url}: {result}")
@@ -0,0 +1,219 @@
+import argparse
+import hashlib
+import sqlite3
+import threading
+import time
+
+OUTCOME_SENT = "sent"
+OUTCOME_FAILED = "failed"
+# Submitted, but the site's answer was lost; not sent again automatically
+OUTCOME_UNKNOWN = "unknown"
+
+# SQLite limits the number of parameters of a single statement
+LOOKUP_BATCH_SIZE = 500
+
+
+class CardLedger:
+    """
+    Durable SQLite index of processed cards, keyed by card id,
+    so that reruns can skip profiles that were already messaged.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the CardLedger, creating the database if needed.
+
+        Args:
+            path (str): The SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS processed_cards (
+                    card_id TEXT PRIMARY KEY,
+                    url TEXT,
+                    name TEXT,
+                    outcome TEXT NOT NULL,
+                    processed_at REAL NOT NULL,
+                    message_hash TEXT
+                )
+                """
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS processed_cards_at ON processed_cards (processed_at)")
+
+    def is_processed(self, card_id: str, outcome: str = OUTCOME_SENT) -> bool:
+        """
+        Checks whether a card was already processed with the given outcome.
+
+        Args:
+            card_id (str): The card's id.
+            outcome (str, optional): The outcome that counts as processed. Defaults to "sent".
+
+        Returns:
+            bool: True if the card was processed.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM processed_cards WHERE card_id = ? AND outcome = ?", (card_id, outcome)
+            ).fetchone()
+        return row is not None
+
+    def processed_ids(self, card_ids: list[str], outcome: str | tuple = OUTCOME_SENT) -> set[str]:
+        """
+        Looks up many cards at once.
+
+        Args:
+            card_ids (list[str]): The card ids to look up.
+            outcome (str | tuple, optional): The outcome, or outcomes, that count as processed. Defaults to "sent".
+
+        Returns:
+            set[str]: The ids among `card_ids` that were already processed.
+        """
+        card_ids = list(card_ids)
+        outcomes = (outcome,) if isinstance(outcome, str) else tuple(outcome)
+        outcome_placeholders = ", ".join("?" * len(outcomes))
+        found = set()
+        with self._lock:
+            for start in range(0, len(card_ids), LOOKUP_BATCH_SIZE):
+                batch = card_ids[start:start + LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT card_id FROM processed_cards WHERE outcome IN ({outcome_placeholders}) AND card_id IN ({placeholders})",
+                    (*outcomes, *batch)
+                )
+                found.update(row["card_id"] for row in rows)
+        return found
+
+    def record(self, card_id: str, outcome: str, url: str = None, name: str = None, message: str = None):
+        """
+        Records the outcome of processing a card, replacing any earlier entry. Committed immediately.
+
+        Args:
+            card_id (str): The card's id.
+            outcome (str): The outcome, e.g. "sent" or "failed".
+            url (str, optional): The card's details page URL. Defaults to None.
+            name (str, optional): The card's name. Defaults to None.
+            message (str, optional): The message sent; only its hash is stored. Defaults to None.
+        """
+        message_hash = hashlib.sha256(message.encode("utf-8")).hexdigest() if message else None
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO processed_cards (card_id, url, name, outcome, processed_at, message_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (card_id, url, name, outcome, time.time(), message_hash)
+            )
+
+    def entries(self, outcome: str = None, limit: int = None) -> list[dict]:
+        """
+        Lists the recorded cards, most recent first.
+
+        Args:
+            outcome (str, optional): Only list cards with this outcome. Defaults to None (all).
+            limit (int, optional): Maximum number of entries. Defaults to None (all).
+
+        Returns:
+            list[dict]: The recorded entries.
+        """
+        query = "SELECT * FROM processed_cards"
+        params = []
+        if outcome:
+            query += " WHERE outcome = ?"
+            params.append(outcome)
+        query += " ORDER BY processed_at DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._connection.execute(query, params)]
+
+    def stats(self) -> dict:
+        """
+        Counts the recorded cards per outcome.
+
+        Returns:
+            dict: Number of cards per outcome.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT outcome, COUNT(*) AS count FROM processed_cards GROUP BY outcome")
+            return {row["outcome"]: row["count"] for row in rows}
+
+    def prune(self, older_than: float = None, outcome: str = None, card_id: str = None) -> int:
+        """
+        Deletes recorded cards so they are processed again on the next run.
+
+        Args:
+            older_than (float, optional): Only delete entries older than this many seconds. Defaults to None.
+            outcome (str, optional): Only delete entries with this outcome. Defaults to None.
+            card_id (str, optional): Only delete this card. Defaults to None.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        conditions = []
+        params = []
+        if older_than is not None:
+            conditions.append("processed_at < ?")
+            params.append(time.time() - older_than)
+        if outcome:
+            conditions.append("outcome = ?")
+            params.append(outcome)
+        if card_id:
+            conditions.append("card_id = ?")
+            params.append(card_id)
+        query = "DELETE FROM processed_cards"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock, self._connection:
+            return self._connection.execute(query, params).rowcount
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def main(argv: list[str] = None):
+    """Command line interface for inspecting and pruning the ledger."""
+    parser = argparse.ArgumentParser(prog="python -m src.patterns.ledger", description="Inspect or prune the processed-cards ledger.")
+    parser.add_argument("--db", default="ledger.sqlite3", help="The ledger database file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List processed cards, most recent first.")
+    list_parser.add_argument("--outcome", help="Only list cards with this outcome.")
+    list_parser.add_argument("--limit", type=int, default=50, help="Maximum number of cards to list.")
+
+    commands.add_parser("stats", help="Count processed cards per outcome.")
+
+    prune_parser = commands.add_parser("prune", help="Delete entries so the cards are processed again.")
+    prune_parser.add_argument("--older-than-days", type=float, help="Only delete entries older than this many days.")
+    prune_parser.add_argument("--outcome", help="Only delete entries with this outcome.")
+    prune_parser.add_argument("--card-id", help="Only delete this card.")
+    prune_parser.add_argument("--all", action="store_true", help="Allow deleting every entry.")
+
+    args = parser.parse_args(argv)
+    ledger = CardLedger(args.db)
+    try:
+        if args.command == "list":
+            for entry in ledger.entries(args.outcome, args.limit):
+                processed_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["processed_at"]))
+                print(f"{processed_at}  {entry['outcome']:<7} {entry['card_id']}  {entry['name'] or ''}  {entry['url'] or ''}")
+        elif args.command == "stats":
+            for outcome, count in ledger.stats().items():
+                print(f"{outcome}: {count}")
+        elif args.command == "prune":
+            older_than = args.older_than_days * 86400 if args.older_than_days is not None else None
+            if older_than is None and not args.outcome and not args.card_id and not args.all:
+                parser.error("prune needs --older-than-days, --outcome, --card-id or --all")
+            print(f"Deleted {ledger.prune(older_than, args.outcome, args.card_id)} entries.")
+    finally:
+        ledger.close()
+
+
+if __name__ == "__main__":
+    main()
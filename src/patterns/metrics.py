@@ -0,0 +1,215 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+QUANTILES = (0.5, 0.95, 0.99)
+# Buckets grow geometrically from 0.1 ms, so a percentile is off by at most one bucket (about 19%)
+BUCKET_START = 0.0001
+BUCKET_FACTOR = 2 ** 0.25
+BUCKET_COUNT = 96
+
+
+class Histogram:
+    """
+    Latency samples of one operation in fixed logarithmic buckets, with percentile summaries.
+    Memory and the cost of a summary stay constant however many samples are added.
+    """
+
+    def __init__(self):
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def bucket(seconds: float) -> int:
+        """Returns the index of the bucket a duration falls into; the last bucket holds every longer duration."""
+        if seconds <= BUCKET_START:
+            return 0
+        return min(BUCKET_COUNT - 1, math.ceil(math.log(seconds / BUCKET_START, BUCKET_FACTOR)))
+
+    @staticmethod
+    def upper_bound(index: int) -> float:
+        """Returns the longest duration of a bucket."""
+        return BUCKET_START * BUCKET_FACTOR ** index
+
+    def add(self, seconds: float):
+        """
+        Adds a sample.
+
+        Args:
+            seconds (float): The measured duration.
+        """
+        self.buckets[self.bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, quantile: float) -> float:
+        """
+        Estimates a percentile of the samples (nearest rank) as the upper bound of its bucket.
+
+        Args:
+            quantile (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The percentile, at most the longest sample, or 0 without samples.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return self.max if index == BUCKET_COUNT - 1 else min(self.upper_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """
+        Summarizes the samples.
+
+        Returns:
+            dict: count, sum, max and the p50/p95/p99 percentiles in seconds.
+        """
+        summary = {"count": self.count, "sum": round(self.total, 6), "max": round(self.max, 6)}
+        for quantile in QUANTILES:
+            summary[f"p{int(quantile * 100)}"] = round(self.percentile(quantile), 6)
+        return summary
+
+
+class LatencyRecorder:
+    """
+    Collects the latency of browser operations in memory, tagged with the operation,
+    the locator (or script) it acted on and the automation state it ran in.
+    """
+
+    def __init__(self):
+        self.current_state = ""
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._exporter = None
+
+    @contextmanager
+    def measure(self, operation: str, locator: str = ""):
+        """
+        Times the enclosed block, also when it raises.
+
+        Args:
+            operation (str): The kind of operation, e.g. "find" or "click".
+            locator (str, optional): The locator or script the operation acted on. Defaults to "".
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, time.perf_counter() - started, locator)
+
+    def record(self, operation: str, seconds: float, locator: str = ""):
+        """
+        Records a measured duration under the current state.
+
+        Args:
+            operation (str): The kind of operation.
+            seconds (float): The measured duration.
+            locator (str, optional): The locator or script the operation acted on. Defaults to "".
+        """
+        key = (operation, locator, self.current_state)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.add(seconds)
+
+    def summary(self) -> list[dict]:
+        """
+        Summarizes every recorded operation, slowest total first.
+
+        Returns:
+            list[dict]: One entry per operation, locator and state.
+        """
+        with self._lock:
+            entries = [
+                {"operation": operation, "locator": locator, "state": state, **histogram.summary()}
+                for (operation, locator, state), histogram in self._histograms.items()
+            ]
+        return sorted(entries, key=lambda entry: entry["sum"], reverse=True)
+
+    def write_json(self, path: str):
+        """
+        Writes the summary as JSON.
+
+        Args:
+            path (str): The output file.
+        """
+        self._write(path, json.dumps({"generated_at": time.time(), "operations": self.summary()}, ensure_ascii=False, indent=2))
+
+    def write_prometheus(self, path: str):
+        """
+        Writes the summary in the Prometheus textfile format.
+
+        Args:
+            path (str): The output file, e.g. for node_exporter's textfile collector.
+        """
+        lines = [
+            "# HELP scraper_operation_seconds Latency of browser operations.",
+            "# TYPE scraper_operation_seconds summary",
+        ]
+        for entry in self.summary():
+            labels = ",".join(f'{name}="{self._escape(entry[name])}"' for name in ("operation", "locator", "state"))
+            for quantile in QUANTILES:
+                lines.append(f'scraper_operation_seconds{{{labels},quantile="{quantile}"}} {entry[f"p{int(quantile * 100)}"]}')
+            lines.append(f"scraper_operation_seconds_sum{{{labels}}} {entry['sum']}")
+            lines.append(f"scraper_operation_seconds_count{{{labels}}} {entry['count']}")
+        self._write(path, "\n".join(lines) + "\n")
+
+    def export(self, directory: str):
+        """
+        Writes both the JSON and the Prometheus files.
+
+        Args:
+            directory (str): The output directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.write_json(os.path.join(directory, "latency.json"))
+        self.write_prometheus(os.path.join(directory, "latency.prom"))
+
+    def start_periodic_export(self, directory: str, interval: float = 60):
+        """
+        Exports the metrics every `interval` seconds in a background thread until `stop` is called.
+
+        Args:
+            directory (str): The output directory.
+            interval (float, optional): Seconds between exports. Defaults to 60.
+        """
+        def run():
+            while not self._stop.wait(interval):
+                self.export(directory)
+
+        self._stop.clear()
+        self._exporter = threading.Thread(target=run, name="metrics-exporter", daemon=True)
+        self._exporter.start()
+
+    def stop(self):
+        """Stops the periodic export."""
+        self._stop.set()
+        if self._exporter:
+            self._exporter.join()
+            self._exporter = None
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        """Escapes a Prometheus label value."""
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def _write(path: str, content: str):
+        """Replaces a file atomically, so readers never see a partial export."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temp_path, path)
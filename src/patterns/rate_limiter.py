@@ -0,0 +1,114 @@
+import logging
+import threading
+import time
+
+
+class SendRateLimiter:
+    """
+    Paces message submissions with a token bucket shared by every session of a run.
+
+    The bucket refills at the current rate and holds up to `burst` tokens, so short bursts go out
+    immediately while the long-run pace stays within the budget. Failed or slow submissions halve
+    the current rate (down to a floor); every confirmed fast submission raises it again in small
+    steps until the configured budget is reached.
+    """
+
+    def __init__(self, messages_per_minute: float,
+                 logger: logging.Logger,
+                 burst: int = 3,
+                 min_messages_per_minute: float = 2,
+                 slow_response: float = 5,
+                 backoff_factor: float = 0.5,
+                 recovery_step: float = 0.1):
+        """
+        Initializes the SendRateLimiter.
+
+        Args:
+            messages_per_minute (float): The maximum sustained number of submissions per minute.
+            logger (logging.Logger): The logger for output messages.
+            burst (int, optional): The number of submissions that may go out back to back. Defaults to 3.
+            min_messages_per_minute (float, optional): The rate backing off never goes below. Defaults to 2.
+            slow_response (float, optional): Seconds after which a confirmed submission counts as slow. Defaults to 5.
+            backoff_factor (float, optional): Multiplies the rate on a failed or slow submission. Defaults to 0.5.
+            recovery_step (float, optional): Fraction of the budget added to the rate per fast submission. Defaults to 0.1.
+        """
+        if messages_per_minute <= 0:
+            raise ValueError("messages_per_minute must be positive.")
+        self.logger = logger
+        self.max_rate = messages_per_minute / 60
+        self.min_rate = min(min_messages_per_minute / 60, self.max_rate)
+        self.rate = self.max_rate
+        self.burst = max(1, burst)
+        self.slow_response = slow_response
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.tokens = float(self.burst)
+        self.backoffs = 0
+        self.waited = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def messages_per_minute(self) -> float:
+        """The current submission rate, per minute."""
+        return self.rate * 60
+
+    def acquire(self) -> float:
+        """
+        Waits until the budget allows the next submission.
+
+        Returns:
+            float: The seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.waited += waited
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def record_result(self, sent: bool, latency: float):
+        """
+        Adapts the rate to the outcome of a submission.
+
+        Args:
+            sent (bool): Whether the site confirmed the submission.
+            latency (float): Seconds between the submission and its confirmation or failure.
+        """
+        with self._lock:
+            if not sent:
+                self._back_off("submission failed")
+            elif latency > self.slow_response:
+                self._back_off(f"slow response ({latency:.1f}s)")
+            elif self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_step)
+                if self.rate == self.max_rate:
+                    self.logger.info(f"Send rate recovered to {self.messages_per_minute:.1f} messages/min.")
+
+    def stats(self) -> dict:
+        """
+        Summarizes the limiter's state.
+
+        Returns:
+            dict: The current rate, the number of back-offs and the total time spent waiting.
+        """
+        with self._lock:
+            return {"messages_per_minute": round(self.messages_per_minute, 2), "backoffs": self.backoffs, "waited": round(self.waited, 2)}
+
+    def _refill(self):
+        """Adds the tokens accumulated since the last refill, up to the burst size."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _back_off(self, reason: str):
+        """Lowers the rate and drops any saved-up burst, so the next submission waits a full interval."""
+        self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+        self.tokens = min(self.tokens, 0.0)
+        self.backoffs += 1
+        self.logger.warning(f"Backing off after {reason}: sending {self.messages_per_minute:.1f} messages/min.")
@@ -0,0 +1,130 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.patterns.worker_pool import restore_cookies
+
+
+class SessionCache:
+    """
+    Stores an authenticated browser session (cookies and local storage) on disk,
+    so that later runs can skip the login form while the session is still valid.
+    The file is only readable by its owner, and a session is only restored for the account that saved it.
+    """
+
+    def __init__(self, path: str, logger: logging.Logger, max_age: float = None, account: str = None):
+        """
+        Initializes the SessionCache.
+
+        Args:
+            path (str): The file the session is stored in.
+            logger (logging.Logger): The logger for output messages.
+            max_age (float, optional): Maximum age in seconds of a stored session. Defaults to None (no limit).
+            account (str, optional): The account the session is logged in as. Defaults to None.
+        """
+        self.path = path
+        self.logger = logger
+        self.max_age = max_age
+        self.account = account
+
+    def save(self, driver: WebDriver):
+        """
+        Saves the cookies and local storage of the driver's current site.
+
+        Args:
+            driver (WebDriver): The authenticated Selenium WebDriver instance.
+        """
+        data = {
+            "saved_at": time.time(),
+            "account": self.account,
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+        }
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.path)
+        self.logger.info(f"Saved session to {self.path}.")
+
+    def load(self) -> dict:
+        """
+        Loads the stored session if it exists, belongs to the account and is not older than `max_age`.
+
+        Returns:
+            dict: The stored session, or None.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable session cache: {e}")
+            return None
+        if data.get("account") != self.account:
+            self.logger.info(f"Stored session in {self.path} belongs to another account.")
+            return None
+        if self.max_age and time.time() - data.get("saved_at", 0) > self.max_age:
+            self.logger.info("Stored session is too old.")
+            return None
+        return data
+
+    def restore(self, driver: WebDriver, url: str) -> bool:
+        """
+        Restores the stored session into the driver and checks that it is still logged in.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+            url (str): A members-only URL of the site, used to install and check the session.
+
+        Returns:
+            bool: True if the driver is now logged in, False if a full login is needed.
+        """
+        data = self.load()
+        if not data:
+            return False
+        if not self.is_valid(data["cookies"], url):
+            self.logger.info("Stored session expired.")
+            self.clear()
+            return False
+        restore_cookies(driver, url, data["cookies"])
+        driver.execute_script(
+            "for (var key in arguments[0]) { window.localStorage.setItem(key, arguments[0][key]); }",
+            data.get("local_storage") or {}
+        )
+        self.logger.info("Restored stored session.")
+        return True
+
+    def is_valid(self, cookies: list[dict], url: str) -> bool:
+        """
+        Checks with a single HTTP request that the cookies still give access to a members-only page.
+
+        Args:
+            cookies (list[dict]): The stored cookies.
+            url (str): A members-only URL of the site.
+
+        Returns:
+            bool: True if the page is served without redirecting (to the login page).
+        """
+        session = requests.Session()
+        for cookie in cookies:
+            session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        try:
+            response = session.get(url, allow_redirects=False, timeout=10)
+        except requests.RequestException as e:
+            self.logger.warning(f"Could not check stored session: {e}")
+            return False
+        return response.status_code == 200
+
+    def clear(self):
+        """Deletes the stored session."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
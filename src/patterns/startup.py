@@ -0,0 +1,87 @@
+import importlib
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+# Names chromedriver is looked up by on PATH
+CHROMEDRIVER_NAMES = ("chromedriver", "chromedriver.exe")
+
+
+def find_chromedriver(configured_path: str = None) -> str:
+    """
+    Locates the chromedriver executable.
+
+    Args:
+        configured_path (str, optional): The path set with CHROMEDRIVER_PATH. Defaults to None.
+
+    Returns:
+        str: The configured path, else the chromedriver found on PATH, else None to let Selenium Manager resolve it.
+
+    Raises:
+        ValueError: If the configured path is not a file.
+    """
+    if configured_path:
+        if not os.path.isfile(configured_path):
+            raise ValueError(f"CHROMEDRIVER_PATH {configured_path} is not a file.")
+        return configured_path
+    for name in CHROMEDRIVER_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def preload(modules: tuple):
+    """
+    Imports modules ahead of their first use.
+
+    Args:
+        modules (tuple): The names of the modules to import.
+    """
+    for module in modules:
+        importlib.import_module(module)
+
+
+class StartupProfiler:
+    """Measures the phases of the app's startup (imports, configuration, browser launch)."""
+
+    def __init__(self, started: float = None):
+        """
+        Initializes the StartupProfiler.
+
+        Args:
+            started (float, optional): The time.perf_counter() value the startup began at. Defaults to now.
+        """
+        self.started = started if started is not None else time.perf_counter()
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Measures a phase of the startup.
+
+        Args:
+            name (str): The phase's name; phases measured more than once are summed.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def report(self, logger: logging.Logger) -> dict:
+        """
+        Logs the duration of every phase and the total startup time.
+
+        Args:
+            logger (logging.Logger): The logger for output messages.
+
+        Returns:
+            dict: The seconds of every phase and the total.
+        """
+        report = {name: round(seconds, 3) for name, seconds in self.phases.items()}
+        report["total"] = round(time.perf_counter() - self.started, 3)
+        logger.info("Startup: " + ", ".join(f"{name} {seconds}s" for name, seconds in report.items()))
+        return report
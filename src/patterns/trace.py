@@ -0,0 +1,246 @@
+import gzip
+import json
+import threading
+import time
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+TRACE_VERSION = 1
+# Longer string parameters (mostly scripts) are shortened in traces; replay only matches command names
+MAX_PARAM_LENGTH = 200
+# Replaces typed text (e.g. the password), cookie values and local storage in traces
+REDACTED = "[redacted]"
+COOKIE_COMMANDS = (Command.GET_ALL_COOKIES, Command.GET_COOKIE, Command.ADD_COOKIE)
+
+
+def open_trace(path: str, mode: str):
+    """Opens a trace file as text, gzip-compressed if its name ends with .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def summarize_params(value):
+    """Shortens the long strings of a command's parameters so traces stay compact."""
+    if isinstance(value, str) and len(value) > MAX_PARAM_LENGTH:
+        return value[:MAX_PARAM_LENGTH] + f"...({len(value)} chars)"
+    if isinstance(value, dict):
+        return {key: summarize_params(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [summarize_params(item) for item in value]
+    return value
+
+
+def redact_cookie(cookie):
+    """Returns a copy of a cookie without its value."""
+    if not isinstance(cookie, dict):
+        return cookie
+    return {**cookie, "value": REDACTED} if "value" in cookie else cookie
+
+
+def redact(command: str, params: dict, response: dict = None) -> tuple[dict, dict]:
+    """
+    Removes the secrets from a command's parameters and response before they are traced:
+    typed text, cookie values and anything passed to or read from local storage.
+
+    Args:
+        command (str): The command's name.
+        params (dict): The command's parameters.
+        response (dict, optional): The command's response. Defaults to None.
+
+    Returns:
+        tuple[dict, dict]: The redacted parameters and response.
+    """
+    params = dict(params or {})
+    if command == Command.SEND_KEYS_TO_ELEMENT:
+        params.update({key: REDACTED for key in ("text", "value") if key in params})
+    elif command in COOKIE_COMMANDS:
+        if "cookie" in params:
+            params["cookie"] = redact_cookie(params["cookie"])
+        if isinstance(response, dict) and "value" in response:
+            value = response["value"]
+            value = [redact_cookie(cookie) for cookie in value] if isinstance(value, list) else redact_cookie(value)
+            response = {**response, "value": value}
+    elif "localStorage" in str(params.get("script", "")):
+        params["args"] = REDACTED
+        if isinstance(response, dict) and "value" in response:
+            response = {**response, "value": REDACTED}
+    return params, response
+
+
+class TraceMismatchError(Exception):
+    """Raised when a replayed run sends a different command than the recorded one, i.e. the code path changed."""
+
+
+class TraceRecorder:
+    """
+    Records every command a WebDriver sends, with its parameters, its response and its latency,
+    as JSON lines (gzip-compressed for a .gz path). Typed text, cookie values and local storage are
+    redacted, so traces hold no credentials or sessions.
+
+    The first line holds the session and the run's metadata; every following line is one command:
+    {"t": seconds since the start, "cmd": name, "params": {...}, "response": {...}, "duration": seconds}.
+    """
+
+    def __init__(self, path: str, metadata: dict = None):
+        """
+        Initializes the TraceRecorder.
+
+        Args:
+            path (str): The trace file; it is replaced if it exists.
+            metadata (dict, optional): Stored in the trace's header, e.g. the job that was run. Defaults to None.
+        """
+        self.path = path
+        self.metadata = metadata or {}
+        self.commands = 0
+        self._file = None
+        self._started = None
+        self._lock = threading.Lock()
+
+    def attach(self, driver: WebDriver):
+        """
+        Starts recording the commands of a driver.
+
+        Args:
+            driver (WebDriver): The driver to record, after its session was created.
+        """
+        executor = driver.command_executor
+        execute = executor.execute
+        self._file = open_trace(self.path, "w")
+        self._started = time.monotonic()
+        self._write({"version": TRACE_VERSION, "session_id": driver.session_id, "capabilities": driver.caps,
+                     "recorded_at": time.time(), "metadata": self.metadata})
+
+        def recorded_execute(command: str, params: dict):
+            started = time.monotonic()
+            entry = {"t": round(started - self._started, 4), "cmd": command, "params": summarize_params(redact(command, params)[0])}
+            try:
+                response = execute(command, params)
+            except Exception as e:
+                entry.update(duration=round(time.monotonic() - started, 4), error=f"{type(e).__name__}: {e}")
+                self._write(entry)
+                raise
+            entry.update(duration=round(time.monotonic() - started, 4), response=redact(command, params, response)[1])
+            self._write(entry)
+            return response
+
+        executor.execute = recorded_execute
+
+    def close(self):
+        """Closes the trace file."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _write(self, entry: dict):
+        """Appends one line to the trace."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str) + "\n")
+            if "cmd" in entry:
+                self.commands += 1
+
+
+class ReplayConnection:
+    """Answers a WebDriver's commands from a trace instead of a browser."""
+
+    def __init__(self, path: str, timing: str = "fast"):
+        """
+        Initializes the ReplayConnection.
+
+        Args:
+            path (str): The trace file written by TraceRecorder.
+            timing (str, optional): "original" waits each command's recorded latency, "fast" answers immediately. Defaults to "fast".
+        """
+        if timing not in ("original", "fast"):
+            raise ValueError(f"Unknown replay timing '{timing}', expected 'original' or 'fast'")
+        self.timing = timing
+        with open_trace(path, "r") as file:
+            self.header = json.loads(file.readline())
+            self.entries = [json.loads(line) for line in file if line.strip()]
+        if self.header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {self.header.get('version')}")
+        self.position = 0
+        self.waited = 0.0
+        self._started = None
+
+    def execute(self, command: str, params: dict) -> dict:
+        """
+        Returns the recorded response of the next command.
+
+        Args:
+            command (str): The command sent by the driver.
+            params (dict): Its parameters (not compared, as traces keep them shortened).
+
+        Returns:
+            dict: The recorded response.
+
+        Raises:
+            TraceMismatchError: If the recorded command at this position is a different one.
+        """
+        if command == Command.NEW_SESSION:
+            self._started = time.monotonic()
+            return {"value": {"sessionId": self.header["session_id"], "capabilities": self.header["capabilities"]}}
+        if self.position >= len(self.entries):
+            if command == Command.QUIT:
+                return {"value": None}
+            raise TraceMismatchError(f"Trace ended, but the run sent {command} ({self.position} commands replayed).")
+        entry = self.entries[self.position]
+        if entry["cmd"] != command:
+            raise TraceMismatchError(f"Command {self.position + 1} is {command}, the trace recorded {entry['cmd']} at {entry['t']}s.")
+        self.position += 1
+        if self.timing == "original":
+            time.sleep(entry["duration"])
+            self.waited += entry["duration"]
+        if "error" in entry:
+            raise Exception(f"Recorded error: {entry['error']}")
+        return entry["response"]
+
+    def close(self):
+        """Nothing to close, the trace was read on initialization."""
+        pass
+
+    def stats(self) -> dict:
+        """
+        Compares the replay with the recorded run.
+
+        Returns:
+            dict: The replayed and recorded commands, the recorded run's driver time and the time spent in Python during the replay.
+        """
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return {
+            "commands_replayed": self.position,
+            "commands_recorded": len(self.entries),
+            "recorded_seconds": round(self.entries[-1]["t"] + self.entries[-1]["duration"], 3) if self.entries else 0.0,
+            "recorded_driver_seconds": round(sum(entry["duration"] for entry in self.entries), 3),
+            "replay_seconds": round(elapsed, 3),
+            "python_seconds": round(elapsed - self.waited, 3),
+        }
+
+
+class ReplayDriver(WebDriver):
+    """A WebDriver that replays a recorded trace, so a run can be profiled or regression-tested without a browser."""
+
+    def __init__(self, path: str, timing: str = "fast"):
+        """
+        Initializes the ReplayDriver.
+
+        Args:
+            path (str): The trace file written by TraceRecorder.
+            timing (str, optional): "original" waits each command's recorded latency, "fast" answers immediately. Defaults to "fast".
+        """
+        self.replay = ReplayConnection(path, timing)
+        super().__init__(command_executor=self.replay, options=Options())
+
+    @property
+    def metadata(self) -> dict:
+        """The metadata stored with the trace."""
+        return self.replay.header.get("metadata", {})
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
+        """Replays a DevTools command, as recorded from a Chrome driver."""
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
@@ -0,0 +1,298 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from src.pages.cards import CardsPage
+from src.pages.pageobjects.card import CardRecord
+from src.patterns.facade import SeleniumFacade
+from src.patterns.cards_strategy import StandardCardCollection
+from src.patterns.metrics import LatencyRecorder
+from src.patterns.rate_limiter import SendRateLimiter
+from src.patterns.export import ProfileWriter
+from src.patterns.detail_cache import DetailCache
+
+COOKIE_FIELDS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+
+def restore_cookies(driver: WebDriver, url: str, cookies: list[dict]):
+    """
+    Opens the site in the given driver and installs the given cookies on it.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance to authenticate.
+        url (str): A URL on the site the cookies belong to.
+        cookies (list[dict]): Cookies as returned by `driver.get_cookies()`.
+    """
+    driver.get(url)
+    for cookie in cookies:
+        driver.add_cookie({key: value for key, value in cookie.items() if key in COOKIE_FIELDS})
+
+
+def is_alive(driver: WebDriver) -> bool:
+    """
+    Checks that a browser session still responds to commands.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance to check.
+
+    Returns:
+        bool: True if the session responds, False otherwise.
+    """
+    try:
+        return driver.execute_script("return 1;") == 1
+    except Exception:
+        return False
+
+
+class CardWorker:
+    """A browser session that processes card details pages."""
+
+    def __init__(self, worker_id: int,
+                 driver: WebDriver,
+                 logger: logging.Logger,
+                 instrumentation: LatencyRecorder = None,
+                 rate_limiter: SendRateLimiter = None,
+                 profile_writer: ProfileWriter = None,
+                 detail_cache: DetailCache = None):
+        """
+        Initializes the CardWorker.
+
+        Args:
+            worker_id (int): The worker's number, used in log messages.
+            driver (WebDriver): The worker's own WebDriver instance.
+            logger (logging.Logger): The logger for output messages.
+            instrumentation (LatencyRecorder, optional): Records the latency of the worker's operations. Defaults to None.
+            rate_limiter (SendRateLimiter, optional): Paces the submissions of all workers. Defaults to None.
+            profile_writer (ProfileWriter, optional): Exports a record of every processed profile. Defaults to None.
+            detail_cache (DetailCache, optional): Keeps details page fields between runs. Defaults to None.
+        """
+        self.worker_id = worker_id
+        self.driver = driver
+        self.selenium_facade = SeleniumFacade(driver, instrumentation=instrumentation)
+        self.strategy = StandardCardCollection(self.selenium_facade, logger,
+                                               rate_limiter=rate_limiter,
+                                               profile_writer=profile_writer,
+                                               detail_cache=detail_cache)
+        self.cards_page = CardsPage(driver, logger, self.selenium_facade, self.strategy)
+        self.processed = 0
+
+    def process(self, card: CardRecord, message: str) -> bool:
+        """
+        Opens the card's details page in the worker's tab and sends the message.
+
+        Args:
+            card (CardRecord): The card to process.
+            message (str): The message to send.
+
+        Returns:
+            bool: True if the site confirmed the message.
+        """
+        with self.selenium_facade.measure("card"):
+            self.selenium_facade.navigate(card.href)
+            sent = self.strategy.handle_details(card, message)
+        self.processed += 1
+        return sent
+
+    def collect(self, cards_url: str, min_age: int, max_age: int) -> list[CardRecord]:
+        """
+        Loads the cards page in the worker's tab, filters it to an age range and collects the matching cards.
+
+        Args:
+            cards_url (str): The URL of the cards page.
+            min_age (int): The minimum age of the range.
+            max_age (int): The maximum age of the range.
+
+        Returns:
+            list[CardRecord]: The cards of the range, indexed within the worker's page.
+        """
+        with self.selenium_facade.measure("shard", f"{min_age}-{max_age}"):
+            self.cards_page.load_cards(cards_url)
+            self.cards_page.apply_filters(min_age, max_age)
+            return self.strategy.collect_cards(self.driver)
+
+    def quit(self):
+        """Closes the worker's browser session, ignoring sessions that already crashed."""
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class CardWorkerPool:
+    """
+    Processes card details pages in parallel across several browser sessions
+    authenticated with the cookies of the main session.
+    """
+
+    def __init__(self, driver_factory: Callable[[], WebDriver],
+                 logger: logging.Logger,
+                 workers: int = 2,
+                 instrumentation: LatencyRecorder = None,
+                 rate_limiter: SendRateLimiter = None,
+                 profile_writer: ProfileWriter = None,
+                 detail_cache: DetailCache = None):
+        """
+        Initializes the CardWorkerPool.
+
+        Args:
+            driver_factory (Callable[[], WebDriver]): Creates a new WebDriver instance for a worker.
+            logger (logging.Logger): The logger for output messages.
+            workers (int, optional): The number of parallel browser sessions. Defaults to 2.
+            instrumentation (LatencyRecorder, optional): Records the latency of the workers' operations. Defaults to None.
+            rate_limiter (SendRateLimiter, optional): Paces the submissions of all workers together. Defaults to None.
+            profile_writer (ProfileWriter, optional): Exports a record of every profile the workers process. Defaults to None.
+            detail_cache (DetailCache, optional): Keeps details page fields between runs. Defaults to None.
+        """
+        self.driver_factory = driver_factory
+        self.logger = logger
+        self.workers = workers
+        self.instrumentation = instrumentation
+        self.rate_limiter = rate_limiter
+        self.profile_writer = profile_writer
+        self.detail_cache = detail_cache
+        self.started = False
+        self.lost = 0
+        self._url = None
+        self._cookies = []
+        self._idle = queue.Queue()
+        self._all_workers = []
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._executor = None
+
+    def start(self, cookies: list[dict], url: str):
+        """
+        Launches the worker sessions in parallel and authenticates them.
+
+        Args:
+            cookies (list[dict]): The main session's cookies, as returned by `driver.get_cookies()`.
+            url (str): A URL on the site the cookies belong to.
+        """
+        if self.started:
+            return
+        self._cookies = cookies
+        self._url = url
+        self._closing.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="card-worker")
+        launches = [self._executor.submit(self._launch_worker, worker_id) for worker_id in range(1, self.workers + 1)]
+        for launch in launches:
+            try:
+                self._idle.put(launch.result())
+            except Exception as e:
+                self.logger.error(f"Failed to start worker session: {e}")
+        if self._idle.empty():
+            self._executor.shutdown()
+            raise Exception("No worker session could be started.")
+        self.started = True
+        self.logger.info(f"Started {self._idle.qsize()} worker sessions.")
+
+    def submit(self, card: CardRecord, message: str) -> Future:
+        """
+        Queues a card to be processed by the next free worker.
+
+        Args:
+            card (CardRecord): The card to process.
+            message (str): The message to send.
+
+        Returns:
+            Future: Resolves to True once the card's message was sent.
+        """
+        return self._submit(lambda worker: worker.process(card, message), f"processing card {card.index + 1}: {card.name}")
+
+    def submit_collection(self, cards_url: str, min_age: int, max_age: int) -> Future:
+        """
+        Queues the collection of the cards of an age range by the next free worker.
+
+        Args:
+            cards_url (str): The URL of the cards page.
+            min_age (int): The minimum age of the range.
+            max_age (int): The maximum age of the range.
+
+        Returns:
+            Future: Resolves to the list of CardRecord of the range.
+        """
+        return self._submit(lambda worker: worker.collect(cards_url, min_age, max_age), f"collecting ages {min_age}-{max_age}")
+
+    def shutdown(self, cancel_pending: bool = False):
+        """
+        Stops the pool. Cards already being processed are finished before the sessions are closed.
+
+        Args:
+            cancel_pending (bool, optional): Drop queued cards that have not started yet. Defaults to False.
+        """
+        if not self.started:
+            return
+        self._closing.set()
+        if cancel_pending:
+            self.logger.info("Cancelling queued cards.")
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+        with self._lock:
+            for worker in self._all_workers:
+                worker.quit()
+            self._all_workers.clear()
+        self.started = False
+        self.logger.info("Worker pool stopped.")
+
+    def _launch_worker(self, worker_id: int) -> CardWorker:
+        """Creates and authenticates a new worker session."""
+        driver = self.driver_factory()
+        try:
+            restore_cookies(driver, self._url, self._cookies)
+        except Exception:
+            driver.quit()
+            raise
+        worker = CardWorker(worker_id, driver, self.logger, self.instrumentation, self.rate_limiter, self.profile_writer, self.detail_cache)
+        with self._lock:
+            self._all_workers.append(worker)
+        self.logger.info(f"Worker {worker_id} ready.")
+        return worker
+
+    def _recycle(self, worker: CardWorker) -> CardWorker:
+        """Replaces a worker whose session stopped responding."""
+        self.logger.warning(f"Worker {worker.worker_id} failed its health check, restarting it.")
+        with self._lock:
+            if worker in self._all_workers:
+                self._all_workers.remove(worker)
+        worker.quit()
+        return self._launch_worker(worker.worker_id)
+
+    def _lose(self, worker: CardWorker, error: Exception):
+        """Counts a worker that could not be restarted; once none are left, waiting tasks fail instead of blocking."""
+        with self._lock:
+            self.lost += 1
+            remaining = len(self._all_workers)
+        self.logger.error(f"Worker {worker.worker_id} could not be restarted, {remaining} workers left: {error}")
+        if not remaining:
+            self._idle.put(None)
+
+    def _submit(self, task: Callable[[CardWorker], Any], description: str) -> Future:
+        """Queues a task for the next free worker."""
+        if not self.started or self._closing.is_set():
+            raise Exception("Worker pool is not running.")
+        return self._executor.submit(self._run, task, description)
+
+    def _run(self, task: Callable[[CardWorker], Any], description: str):
+        """Runs a task on a leased worker and returns the worker to the pool."""
+        worker = self._idle.get()
+        if worker is None:
+            # Every worker was lost; pass the marker on to the other waiting tasks
+            self._idle.put(None)
+            raise Exception("No worker session is left.")
+        try:
+            if not is_alive(worker.driver):
+                try:
+                    worker = self._recycle(worker)
+                except Exception as e:
+                    self._lose(worker, e)
+                    worker = None
+                    raise
+            self.logger.info(f"Worker {worker.worker_id} {description}")
+            return task(worker)
+        finally:
+            # Only a responding or freshly launched worker goes back to the pool
+            if worker is not None:
+                self._idle.put(worker)
@@ -0,0 +1,41 @@
+import pytest
+
+from src.patterns.cards_strategy import plan_age_shards
+
+
+def covers(ranges, min_age, max_age):
+    """Checks the ranges are contiguous, ascending and span the whole range."""
+    assert ranges[0][0] == min_age and ranges[-1][1] == max_age
+    for (_, high), (low, _) in zip(ranges, ranges[1:]):
+        assert low == high + 1
+    return all(low <= high for low, high in ranges)
+
+
+@pytest.mark.parametrize("min_age, max_age, shards, expected", [
+    (20, 29, 2, [(20, 24), (25, 29)]),
+    (20, 23, 4, [(20, 20), (21, 21), (22, 22), (23, 23)]),
+    (20, 22, 10, [(20, 20), (21, 21), (22, 22)]),
+    (30, 40, 1, [(30, 40)]),
+    (30, 40, 0, [(30, 40)]),
+])
+def test_even_shards(min_age, max_age, shards, expected):
+    ranges = plan_age_shards(min_age, max_age, shards)
+
+    assert ranges == expected
+    assert covers(ranges, min_age, max_age)
+
+
+def test_counts_narrow_the_popular_ages():
+    counts = {25: 100, 26: 100}
+    ranges = plan_age_shards(20, 40, 3, counts)
+
+    assert covers(ranges, 20, 40)
+    assert len(ranges) == 3
+    assert ranges[0] == (20, 25)
+    assert ranges[1] == (26, 26)
+
+
+def test_every_shard_keeps_at_least_one_age():
+    ranges = plan_age_shards(20, 24, 5, {20: 1000})
+
+    assert ranges == [(20, 20), (21, 21), (22, 22), (23, 23), (24, 24)]
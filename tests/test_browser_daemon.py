@@ -0,0 +1,71 @@
+import logging
+
+import pytest
+
+from src.patterns.browser_daemon import BrowserSessionPool, JobDaemon
+from src.patterns.campaign import make_job
+
+LOGGER = logging.getLogger("test")
+DEFAULTS = {"username": "alice", "password": "secret", "message": "Hi", "min_age": 20, "max_age": 40,
+            "login_url": "https://example.com/login", "cards_url": "https://example.com/cards",
+            "members_url": "https://example.com/members"}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise Exception("session deleted")
+        return 1
+
+    def quit(self):
+        self.alive = False
+
+
+class Factory:
+    """Launches drivers until told to fail."""
+
+    def __init__(self):
+        self.fail = False
+
+    def __call__(self):
+        if self.fail:
+            raise Exception("chromedriver did not start")
+        return FakeDriver()
+
+
+def test_failed_replacement_leaves_the_pool_and_reraises():
+    factory = Factory()
+    pool = BrowserSessionPool(factory, LOGGER, size=1, health_interval=3600)
+    pool.start()
+    try:
+        pool._idle[0].driver.alive = False
+        factory.fail = True
+        with pytest.raises(Exception, match="chromedriver"):
+            with pool.lease("alice", timeout=1):
+                pass
+        assert pool.stats()["leased"] == 0
+    finally:
+        pool.stop()
+
+
+def test_job_fails_when_no_session_can_be_leased():
+    factory = Factory()
+    pool = BrowserSessionPool(factory, LOGGER, size=1, health_interval=3600)
+    pool.start()
+    daemon = JobDaemon(pool, lambda driver, job: {"completed": True}, LOGGER, DEFAULTS, port=0)
+    try:
+        pool._idle[0].driver.alive = False
+        factory.fail = True
+        job_id = "abc"
+        daemon.jobs[job_id] = {"id": job_id, "name": "job", "status": "queued", "result": None}
+        daemon._run(job_id, make_job({}, DEFAULTS, name="job"))
+
+        record = daemon.job(job_id)
+        assert record["status"] == "failed"
+        assert "chromedriver" in record["result"]["error"]
+    finally:
+        daemon.server_close()
+        pool.stop()
@@ -0,0 +1,29 @@
+import json
+import logging
+from types import SimpleNamespace
+
+from src.patterns.browser_profile import PROFILES, log_transfer
+
+LOGGER = logging.getLogger("test")
+
+
+def facade(requests, transferred):
+    return SimpleNamespace(execute_script=lambda script: {"requests": requests, "transferred": transferred, "decoded": transferred * 2})
+
+
+def test_lean_transfer_is_compared_with_the_last_headless_run(tmp_path):
+    path = str(tmp_path / "metrics" / "transfer.json")
+
+    assert "saved_bytes" not in log_transfer(facade(5, 1000), PROFILES["lean"], LOGGER, path)
+    assert "saved_bytes" not in log_transfer(facade(40, 8000), PROFILES["headless"], LOGGER, path)
+    stats = log_transfer(facade(10, 2000), PROFILES["lean"], LOGGER, path)
+
+    assert stats["saved_requests"] == 30
+    assert stats["saved_bytes"] == 6000
+    assert stats["saved_percent"] == 75.0
+    with open(path, encoding="utf-8") as file:
+        assert json.load(file)["lean"]["transferred_bytes"] == 2000
+
+
+def test_transfer_is_only_logged_without_a_path():
+    assert log_transfer(facade(3, 300), PROFILES["lean"], LOGGER) == {"requests": 3, "transferred_bytes": 300, "decoded_bytes": 600}
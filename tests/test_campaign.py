@@ -0,0 +1,116 @@
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from src.patterns.campaign import CampaignRunner, check_paths, load_campaign, make_job, scoped_path
+
+LOGGER = logging.getLogger("test")
+DEFAULTS = {"username": "alice", "password": "secret", "message": "Hi", "min_age": 20, "max_age": 40,
+            "login_url": "https://example.com/login", "cards_url": "https://example.com/cards",
+            "members_url": "https://example.com/members", "session_cache_path": "session.json",
+            "ledger_path": "ledger.sqlite3", "export_path": "profiles.csv", "checkpoint_path": "checkpoint.json"}
+
+
+def write_campaign(tmp_path, jobs, defaults=None):
+    path = tmp_path / "campaign.json"
+    path.write_text(json.dumps({"defaults": defaults or {}, "jobs": jobs}), encoding="utf-8")
+    return str(path)
+
+
+def test_scoped_path():
+    assert scoped_path("data/ledger.sqlite3", "alice") == "data/ledger.alice.sqlite3"
+    assert scoped_path(".session.json", "bob@example.com") == ".session.bob_example.com.json"
+
+
+def test_inherited_paths_are_separated_per_account_and_job(tmp_path):
+    path = write_campaign(tmp_path, [{"name": "young"}, {"name": "old", "username": "bob"}, {"name": "again"}])
+    young, old, again = load_campaign(path, DEFAULTS)
+
+    assert young.session_cache_path == again.session_cache_path == "session.alice.json"
+    assert old.session_cache_path == "session.bob.json"
+    assert old.ledger_path == "ledger.bob.sqlite3"
+    assert {young.export_path, old.export_path, again.export_path} == {"profiles.young.csv", "profiles.old.csv", "profiles.again.csv"}
+    assert young.checkpoint_path == "checkpoint.young.json"
+
+
+def test_explicit_paths_are_kept(tmp_path):
+    path = write_campaign(tmp_path, [{"name": "young", "export_path": "young.csv"}])
+
+    assert load_campaign(path, DEFAULTS)[0].export_path == "young.csv"
+
+
+@pytest.mark.parametrize("jobs", [
+    [{"name": "a", "export_path": "out.csv"}, {"name": "b", "export_path": "out.csv"}],
+    [{"name": "a", "ledger_path": "l.sqlite3"}, {"name": "b", "username": "bob", "ledger_path": "l.sqlite3"}],
+])
+def test_shared_paths_are_rejected(tmp_path, jobs):
+    with pytest.raises(ValueError):
+        load_campaign(write_campaign(tmp_path, jobs), DEFAULTS)
+
+
+def test_jobs_of_one_account_may_share_its_ledger():
+    jobs = [make_job({"name": name, "ledger_path": "l.sqlite3", "export_path": f"{name}.csv", "checkpoint_path": None}, DEFAULTS)
+            for name in ("a", "b")]
+
+    check_paths(jobs)
+
+
+def test_runner_runs_one_job_per_account_at_a_time():
+    jobs = [make_job({"name": f"{username}-{number}", "username": username}, DEFAULTS)
+            for username in ("alice", "bob") for number in range(3)]
+    running = {}
+    peak = {}
+    order = []
+    lock = threading.Lock()
+
+    def run_job(job):
+        with lock:
+            order.append(job.name)
+            running[job.account] = running.get(job.account, 0) + 1
+            peak[job.account] = max(peak.get(job.account, 0), running[job.account])
+        time.sleep(0.01)
+        with lock:
+            running[job.account] -= 1
+        if job.name == "bob-1":
+            raise RuntimeError("login failed")
+        return {"completed": True, "sent": 2}
+
+    results = CampaignRunner(run_job, LOGGER, concurrency=4).run(jobs)
+    summary = CampaignRunner.summarize(results)
+
+    assert peak == {"alice": 1, "bob": 1}
+    assert [result.name for result in results] == [job.name for job in jobs]
+    assert order[:2] == ["alice-0", "bob-0"]
+    assert summary["succeeded"] == 5 and summary["sent"] == 10
+    assert next(result for result in results if result.name == "bob-1").error == "login failed"
+
+
+def test_runner_runs_several_jobs_of_one_account_when_allowed(caplog):
+    jobs = [make_job({"name": f"job-{number}"}, DEFAULTS) for number in range(4)]
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def run_job(job):
+        with lock:
+            running.append(job.name)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(job.name)
+        return {"completed": True}
+
+    with caplog.at_level(logging.WARNING):
+        CampaignRunner(run_job, LOGGER, concurrency=2).run(jobs)
+    assert max(peak) == 1
+    assert "Only 1 of 2 jobs can run at a time" in caplog.text
+
+    peak.clear()
+    caplog.clear()
+    with caplog.at_level(logging.WARNING):
+        CampaignRunner(run_job, LOGGER, concurrency=2, per_account=2).run(jobs)
+    assert max(peak) == 2
+    assert not caplog.text
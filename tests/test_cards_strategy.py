@@ -0,0 +1,173 @@
+import json
+import logging
+
+import pytest
+
+from src.pages.pageobjects.card import Card, CardRecord
+from src.pages.scripts import PRUNE_CARDS_SCRIPT, SNAPSHOT_CARDS_SCRIPT
+from src.pages.xpaths import DETAILS_PAGE_LOCATORS, PROFILE_FIELDS, SEND_BUTTON_XPATH
+from src.patterns.cards_strategy import BulkCardCollection, HttpCardCollection, StandardCardCollection
+
+LOGGER = logging.getLogger("test")
+CARD = CardRecord(id="7", name="Dana", href="https://example.com/members/7", index=0)
+
+
+class FakeFacade:
+    """Records the calls the strategies make on the browser."""
+
+    instrumentation = None
+
+    def __init__(self):
+        self.calls = []
+
+    def find_element(self, locator, **kwargs):
+        self.calls.append(("find", locator))
+
+    def preflight(self, locators):
+        self.calls.append(("preflight", tuple(locators)))
+
+    def click_element(self, locator):
+        raise RuntimeError("page broke")
+
+    def execute_script(self, script, *args):
+        self.calls.append(("script", args))
+
+    def switch_to_window(self, handle):
+        self.calls.append(("switch", handle))
+
+
+class FakeDriver:
+    def __init__(self):
+        self.window_handles = ["list", "details"]
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+        self.window_handles.pop()
+
+
+def test_details_page_is_loaded_before_its_preflight():
+    facade = FakeFacade()
+    strategy = BulkCardCollection(facade, LOGGER)
+
+    strategy.send_message("Dana", "Hi")
+    strategy.send_message("Dana", "Hi")
+
+    assert facade.calls[:2] == [("find", SEND_BUTTON_XPATH), ("preflight", tuple(DETAILS_PAGE_LOCATORS))]
+    assert ("preflight", tuple(DETAILS_PAGE_LOCATORS)) not in facade.calls[2:]
+
+
+def test_details_tab_is_closed_when_handling_fails():
+    facade = FakeFacade()
+    driver = FakeDriver()
+    strategy = BulkCardCollection(facade, LOGGER)
+    strategy.handle_details = lambda card, message: (_ for _ in ()).throw(RuntimeError("boom"))
+
+    with pytest.raises(RuntimeError):
+        strategy.process_card(driver, CARD, "Hi")
+
+    assert driver.closed == 1
+    assert facade.calls[-1] == ("switch", "list")
+
+
+class ScrollingFacade:
+    """Loads three cards per scroll step and records what is pruned."""
+
+    instrumentation = None
+
+    def __init__(self, total: int):
+        self.total = total
+        self.loaded = 0
+        self.pruned = []
+        self.opened = []
+
+    def execute_async_script(self, script, xpath, count, *args, timeout=None):
+        self.loaded = min(self.total, count + 3)
+        return {"count": self.loaded, "nodes": 100, "pending": False}
+
+    def execute_script(self, script, *args):
+        if script == SNAPSHOT_CARDS_SCRIPT:
+            start = args[-1]
+            return [{"id": str(index), "name": f"Card {index}", "href": f"https://example.com/{index}", "index": index}
+                    for index in range(start, self.loaded)]
+        if script == PRUNE_CARDS_SCRIPT:
+            self.pruned.append(args[1:])
+            # Nothing was loaded past the pruned cards when they were pruned
+            assert args[2] == self.loaded
+            return {"pruned": args[2] - args[1], "nodes": 50}
+        self.opened.append(args[0])
+
+
+def test_standard_strategy_prunes_while_scrolling_and_opens_links():
+    facade = ScrollingFacade(total=7)
+    strategy = StandardCardCollection(facade, LOGGER, prune_dom=True, settle_time=0, idle_time=0)
+
+    cards = strategy.collect_cards(None)
+    strategy.open_details(None, Card(facade, cards[0]))
+
+    assert [card.id for card in cards] == [str(index) for index in range(7)]
+    assert facade.pruned == [(0, 3), (3, 6), (6, 7)]
+    assert facade.opened == ["https://example.com/0"]
+
+
+def test_cards_without_an_id_are_kept_as_none_and_skipped():
+    facade = ScrollingFacade(total=0)
+    facade.execute_script = lambda script, *args: [
+        {"id": "12", "name": "Dana", "href": "https://example.com/12", "index": 0},
+        {"id": None, "name": "Noa", "href": None, "index": 1},
+    ]
+    strategy = BulkCardCollection(facade, LOGGER)
+
+    cards = strategy.snapshot_cards()
+
+    assert cards[1].id is None
+    assert [card.id for card in strategy.skip_processed(cards)] == ["12"]
+
+
+def test_card_list_parser():
+    pytest.importorskip("lxml")
+    from src.patterns.html_snapshot import CardListParser
+
+    parser = CardListParser("/div", "/div/div", ".//h3/a", ".//a[@class='view']")
+    html = ("<div>"
+            '<div data-post-id="12"><h3><a href="/members/12">Dana  Levi</a></h3><a class="view" href="/members/12/view">View</a></div>'
+            '<div id="card-13"><h3><a href="/members/13">Noa</a></h3></div>'
+            "<div><h3><a>Gal</a></h3></div>"
+            "</div>")
+    records = parser.parse(html, "https://example.com/cards/")
+
+    assert records == [
+        CardRecord(id="12", name="Dana Levi", href="https://example.com/members/12/view", index=0),
+        CardRecord(id="card-13", name="Noa", href="https://example.com/members/13", index=1),
+        CardRecord(id=None, name="Gal", href=None, index=2),
+    ]
+    assert parser.parse(html, "https://example.com/cards/", start=2) == records[2:]
+
+
+def test_http_export_reads_the_fields_of_the_fetched_page(tmp_path):
+    pytest.importorskip("lxml")
+    from src.patterns.export import open_profile_writer
+    from src.patterns.html_snapshot import extract_fields
+
+    page = "<html><body><div></div><div><div><section><p>Age 34</p></section></div></div></body></html>"
+    assert extract_fields(page, {"age": PROFILE_FIELDS["age"], "city": "//span"}) == {"age": "Age 34", "city": None}
+
+    class Engine:
+        loaded = True
+
+        def fetch_details(self, url):
+            return page
+
+        def prepare_submission(self, url, text, html):
+            return "https://example.com/ajax", {"message": text}
+
+        def submit(self, url, ajax_url, data):
+            pass
+
+    writer = open_profile_writer(str(tmp_path / "profiles.jsonl"))
+    strategy = HttpCardCollection(FakeFacade(), LOGGER, Engine(), profile_writer=writer)
+    assert strategy.process_card(None, CARD, "Hi")
+    writer.close()
+
+    with open(writer.path, encoding="utf-8") as file:
+        assert json.loads(file.readline())["age"] == 34
@@ -0,0 +1,120 @@
+import logging
+import threading
+from types import SimpleNamespace
+
+from src.pages.pageobjects.card import CardRecord
+from src.patterns.automation import Automation, RetryPolicy, State
+from src.patterns.cards_strategy import BulkCardCollection
+from src.patterns.checkpoint import RunCheckpoint
+
+LOGGER = logging.getLogger("test")
+
+
+def make_automation(checkpoint=None, username="alice", **kwargs):
+    facade = SimpleNamespace(instrumentation=None)
+    strategy = BulkCardCollection(facade, LOGGER)
+    return Automation(None, LOGGER, "https://example.com/members", facade, "https://example.com/login",
+                      "https://example.com/cards", username, "secret", None, strategy, "Hi", 20, 40,
+                      checkpoint=checkpoint, **kwargs)
+
+
+def cards(*ids):
+    return [CardRecord(id=card_id, name=card_id, href=f"https://example.com/{card_id}", index=index) for index, card_id in enumerate(ids)]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / "checkpoint.json"), LOGGER)
+    checkpoint.save(State.PROCESS_CARDS, {"min_age": 20}, ["a", "b"])
+
+    assert checkpoint.load()["processed_ids"] == ["a", "b"]
+    assert [path.name for path in tmp_path.iterdir()] == ["checkpoint.json"]
+    checkpoint.clear()
+    assert checkpoint.load() is None
+
+
+def test_unreadable_or_incomplete_checkpoints_are_ignored(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert RunCheckpoint(str(path), LOGGER).load() is None
+    path.write_text('{"state": "done"}', encoding="utf-8")
+    assert RunCheckpoint(str(path), LOGGER).load() is None
+
+
+def test_checkpoint_is_saved_every_few_cards(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / "checkpoint.json"), LOGGER, every=2)
+    automation = make_automation(checkpoint)
+    strategy = automation.card_collection_strategy
+    for card in cards("a", "b", "c"):
+        strategy.mark_processed(card)
+
+    assert checkpoint.load()["processed_ids"] == ["a", "b"]
+
+
+def test_checkpoint_counts_cards_of_every_worker_and_never_goes_back(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / "checkpoint.json"), LOGGER, every=10)
+    saved = []
+    save = checkpoint.save
+    checkpoint.save = lambda state, filters, processed_ids: (saved.append(len(processed_ids)), save(state, filters, processed_ids))
+    strategy = make_automation(checkpoint).card_collection_strategy
+
+    def worker(number):
+        for card in cards(*(f"{number}-{index}" for index in range(50))):
+            strategy.mark_processed(card)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(saved) == 40
+    assert saved == sorted(saved)
+    assert len(checkpoint.load()["processed_ids"]) == 400
+
+
+def test_resume_skips_processed_cards_by_id(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / "checkpoint.json"), LOGGER)
+    first = make_automation(checkpoint)
+    first.current_state = State.PROCESS_CARDS
+    for card in cards("a", "b"):
+        first.card_collection_strategy.mark_processed(card)
+    first.save_checkpoint()
+
+    resumed = make_automation(checkpoint)
+    resumed.resume_from_checkpoint()
+    # A new card was added at the top of the list since the checkpoint
+    remaining = resumed.card_collection_strategy.skip_processed(cards("new", "a", "b", "c"))
+
+    assert [card.id for card in remaining] == ["new", "c"]
+
+
+def test_checkpoint_of_another_account_is_not_resumed(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / "checkpoint.json"), LOGGER)
+    checkpoint.save(State.PROCESS_CARDS, make_automation().filters(), ["a"])
+
+    other = make_automation(checkpoint, username="bob")
+    other.resume_from_checkpoint()
+
+    assert other.card_collection_strategy.processed_ids == set()
+
+
+def test_recover_retries_then_opens_the_circuit():
+    policies = {State.PROCESS_CARDS: RetryPolicy(attempts=5, backoff=0, restart_from=State.LOAD_CARDS)}
+    automation = make_automation(retry_policies=policies, max_failures=3)
+    automation.current_state = State.PROCESS_CARDS
+
+    assert automation.recover()
+    assert automation.current_state == State.LOAD_CARDS
+    automation.current_state = State.PROCESS_CARDS
+    assert automation.recover()
+    automation.current_state = State.PROCESS_CARDS
+    assert not automation.recover()
+    assert automation.circuit_open
+
+
+def test_recover_stops_after_the_state_attempts():
+    automation = make_automation(retry_policies={State.LOGIN: RetryPolicy(attempts=2, backoff=0)})
+
+    assert automation.recover()
+    assert not automation.recover()
+    assert not automation.circuit_open
@@ -0,0 +1,122 @@
+import logging
+
+import pytest
+
+from src.pages.pageobjects.card import CardRecord
+from src.patterns import detail_cache as detail_cache_module
+from src.patterns.cards_strategy import HttpCardCollection
+from src.patterns.detail_cache import DetailCache
+from src.patterns.http_engine import HttpRejected, HttpSendError
+
+LOGGER = logging.getLogger("test")
+CARD = CardRecord(id="7", name="Dana", href="https://example.com/members/7", index=0)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(detail_cache_module.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = DetailCache(str(tmp_path / "details.sqlite3"), ttl=60, max_bytes=35)
+    yield cache
+    cache.close()
+
+
+def test_entries_expire_after_the_ttl(cache, clock):
+    cache.put("a", html="<p>a</p>")
+    assert cache.get("a") == {"html": "<p>a</p>", "fields": None}
+    clock.now += 61
+
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert cache.prune_expired() == 1
+
+
+def test_fields_are_added_to_a_valid_entry(cache):
+    cache.put("a", html="<p>a</p>")
+    cache.put("a", fields={"age": "34"})
+
+    assert cache.get("a") == {"html": "<p>a</p>", "fields": {"age": "34"}}
+
+
+def test_least_recently_used_entries_are_evicted(cache, clock):
+    for url in ("a", "b", "c"):
+        cache.put(url, html="x" * 10)
+        clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("d", html="x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c") and cache.get("d")
+    assert cache.stats()["evictions"] == 1
+
+
+class Engine:
+    """Answers the HTTP strategy with scripted submission results."""
+
+    loaded = True
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.fetched = 0
+        self.submitted = []
+
+    def fetch_details(self, url):
+        self.fetched += 1
+        return "<form>fresh</form>"
+
+    def prepare_submission(self, url, text, html):
+        return "https://example.com/ajax", {"page": html}
+
+    def submit(self, url, ajax_url, data):
+        self.submitted.append(data["page"])
+        result = self.results.pop(0)
+        if result:
+            raise result
+
+
+@pytest.fixture
+def cached_page(tmp_path):
+    cache = DetailCache(str(tmp_path / "details.sqlite3"))
+    cache.put(CARD.href, html="<form>cached</form>")
+    yield cache
+    cache.close()
+
+
+def test_rejected_cached_page_is_fetched_again_once(cached_page):
+    engine = Engine(HttpRejected("nonce expired"), None)
+    strategy = HttpCardCollection(None, LOGGER, engine, detail_cache=cached_page)
+
+    assert strategy.process_card(None, CARD, "Hi") is True
+    assert engine.submitted == ["<form>cached</form>", "<form>fresh</form>"]
+    assert cached_page.get(CARD.href)["html"] == "<form>fresh</form>"
+
+
+def test_unreadable_answer_is_never_resubmitted(cached_page):
+    engine = Engine(HttpSendError("timed out"))
+    strategy = HttpCardCollection(None, LOGGER, engine, detail_cache=cached_page)
+
+    assert strategy.process_card(None, CARD, "Hi") is None
+    assert engine.submitted == ["<form>cached</form>"]
+    assert engine.fetched == 0
+
+
+def test_rejected_fresh_page_is_not_retried(cached_page):
+    engine = Engine(HttpRejected("nonce expired"), HttpRejected("rejected"))
+    strategy = HttpCardCollection(None, LOGGER, engine, detail_cache=cached_page)
+
+    assert strategy.process_card(None, CARD, "Hi") is False
+    assert len(engine.submitted) == 2
@@ -0,0 +1,69 @@
+import csv
+import json
+
+import pytest
+
+from src.patterns.export import ProfileRecord, open_profile_writer, parse_age
+
+
+def record(card_id, sent=True, **fields):
+    return ProfileRecord(card_id, f"Card {card_id}", f"https://example.com/{card_id}", 30, sent, collected_at=1.0, fields=fields)
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.parametrize("text, age", [("Age 34", 34), ("34 years", 34), ("", None), (None, None)])
+def test_parse_age(text, age):
+    assert parse_age(text) == age
+
+
+def test_csv_export_is_written_in_batches(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    writer = open_profile_writer(path, ("age", "city"), batch_size=2)
+    writer.write(record("1", city="Haifa"))
+    assert writer.written == 0
+    writer.write(record("2", sent=False, unknown="dropped"))
+    assert writer.written == 2
+    writer.write(record("3"))
+    writer.close()
+
+    rows = read_csv(path)
+    assert list(rows[0]) == ["card_id", "name", "url", "age", "sent", "collected_at", "city"]
+    assert [(row["card_id"], row["sent"], row["city"]) for row in rows] == [("1", "True", "Haifa"), ("2", "False", ""), ("3", "True", "")]
+    with pytest.raises(Exception):
+        writer.write(record("4"))
+
+
+def test_new_export_replaces_the_file(tmp_path):
+    path = str(tmp_path / "profiles.csv")
+    with open_profile_writer(path) as writer:
+        writer.write(record("1"))
+    with open_profile_writer(path) as writer:
+        writer.write(record("2"))
+
+    assert [row["card_id"] for row in read_csv(path)] == ["2"]
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_resumed_export_adds_to_the_file(tmp_path, extension):
+    path = str(tmp_path / f"profiles.{extension}")
+    with open_profile_writer(path) as writer:
+        writer.write(record("1"))
+    with open_profile_writer(path) as writer:
+        writer.resume()
+        writer.write(record("2"))
+
+    if extension == "csv":
+        card_ids = [row["card_id"] for row in read_csv(path)]
+    else:
+        with open(path, encoding="utf-8") as file:
+            card_ids = [json.loads(line)["card_id"] for line in file]
+    assert card_ids == ["1", "2"]
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_profile_writer(str(tmp_path / "profiles.xml"))
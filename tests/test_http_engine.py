@@ -0,0 +1,133 @@
+import json
+import logging
+
+import pytest
+import requests
+
+from src.pages.pageobjects.card import CardRecord
+from src.patterns.cards_strategy import HttpCardCollection
+from src.patterns.http_engine import HttpEngine, HttpFallback, HttpRejected, HttpSendError
+
+LOGGER = logging.getLogger("test")
+URL = "https://example.com/members/7"
+PAGE = """<script>var ajaxurl = "https:\\/\\/example.com\\/wp-admin\\/admin-ajax.php";</script>
+<form><input type="hidden" name="post_id" value="7"><input type="hidden" name="nonce" value="abc"><textarea name="form_fields[message]"></textarea></form>"""
+
+
+class Response:
+    def __init__(self, text, status_code=200, url=URL):
+        self.text = text
+        self.status_code = status_code
+        self.url = url
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class Session:
+    """Answers the engine's requests with scripted responses or errors."""
+
+    def __init__(self, get=None, post=None):
+        self.get_result = get
+        self.post_result = post
+        self.posts = []
+
+    def get(self, url, timeout=None):
+        if isinstance(self.get_result, Exception):
+            raise self.get_result
+        return self.get_result
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.posts.append((url, data))
+        if isinstance(self.post_result, Exception):
+            raise self.post_result
+        return self.post_result
+
+
+def engine(**responses):
+    engine = HttpEngine(LOGGER)
+    engine.session = Session(**responses)
+    engine.loaded = True
+    return engine
+
+
+def test_form_is_filled_in_from_the_page():
+    ajax_url, data = HttpEngine(LOGGER).prepare_submission(URL, "Hi", PAGE)
+
+    assert ajax_url == "https://example.com/wp-admin/admin-ajax.php"
+    assert data["post_id"] == "7" and data["nonce"] == "abc"
+    assert data["form_fields[message]"] == "Hi"
+    assert data["referrer"] == URL
+
+
+@pytest.mark.parametrize("get, error", [
+    (requests.ConnectionError("down"), HttpFallback),
+    (Response("", status_code=500), HttpFallback),
+    (Response("<form></form>", url="https://example.com/login"), HttpFallback),
+    (Response("<p>no form</p>"), HttpFallback),
+])
+def test_failures_before_the_submission_fall_back(get, error):
+    http = engine(get=get, post=Response('{"success": true}'))
+
+    with pytest.raises(error):
+        http.send_message(URL, "Hi")
+    assert http.session.posts == []
+
+
+@pytest.mark.parametrize("post, error", [
+    (Response('{"success": false}'), HttpRejected),
+    (Response("-1", status_code=403), HttpRejected),
+    (requests.Timeout("timed out"), HttpSendError),
+    (Response("<html>error</html>", status_code=502), HttpSendError),
+    (Response('{"success": true}', status_code=500), HttpSendError),
+])
+def test_submission_outcomes(post, error):
+    http = engine(post=post)
+
+    with pytest.raises(error) as raised:
+        http.send_message(URL, "Hi", PAGE)
+    assert isinstance(raised.value, HttpSendError)
+    assert len(http.session.posts) == 1
+
+
+class BrowserFallback(HttpCardCollection):
+    """Counts the cards handed to the browser flow instead of opening them."""
+
+    browser_cards = 0
+
+    def handle_details(self, card, message):
+        self.browser_cards += 1
+        return True
+
+    def open_details(self, driver, card):
+        pass
+
+
+class Driver:
+    window_handles = ["list"]
+
+    def close(self):
+        pass
+
+
+class Facade:
+    instrumentation = None
+
+    def switch_to_window(self, handle):
+        pass
+
+
+@pytest.mark.parametrize("get, post, result, browser_cards", [
+    (Response(PAGE), Response('{"success": true}'), True, 0),
+    (Response(PAGE), requests.Timeout("timed out"), None, 0),
+    (Response(PAGE), Response('{"success": false}'), False, 0),
+    (requests.ConnectionError("down"), None, True, 1),
+])
+def test_only_failures_before_the_submission_use_the_browser(get, post, result, browser_cards):
+    http = engine(get=get, post=post)
+    strategy = BrowserFallback(Facade(), LOGGER, http)
+    card = CardRecord(id="7", name="Dana", href=URL, index=0)
+
+    assert strategy.process_card(Driver(), card, "Hi") is result
+    assert strategy.browser_cards == browser_cards
+    assert len(http.session.posts) == (0 if browser_cards else 1)
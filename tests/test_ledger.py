@@ -0,0 +1,69 @@
+import hashlib
+import logging
+
+import pytest
+
+from src.pages.pageobjects.card import CardRecord
+from src.patterns import ledger as ledger_module
+from src.patterns.cards_strategy import BulkCardCollection
+from src.patterns.ledger import OUTCOME_FAILED, OUTCOME_SENT, OUTCOME_UNKNOWN, CardLedger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = CardLedger(str(tmp_path / "ledger.sqlite3"))
+    yield ledger
+    ledger.close()
+
+
+def test_record_and_look_up(ledger):
+    ledger.record("1", OUTCOME_SENT, url="https://example.com/1", name="Dana", message="Hi Dana")
+    ledger.record("2", OUTCOME_FAILED)
+    ledger.record("3", OUTCOME_UNKNOWN)
+
+    assert ledger.is_processed("1")
+    assert not ledger.is_processed("2")
+    assert ledger.processed_ids(["1", "2", "3", "4"]) == {"1"}
+    assert ledger.processed_ids(["1", "2", "3", "4"], (OUTCOME_SENT, OUTCOME_UNKNOWN)) == {"1", "3"}
+    assert ledger.stats() == {OUTCOME_SENT: 1, OUTCOME_FAILED: 1, OUTCOME_UNKNOWN: 1}
+    entry = ledger.entries(OUTCOME_SENT)[0]
+    assert entry["message_hash"] == hashlib.sha256("Hi Dana".encode("utf-8")).hexdigest()
+
+
+def test_a_later_outcome_replaces_the_earlier_one(ledger):
+    ledger.record("1", OUTCOME_FAILED)
+    ledger.record("1", OUTCOME_SENT)
+
+    assert ledger.stats() == {OUTCOME_SENT: 1}
+
+
+def test_lookups_are_batched(ledger, monkeypatch):
+    monkeypatch.setattr(ledger_module, "LOOKUP_BATCH_SIZE", 3)
+    for card_id in range(0, 10, 2):
+        ledger.record(str(card_id), OUTCOME_SENT)
+
+    assert ledger.processed_ids(str(card_id) for card_id in range(10)) == {"0", "2", "4", "6", "8"}
+
+
+def test_prune(ledger):
+    ledger.record("1", OUTCOME_SENT)
+    ledger.record("2", OUTCOME_FAILED)
+
+    assert ledger.prune(outcome=OUTCOME_FAILED) == 1
+    assert ledger.prune(older_than=3600) == 0
+    assert ledger.prune(card_id="1") == 1
+    assert ledger.entries() == []
+
+
+def test_strategy_skips_sent_and_unknown_cards(ledger):
+    ledger.record("1", OUTCOME_SENT)
+    ledger.record("2", OUTCOME_FAILED)
+    ledger.record("3", OUTCOME_UNKNOWN)
+    strategy = BulkCardCollection(None, logging.getLogger("test"), ledger=ledger)
+    cards = [CardRecord(id=str(index), name="", href=None, index=index) for index in range(1, 5)]
+
+    assert [card.id for card in strategy.skip_processed(cards)] == ["2", "4"]
+    strategy.record_outcome("4", None, "Noa", True, "Hi")
+    strategy.record_outcome("2", None, "Gal", None)
+    assert ledger.stats() == {OUTCOME_SENT: 2, OUTCOME_UNKNOWN: 2}
+    assert strategy.outcomes == {OUTCOME_SENT: 1, OUTCOME_UNKNOWN: 1}
@@ -0,0 +1,51 @@
+import pytest
+
+from src.patterns.facade import instrumented
+from src.patterns.metrics import BUCKET_COUNT, Histogram, LatencyRecorder
+
+
+def test_histogram_percentiles_stay_within_one_bucket():
+    histogram = Histogram()
+    for millis in range(1, 1001):
+        histogram.add(millis / 1000)
+    summary = histogram.summary()
+
+    assert summary["count"] == 1000
+    assert summary["max"] == 1.0
+    assert summary["sum"] == pytest.approx(500.5)
+    assert 0.5 <= summary["p50"] <= 0.5 * 2 ** 0.25
+    assert 0.99 <= summary["p99"] <= 1.0
+    assert len(histogram.buckets) == BUCKET_COUNT
+
+
+def test_histogram_extremes():
+    histogram = Histogram()
+    assert histogram.percentile(0.5) == 0.0
+    histogram.add(0)
+    histogram.add(100000)
+
+    assert histogram.percentile(0.5) == 0.0001
+    assert histogram.percentile(0.99) == 100000
+
+
+class Waiter:
+    def __init__(self):
+        self.instrumentation = LatencyRecorder()
+
+    @instrumented("wait", label_argument="description")
+    def wait_until(self, condition, timeout: int = 10, description: str = ""):
+        return condition
+
+    @instrumented("find")
+    def find_element(self, locator: str, timeout: int = 10):
+        return locator
+
+
+def test_instrumented_labels():
+    waiter = Waiter()
+    waiter.wait_until(lambda driver: True, description="url contains /cards")
+    waiter.wait_until(lambda driver: True, 5, "redirect to /members")
+    waiter.find_element("//div[@id='cards']")
+
+    labels = {(entry["operation"], entry["locator"]) for entry in waiter.instrumentation.summary()}
+    assert labels == {("wait", "url contains /cards"), ("wait", "redirect to /members"), ("find", "//div[@id='cards']")}
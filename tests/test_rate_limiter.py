@@ -0,0 +1,68 @@
+import logging
+
+import pytest
+
+from src.patterns import rate_limiter
+from src.patterns.rate_limiter import SendRateLimiter
+
+LOGGER = logging.getLogger("test")
+
+
+class Clock:
+    """Replaces the limiter's clock; sleeping advances it."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_burst_goes_out_then_waits_for_the_rate(clock):
+    limiter = SendRateLimiter(60, LOGGER, burst=2)
+
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == pytest.approx(1.0)
+    assert limiter.stats()["waited"] == pytest.approx(1.0)
+
+
+def test_failures_back_off_to_the_floor_and_recover(clock):
+    limiter = SendRateLimiter(20, LOGGER, min_messages_per_minute=4)
+
+    limiter.record_result(False, 1)
+    assert limiter.messages_per_minute == pytest.approx(10)
+    limiter.record_result(True, 30)
+    assert limiter.messages_per_minute == pytest.approx(5)
+    limiter.record_result(False, 1)
+    assert limiter.messages_per_minute == pytest.approx(4)
+    assert limiter.stats()["backoffs"] == 3
+
+    for _ in range(20):
+        limiter.record_result(True, 0.5)
+    assert limiter.messages_per_minute == pytest.approx(20)
+
+
+def test_back_off_drops_the_saved_burst(clock):
+    limiter = SendRateLimiter(60, LOGGER, burst=3)
+    limiter.record_result(False, 1)
+
+    assert limiter.acquire() == pytest.approx(2.0)
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        SendRateLimiter(0, LOGGER)
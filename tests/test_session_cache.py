@@ -0,0 +1,29 @@
+import json
+import logging
+
+from src.patterns.session_cache import SessionCache
+
+LOGGER = logging.getLogger("test")
+
+
+class FakeDriver:
+    def get_cookies(self):
+        return [{"name": "wordpress_logged_in", "value": "token", "domain": "example.com"}]
+
+    def execute_script(self, script, *args):
+        return {"theme": "dark"}
+
+
+def test_session_is_only_loaded_for_the_account_that_saved_it(tmp_path):
+    path = str(tmp_path / "session.json")
+    SessionCache(path, LOGGER, account="alice").save(FakeDriver())
+
+    assert SessionCache(path, LOGGER, account="alice").load()["cookies"][0]["value"] == "token"
+    assert SessionCache(path, LOGGER, account="bob").load() is None
+
+
+def test_old_sessions_are_ignored(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"saved_at": 0, "account": "alice", "cookies": []}), encoding="utf-8")
+
+    assert SessionCache(str(path), LOGGER, max_age=60, account="alice").load() is None
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.patterns.startup import find_chromedriver
+
+
+def test_configured_chromedriver_must_be_a_file(tmp_path):
+    driver = tmp_path / "chromedriver"
+    driver.write_text("")
+
+    assert find_chromedriver(str(driver)) == str(driver)
+    with pytest.raises(ValueError):
+        find_chromedriver(str(tmp_path / "missing"))
+
+
+def test_importing_app_does_not_import_selenium():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = "import sys, app; print(any(name.startswith('selenium') for name in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == "False"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses a shell script as chromedriver")
+def test_failed_background_boot_raises_its_error(tmp_path):
+    from selenium.common.exceptions import WebDriverException
+    from src.patterns.driver_service import PrestartedService
+
+    driver = tmp_path / "chromedriver"
+    driver.write_text("#!/bin/sh\nexit 1\n")
+    driver.chmod(0o755)
+    service = PrestartedService(str(driver))
+
+    assert service.start_in_background()
+    with pytest.raises(WebDriverException, match="unexpectedly exited"):
+        service.start()
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+from selenium.webdriver.remote.command import Command
+
+from src.patterns.trace import REDACTED, ReplayConnection, TraceRecorder
+
+PASSWORD = "s3cret-password"
+SESSION_TOKEN = "session-token-42"
+RESPONSES = {
+    Command.SEND_KEYS_TO_ELEMENT: {"value": None},
+    Command.GET_ALL_COOKIES: {"value": [{"name": "wordpress_logged_in", "value": SESSION_TOKEN}]},
+    Command.W3C_EXECUTE_SCRIPT: {"value": {"auth": SESSION_TOKEN}},
+    Command.ADD_COOKIE: {"value": None},
+    Command.GET_TITLE: {"value": "Members"},
+}
+
+
+def record(path):
+    """Records a login-like sequence of commands through a fake executor."""
+    executor = SimpleNamespace(execute=lambda command, params: RESPONSES[command])
+    driver = SimpleNamespace(command_executor=executor, session_id="session", caps={"browserName": "chrome"})
+    recorder = TraceRecorder(str(path), metadata={"job": "test"})
+    recorder.attach(driver)
+    executor.execute(Command.SEND_KEYS_TO_ELEMENT, {"id": "password", "text": PASSWORD, "value": list(PASSWORD)})
+    executor.execute(Command.GET_ALL_COOKIES, {})
+    executor.execute(Command.W3C_EXECUTE_SCRIPT, {"script": "return Object.assign({}, localStorage);", "args": []})
+    executor.execute(Command.ADD_COOKIE, {"cookie": {"name": "wordpress_logged_in", "value": SESSION_TOKEN}})
+    executor.execute(Command.GET_TITLE, {})
+    recorder.close()
+    return recorder
+
+
+def test_trace_holds_no_secrets(tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    recorder = record(path)
+    replay = ReplayConnection(str(path))
+    content = "\n".join(str(entry) for entry in replay.entries)
+
+    assert recorder.commands == 5
+    assert PASSWORD not in content
+    assert SESSION_TOKEN not in content
+    assert replay.entries[0]["params"]["text"] == REDACTED
+    assert replay.entries[1]["response"]["value"][0] == {"name": "wordpress_logged_in", "value": REDACTED}
+
+
+def test_recorder_returns_unredacted_responses(tmp_path):
+    executor = SimpleNamespace(execute=lambda command, params: RESPONSES[command])
+    driver = SimpleNamespace(command_executor=executor, session_id="session", caps={})
+    recorder = TraceRecorder(str(tmp_path / "trace.jsonl"))
+    recorder.attach(driver)
+
+    assert executor.execute(Command.GET_ALL_COOKIES, {})["value"][0]["value"] == SESSION_TOKEN
+    recorder.close()
+
+
+def test_replay_answers_recorded_commands(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    record(path)
+    replay = ReplayConnection(str(path))
+
+    assert replay.execute(Command.NEW_SESSION, {})["value"]["sessionId"] == "session"
+    for command in (Command.SEND_KEYS_TO_ELEMENT, Command.GET_ALL_COOKIES, Command.W3C_EXECUTE_SCRIPT, Command.ADD_COOKIE):
+        replay.execute(command, {})
+    assert replay.execute(Command.GET_TITLE, {}) == {"value": "Members"}
+    assert replay.stats()["commands_replayed"] == 5
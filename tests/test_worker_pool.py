@@ -0,0 +1,72 @@
+import logging
+
+import pytest
+
+from src.patterns.worker_pool import CardWorkerPool
+
+LOGGER = logging.getLogger("test")
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+
+    def get(self, url):
+        pass
+
+    def add_cookie(self, cookie):
+        pass
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise Exception("session deleted")
+        return 1
+
+    def quit(self):
+        self.alive = False
+
+
+class Factory:
+    """Launches drivers until told to fail."""
+
+    def __init__(self):
+        self.fail = False
+
+    def __call__(self):
+        if self.fail:
+            raise Exception("chromedriver did not start")
+        return FakeDriver()
+
+
+def test_worker_that_cannot_be_restarted_is_not_reused():
+    factory = Factory()
+    pool = CardWorkerPool(factory, LOGGER, workers=2)
+    pool.start([], "https://example.com")
+    try:
+        dead, healthy = pool._all_workers
+        dead.driver.alive = False
+        factory.fail = True
+        tasks = [pool._submit(lambda worker: worker.worker_id, "task") for _ in range(4)]
+
+        errors = [task.exception(timeout=5) for task in tasks]
+        assert sum(error is not None for error in errors) == 1
+        assert [task.result() for task, error in zip(tasks, errors) if error is None] == [healthy.worker_id] * 3
+        assert pool.lost == 1
+    finally:
+        pool.shutdown()
+
+
+def test_tasks_fail_once_every_worker_is_lost():
+    factory = Factory()
+    pool = CardWorkerPool(factory, LOGGER, workers=1)
+    pool.start([], "https://example.com")
+    try:
+        pool._all_workers[0].driver.alive = False
+        factory.fail = True
+
+        with pytest.raises(Exception, match="chromedriver"):
+            pool._submit(lambda worker: worker.worker_id, "task").result(timeout=5)
+        with pytest.raises(Exception, match="No worker session is left"):
+            pool._submit(lambda worker: worker.worker_id, "task").result(timeout=5)
+    finally:
+        pool.shutdown()